@@ -0,0 +1,647 @@
+#!/usr/bin/env nix-shell
+#!nix-shell -i python3 -p python312Packages.gspread python312Packages.google-auth-oauthlib python312Packages.requests python312Packages.brotli python312Packages.httpx
+"""
+Asyncio sync engine
+
+Does the same job as update_sheet.py, with the same command line, but the
+cyberskyline fetch, the safety-check reads and every Sheets write run as
+coroutines on one event loop (httpx.AsyncClient) instead of tying up a
+thread per in-flight call. Concurrency is bounded explicitly: at most
+ASYNC_SHEETS_CONCURRENCY Sheets calls and --jobs tabs are in flight, and
+every call draws from the shared Sheets quota. Per-cluster detail pages are
+still fetched by the threaded cluster_details pool, off the event loop.
+
+Usage:
+    ./async_engine.py <category|all> [--test] [--yes] [--no-details] [--world NAME] [--jobs N]
+    ./update_sheet.py <category|all> --async [...]   (same thing)
+
+Needs httpx (pip install httpx).
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import gzip
+import io
+import itertools
+import json
+import os
+import sys
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from google.auth.transport.requests import Request as GoogleAuthRequest
+
+from batching import announced
+from models import as_clusters
+from request_templates import batch_update_body
+from sheet_plan import plan_category_sheet
+from transport import (
+    ACCEPT_ENCODING, CircuitOpenError, TransientHTTPError, raise_for_transient_status, retry_after_seconds
+)
+from update_sheet import (
+    CATEGORIES,
+    flag_values,
+    number_flag,
+    positional_args,
+    print_results,
+    select_categories,
+    select_worlds,
+    show_usage,
+    world_category_keys,
+    world_credentials,
+    world_sheet_name,
+    world_urls,
+)
+from update_sheet_template import (
+    ASYNC_SHEETS_CONCURRENCY,
+    AUTO_REFRESH_COOKIES,
+    CATEGORY_WORKERS,
+    COOKIE_FILE,
+    CREDENTIALS,
+    CYBERSKYLINE_BREAKER,
+    FETCH_POLICY,
+    GZIP_MIN_BYTES,
+    GZIP_REQUEST_BODIES,
+    PREFLIGHT_CHARS,
+    REQUEST_BATCHER,
+    SHEETS_POLICY,
+    SHEETS_QUOTA,
+    TOKEN_PATH,
+    USER_AGENT,
+    VALUE_BATCHER,
+    CyberskylineError,
+    SessionExpiredError,
+    enrich_challenge_clusters,
+    extract_preload,
+    find_existing_work,
+    load_cached_preload,
+    looks_like_login,
+    parse_world,
+    print_adding_rows,
+    print_existing_work_abort,
+    print_plan,
+    print_update_summary,
+    refresh_cookies,
+    sheet_rows,
+    sheets_quota,
+    store_preload,
+    world_clusters,
+)
+
+SHEETS_API = "https://sheets.googleapis.com/v4/spreadsheets"
+
+
+class SheetsAPIError(Exception):
+    """A non-retryable error response from the Sheets API"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}: {response.text[:500]}")
+        self.response = response
+
+
+# Failures that may succeed on a later attempt
+RETRYABLE_ASYNC_EXCEPTIONS = (TransientHTTPError, httpx.TransportError) if HAS_HTTPX else (TransientHTTPError,)
+
+
+async def call_with_retries_async(fn, policy, breaker=None):
+    """transport.call_with_retries for a coroutine function fn"""
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await fn()
+        except RETRYABLE_ASYNC_EXCEPTIONS as e:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt >= policy.retries:
+                raise
+            delay = policy.delay(attempt, getattr(e, 'retry_after', None))
+            print(f"  ⚠ {str(e) or type(e).__name__} - retrying in {delay:.1f}s ({attempt + 1}/{policy.retries})")
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        except Exception:
+            if breaker is not None:
+                breaker.record_success()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+def _timeout(policy):
+    connect, read = policy.timeout if isinstance(policy.timeout, tuple) else (policy.timeout,) * 2
+    return httpx.Timeout(read, connect=connect)
+
+
+def a1(sheet_name, cell_range):
+    """Absolute A1 range on a named tab ('Tab'!A1:B2)"""
+    return "'%s'!%s" % (sheet_name.replace("'", "''"), cell_range)
+
+
+class AsyncSheetsClient:
+    """
+    Minimal Sheets API client on httpx. Every call waits for quota, holds
+    one of `concurrency` slots while in flight and is retried on 429/5xx
+    (honouring Retry-After) and connection errors. Given the token_path the
+    creds came from, tokens are refreshed ahead of expiry through CREDENTIALS.
+    """
+
+    def __init__(self, creds, quota=SHEETS_QUOTA, concurrency=ASYNC_SHEETS_CONCURRENCY,
+                 policy=SHEETS_POLICY, gzip_min_bytes=None, token_path=None):
+        self._creds = creds
+        self._token_path = token_path
+        self._quota = quota
+        self._policy = policy
+        self._gzip_min_bytes = gzip_min_bytes
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._token_lock = asyncio.Lock()
+        self._sheet_properties_of = {}
+        self._client = httpx.AsyncClient(
+            timeout=_timeout(policy),
+            headers={'Accept-Encoding': ACCEPT_ENCODING},
+            limits=httpx.Limits(max_connections=concurrency)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    async def _authorization(self):
+        async with self._token_lock:
+            if self._token_path is not None and CREDENTIALS.due(self._creds):
+                await asyncio.to_thread(CREDENTIALS.refresh, self._token_path)
+            if not self._creds.valid:
+                await asyncio.to_thread(self._creds.refresh, GoogleAuthRequest())
+            return f"Bearer {self._creds.token}"
+
+    async def _request(self, method, url, params=None, body=None):
+        headers = {}
+        if body is not None:
+            if isinstance(body, (dict, list)):
+                body = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+            if self._gzip_min_bytes is not None and len(body) >= self._gzip_min_bytes:
+                body = gzip.compress(body, compresslevel=6)
+                headers['Content-Encoding'] = 'gzip'
+
+        async def attempt():
+            await self._quota.acquire_async(method)
+            headers['Authorization'] = await self._authorization()
+            async with self._semaphore:
+                response = await self._client.request(method, url, params=params,
+                                                      content=body, headers=headers)
+            if response.status_code == 429:
+                # Hold back every other task on this budget while we back off
+                self._quota.pause(method, retry_after_seconds(response) or self._policy.backoff_base)
+            raise_for_transient_status(response)
+            if response.status_code >= 400:
+                raise SheetsAPIError(response)
+            return response.json()
+
+        return await call_with_retries_async(attempt, self._policy)
+
+    async def _load_sheet_properties(self, spreadsheet_id):
+        metadata = await self._request('GET', f"{SHEETS_API}/{spreadsheet_id}", params={
+            'fields': 'sheets.properties(sheetId,title,gridProperties.rowCount)'})
+        return {sheet['properties']['title']: sheet['properties']
+                for sheet in metadata.get('sheets', [])}
+
+    async def _sheet_properties(self, spreadsheet_id, sheet_name):
+        # Tabs of one spreadsheet share a single metadata read
+        if spreadsheet_id not in self._sheet_properties_of:
+            self._sheet_properties_of[spreadsheet_id] = asyncio.ensure_future(
+                self._load_sheet_properties(spreadsheet_id))
+        try:
+            properties = await self._sheet_properties_of[spreadsheet_id]
+        except Exception:
+            self._sheet_properties_of.pop(spreadsheet_id, None)
+            raise
+        return properties.get(sheet_name)
+
+    async def sheet_id(self, spreadsheet_id, sheet_name):
+        """sheetId of a tab, or None if the spreadsheet has no such tab"""
+        properties = await self._sheet_properties(spreadsheet_id, sheet_name)
+        return properties['sheetId'] if properties else None
+
+    async def row_count(self, spreadsheet_id, sheet_name):
+        """Rows in a tab's grid (None if the metadata doesn't say)"""
+        properties = await self._sheet_properties(spreadsheet_id, sheet_name)
+        return properties.get('gridProperties', {}).get('rowCount')
+
+    async def add_rows(self, spreadsheet_id, sheet_name, rows):
+        """Append rows to the bottom of a tab's grid"""
+        properties = await self._sheet_properties(spreadsheet_id, sheet_name)
+        await self.batch_update(spreadsheet_id, [json.dumps({'appendDimension': {
+            'sheetId': properties['sheetId'], 'dimension': 'ROWS', 'length': rows}})])
+        grid = properties.setdefault('gridProperties', {})
+        grid['rowCount'] = grid.get('rowCount', 0) + rows
+
+    async def values_batch_get(self, spreadsheet_id, ranges):
+        """Cell values for each range (list of rows per range)"""
+        data = await self._request('GET', f"{SHEETS_API}/{spreadsheet_id}/values:batchGet",
+                                   params=[('ranges', r) for r in ranges])
+        return [value_range.get('values', []) for value_range in data.get('valueRanges', [])]
+
+    async def values_batch_clear(self, spreadsheet_id, ranges):
+        return await self._request('POST', f"{SHEETS_API}/{spreadsheet_id}/values:batchClear",
+                                   body={'ranges': ranges})
+
+    async def values_batch_update(self, spreadsheet_id, data):
+        return await self._request('POST', f"{SHEETS_API}/{spreadsheet_id}/values:batchUpdate",
+                                   body={'valueInputOption': 'RAW', 'data': data})
+
+    async def batch_update(self, spreadsheet_id, fragments):
+        """spreadsheets.batchUpdate for pre-serialized request fragments"""
+        return await self._request('POST', f"{SHEETS_API}/{spreadsheet_id}:batchUpdate",
+                                   body=batch_update_body(fragments))
+
+
+class AsyncCyberskyline:
+    """Cyberskyline page fetches on httpx, with the same retries, breaker and cookie refresh"""
+
+    def __init__(self, policy=FETCH_POLICY, breaker=CYBERSKYLINE_BREAKER):
+        self._policy = policy
+        self._breaker = breaker
+        self._refresh_lock = asyncio.Lock()
+        self._cookie_generation = 0
+        with open(COOKIE_FILE, 'r') as f:
+            cookies_str = f.read().strip()
+        self._client = httpx.AsyncClient(
+            timeout=_timeout(policy),
+            follow_redirects=True,
+            headers={
+                'Cookie': cookies_str,
+                'User-Agent': USER_AGENT,
+                'Accept-Encoding': ACCEPT_ENCODING
+            }
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    async def _fetch_preload_once(self, url):
+        async with self._client.stream('GET', url) as response:
+            raise_for_transient_status(response)
+            if response.status_code in (401, 403):
+                raise SessionExpiredError(f"HTTP {response.status_code} from {url}")
+            if response.status_code >= 400:
+                raise CyberskylineError(f"HTTP {response.status_code} from {url}")
+
+            # Preflight: bail out on the login page before downloading the rest
+            chunks = response.aiter_text()
+            head = ''
+            async for chunk in chunks:
+                head += chunk
+                if len(head) >= PREFLIGHT_CHARS:
+                    break
+            if looks_like_login(response.url, head):
+                raise SessionExpiredError(f"Redirected to the login page ({response.url})")
+
+            html = head + ''.join([chunk async for chunk in chunks])
+
+        return extract_preload(html, url)
+
+    async def fetch_preload(self, url):
+        """Async update_sheet_template.fetch_preload"""
+        generation = self._cookie_generation
+        try:
+            return await call_with_retries_async(lambda: self._fetch_preload_once(url),
+                                                 self._policy, self._breaker)
+        except SessionExpiredError:
+            if not AUTO_REFRESH_COOKIES:
+                raise
+            async with self._refresh_lock:
+                if generation == self._cookie_generation:
+                    if not await asyncio.to_thread(refresh_cookies):
+                        raise
+                    with open(COOKIE_FILE, 'r') as f:
+                        self._client.headers['Cookie'] = f.read().strip()
+                    self._cookie_generation += 1
+            return await call_with_retries_async(lambda: self._fetch_preload_once(url),
+                                                 self._policy, self._breaker)
+
+    async def fetch_world(self, url):
+        """Async fetch_cyberskyline_data: falls back to the cached preload"""
+        try:
+            preload_data = await self.fetch_preload(url)
+        except (CyberskylineError, CircuitOpenError) + RETRYABLE_ASYNC_EXCEPTIONS as e:
+            preload_data, cached_at = load_cached_preload(url)
+            if preload_data is None:
+                raise
+            print(f"  ⚠ Fetch failed ({e}); using cached data")
+            return preload_data
+
+        await asyncio.to_thread(store_preload, url, preload_data)
+        return preload_data
+
+
+class TaskOutput:
+    """
+    sys.stdout stand-in that buffers what each capturing asyncio task
+    prints (update_sheet.ThreadOutput for coroutines).
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = contextvars.ContextVar('task_output', default=None)
+
+    def write(self, text):
+        return (self._buffer.get() or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    async def capture(self, coroutine):
+        """Await coroutine with this task's output buffered; returns (result, output)"""
+        buffer = io.StringIO()
+        self._buffer.set(buffer)
+        return await coroutine, buffer.getvalue()
+
+
+def load_credentials(token_path=TOKEN_PATH):
+    """Shared credentials of a token file (see credentials.CredentialManager)"""
+    return CREDENTIALS.credentials(token_path)
+
+
+async def update_tab(sheets, spreadsheet_id, sheet_name, challenge_clusters, test_mode=False):
+    """Async update_sheet_template.update_category_sheet"""
+    challenge_clusters = as_clusters(challenge_clusters)
+
+    sheet_id = await sheets.sheet_id(spreadsheet_id, sheet_name)
+    if sheet_id is None:
+        print(f"ERROR: Sheet '{sheet_name}' not found")
+        return False
+
+    print(f"\n{'='*70}")
+    print(f"Updating {sheet_name} Sheet")
+    print(f"{'='*70}\n")
+
+    start_row = 50 if test_mode else 3
+    plan = plan_category_sheet(sheet_id, challenge_clusters, start_row)
+    start_row, end_row = sheet_rows(plan, test_mode)
+
+    # Safety check: abort if any work has been done (both ranges in one read).
+    # Rows past the tab's grid can't hold work (or be read); they're added below.
+    row_count = await sheets.row_count(spreadsheet_id, sheet_name) or end_row
+    checked_end = min(end_row, row_count)
+    work_found = False
+    if checked_end >= start_row:
+        print(f"Safety check: Examining rows {start_row}-{checked_end} for existing work...")
+        try:
+            answer_status_cells, team_member_cells = await sheets.values_batch_get(
+                spreadsheet_id, [a1(sheet_name, f'D{start_row}:D{checked_end}'),
+                                 a1(sheet_name, f'G{start_row}:M{checked_end}')])
+            work_found = find_existing_work(answer_status_cells, team_member_cells, start_row)
+        except Exception as e:
+            print(f"  ⚠ Error checking for existing work: {e}")
+            print("  Aborting update as a safety precaution")
+            work_found = True
+    if work_found:
+        print_existing_work_abort()
+        return False
+
+    # Large worlds can need more rows than the tab's grid has (1000 by default)
+    if row_count < end_row:
+        print_adding_rows(row_count, end_row)
+        await sheets.add_rows(spreadsheet_id, sheet_name, end_row - row_count)
+
+    print(f"Clearing rows {start_row}-{end_row}...")
+    await sheets.values_batch_clear(spreadsheet_id, [a1(sheet_name, f'A{start_row}:N{end_row}')])
+
+    print_plan(challenge_clusters, plan, start_row, test_mode)
+
+    async def send_values(batch):
+        data = [{'range': a1(sheet_name, update['range']), 'values': update['values']}
+                for update in batch]
+        await sheets.values_batch_update(spreadsheet_id, data)
+
+    async def send_requests(batch):
+        await sheets.batch_update(spreadsheet_id, batch)
+
+    print("Updating cell values...")
+    sent = batches = 0
+    for batch, size in VALUE_BATCHER.chunks(plan['updates']):
+        await VALUE_BATCHER.send_async(send_values, batch, size)
+        batches += 1
+        sent += len(batch)
+    print(f"  Sent {sent} value ranges in {batches} batches")
+
+    format_stream = itertools.chain(
+        announced("Adding data validation (dropdowns)...", plan['validation_requests']),
+        announced("Applying cell formatting (colors, borders)...", plan['format_requests']),
+        announced("Adding conditional formatting for dropdown colors...",
+                  plan['conditional_format_requests'])
+    )
+    sent = batches = 0
+    for batch, size in REQUEST_BATCHER.chunks(format_stream):
+        await REQUEST_BATCHER.send_async(send_requests, batch, size)
+        batches += 1
+        sent += len(batch)
+    print(f"  Sent {sent} formatting requests in {batches} batches")
+
+    print_update_summary(sheet_name, challenge_clusters)
+    return True
+
+
+async def sync(category_keys, test_mode=False, dry_run=True, fetch_details=True,
+               world_names=None, workers=CATEGORY_WORKERS):
+    """Fetch the selected worlds and update their category tabs; returns True on full success"""
+    if dry_run:
+        print("\n*** DRY RUN MODE ***")
+        print("Use --yes flag to actually update the sheets\n")
+
+    if test_mode:
+        print("*** TEST MODE: Writing to rows 50+ ***\n")
+
+    print("="*70)
+    print("NCL Sheet Updater - asyncio engine")
+    print("="*70)
+
+    worlds = [world for world in select_worlds(world_names)
+              if world_category_keys(world, category_keys)]
+    if not worlds:
+        return False
+
+    # Credentials (one per token file) load alongside the cyberskyline download
+    credentials = world_credentials(worlds)
+    creds_task = None if dry_run else asyncio.gather(
+        *(asyncio.to_thread(load_credentials, path) for path in credentials), return_exceptions=True)
+
+    # One fetch and parse per distinct url, however many spreadsheets are synced from it
+    urls = world_urls(worlds)
+    print(f"\nFetching data from cyberskyline ({len(urls)} world(s) concurrently)...")
+    async with AsyncCyberskyline() as cyberskyline:
+        fetched = dict(zip(urls, await asyncio.gather(*(cyberskyline.fetch_world(url) for url in urls),
+                                                      return_exceptions=True)))
+
+    # A world that can't be fetched or parsed fails its own tabs, not the whole run
+    failures = {url: ("fetch", preload_data) for url, preload_data in fetched.items()
+                if isinstance(preload_data, BaseException)}
+    parsed = {}
+    for url, preload_data in fetched.items():
+        if url in failures:
+            continue
+        try:
+            world_model = parse_world(preload_data)
+            keys = [key for key in category_keys
+                    if any(key in world_category_keys(world, category_keys)
+                           for world in worlds if world['url'] == url)]
+            challenges_by_key = {key: world_clusters(world_model, CATEGORIES[key][1]) for key in keys}
+
+            if fetch_details:
+                names = ', '.join(world['name'] for world in worlds if world['url'] == url)
+                print(f"Fetching question details per challenge ({names})...")
+                enriched = iter(await asyncio.to_thread(
+                    enrich_challenge_clusters,
+                    [c for challenges in challenges_by_key.values() for c in challenges], url
+                ))
+                challenges_by_key = {key: [next(enriched) for _ in challenges]
+                                     for key, challenges in challenges_by_key.items()}
+        except Exception as e:
+            failures[url] = ("plan", e)
+            continue
+        parsed[url] = challenges_by_key
+
+    results = []
+    jobs = []
+    for world in worlds:
+        label_prefix = f"{world['name']}/" if len(worlds) > 1 else ""
+        if world['url'] in failures:
+            action, e = failures[world['url']]
+            print(f"ERROR: Could not {action} world '{world['name']}': {e}")
+            results.append((f"{label_prefix}*", False, f"{action.capitalize()} failed: {e}"))
+            continue
+
+        for key in world_category_keys(world, category_keys):
+            sheet_name = world_sheet_name(world, key)
+            jobs.append((f"{label_prefix}{sheet_name}", world, key, sheet_name, parsed[world['url']][key]))
+
+    if dry_run:
+        for label, world, key, sheet_name, challenges in jobs:
+            if not challenges:
+                results.append((label, False, "No challenges found"))
+                continue
+            print(f"[DRY RUN] Would update {label} with {len(challenges)} challenges "
+                  f"({sum(c.question_count for c in challenges)} questions)")
+            results.append((label, True, "Dry run"))
+        return print_results(results, dry_run, test_mode)
+
+    # A token file that can't be loaded fails the tabs written with it
+    creds = dict(zip(credentials, await creds_task))
+    for path, loaded in creds.items():
+        if isinstance(loaded, Exception):
+            print(f"ERROR: Could not load Google credentials {path}: {loaded}")
+    output = TaskOutput(sys.stdout)
+    # Each credential has its own quota, so the shared tab limit grows by `workers`
+    # per credential (any credential's tabs may take any of the slots)
+    tab_workers = max(1, workers) * len(credentials)
+    tab_slots = asyncio.Semaphore(tab_workers)
+
+    async def run(job):
+        label, world, key, sheet_name, challenges = job
+        async with tab_slots:
+            print(f"\n{'#'*70}")
+            print(f"# Processing: {label}")
+            print(f"{'#'*70}")
+            if not challenges:
+                print(f"WARNING: No challenges found for {CATEGORIES[key][1]}")
+                return (label, False, "No challenges found")
+            try:
+                if isinstance(creds[world['token_path']], Exception):
+                    raise creds[world['token_path']]
+                success = await update_tab(clients[world['token_path']], world['sheet_id'],
+                                           sheet_name, challenges, test_mode)
+                return (label, success, "Success" if success else "Failed")
+            except Exception as e:
+                print(f"ERROR updating {label}: {e}")
+                return (label, False, str(e))
+
+    async def run_buffered(index, job):
+        result, text = await output.capture(run(job))
+        return index, result, text
+
+    print(f"\nUpdating {len(jobs)} sheets, {min(tab_workers, len(jobs) or 1)} at a time...")
+    sys.stdout = output
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            clients = {}
+            for path in credentials:
+                if isinstance(creds[path], Exception):
+                    continue
+                clients[path] = await stack.enter_async_context(AsyncSheetsClient(
+                    creds[path], quota=sheets_quota(path),
+                    gzip_min_bytes=GZIP_MIN_BYTES if GZIP_REQUEST_BODIES else None,
+                    token_path=path))
+            tab_results = [None] * len(jobs)
+            tasks = [asyncio.create_task(run_buffered(i, job)) for i, job in enumerate(jobs)]
+            for finished in asyncio.as_completed(tasks):
+                index, result, text = await finished
+                tab_results[index] = result
+                output.write(text)
+                output.flush()
+    finally:
+        sys.stdout = output._stream
+
+    results.extend(tab_results)
+    return print_results(results, dry_run, test_mode)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help', 'help']:
+        show_usage()
+        return 0 if len(sys.argv) > 1 else 1
+
+    # watch, serve and --at need the threaded engine; don't quietly do a one-off sync instead
+    names = positional_args()
+    if names[:1] in (["watch"], ["serve"]) or flag_values('--at'):
+        mode = '--at' if flag_values('--at') else names[0]
+        print(f"ERROR: --async can't be combined with {mode} (the asyncio engine only does one-off syncs)\n")
+        show_usage()
+        return 1
+
+    if not HAS_HTTPX:
+        print("ERROR: The asyncio engine needs httpx (pip install httpx)")
+        return 1
+
+    category_keys = select_categories(names, flag_values('--include'), flag_values('--exclude'))
+    if category_keys is None:
+        return 1
+
+    try:
+        workers = number_flag('--jobs', CATEGORY_WORKERS)
+    except ValueError as e:
+        print(f"ERROR: {e}\n")
+        show_usage()
+        return 1
+
+    success = asyncio.run(sync(
+        category_keys,
+        test_mode='--test' in sys.argv,
+        dry_run='--yes' not in sys.argv,
+        fetch_details='--no-details' not in sys.argv,
+        world_names=flag_values('--world'),
+        workers=workers
+    ))
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
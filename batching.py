@@ -0,0 +1,242 @@
+"""
+Bounded, adaptive chunking of streamed Sheets requests
+
+Request builders in sheet_plan.py are generators. send_in_chunks pulls from
+them, cuts the stream into batches and hands each batch to a sender thread
+as soon as it fills, so building the next batch overlaps with the network
+round trip of the previous one. The queue between them is bounded, so at
+most max_pending batches are ever held in memory regardless of tab size.
+
+Batches are cut by an AdaptiveBatcher, which caps both request count and
+serialized bytes and tunes the count from what it observes: it grows
+additively while round trips stay under the target latency and halves when
+they run slow or fail. A batch rejected as too large is split and resent.
+"""
+
+import contextvars
+import json
+import queue
+import threading
+import time
+
+# Default number of requests per batchUpdate call
+DEFAULT_CHUNK_SIZE = 100
+
+# The Sheets API rejects request bodies past ~10 MB; stay well clear of it
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+# Round trip time batches are tuned towards, in seconds
+DEFAULT_TARGET_LATENCY = 2.0
+
+_DONE = object()
+
+
+def announced(message, items):
+    """Yield items, printing message just before the first one is produced"""
+    first = True
+    for item in items:
+        if first:
+            print(message)
+            first = False
+        yield item
+
+
+def request_size(item):
+    """Serialized size in bytes of a request (JSON fragment or dict)"""
+    if isinstance(item, str):
+        return len(item.encode('utf-8'))
+    return len(json.dumps(item, separators=(',', ':')))
+
+
+def is_payload_error(error):
+    """True if error is an HTTP rejection of the request body as too large"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status == 413:
+        return True
+    if status == 400:
+        text = str(error).lower()
+        return 'too large' in text or 'exceeds' in text
+    return False
+
+
+class AdaptiveBatcher:
+    """
+    Cuts request streams into batches of at most `limit` requests and
+    max_bytes serialized bytes, adjusting limit between min_count and
+    max_count: +step after a round trip faster than target_latency, halved
+    after a slower one or a failure. Safe to share between threads; keep
+    one per kind of call so each learns its own latency.
+    wait_clock, if given, returns the seconds the current thread or task
+    has spent waiting for quota (quota.SheetsQuota.waited); that time is
+    not counted as latency, so throttling never shrinks batches.
+    """
+
+    def __init__(self, start_count=DEFAULT_CHUNK_SIZE, min_count=10, max_count=1000,
+                 max_bytes=DEFAULT_MAX_BYTES, target_latency=DEFAULT_TARGET_LATENCY,
+                 wait_clock=None):
+        self.wait_clock = wait_clock
+        self.min_count = min_count
+        self.max_count = max(max_count, min_count)
+        self.max_bytes = max_bytes
+        self.target_latency = target_latency
+        self.limit = min(max(start_count, min_count), self.max_count)
+        self.step = max(1, start_count // 4)
+        self.batches = 0
+        self.requests = 0
+        self.bytes = 0
+        self.errors = 0
+        self.latency = 0.0
+        self._lock = threading.Lock()
+
+    def chunks(self, items):
+        """Yield (batch, size in bytes) from items under the current limits"""
+        batch = []
+        size = 0
+        for item in items:
+            item_size = request_size(item)
+            if batch and size + item_size > self.max_bytes:
+                yield batch, size
+                batch = []
+                size = 0
+            batch.append(item)
+            size += item_size
+            if len(batch) >= self.limit:
+                yield batch, size
+                batch = []
+                size = 0
+        if batch:
+            yield batch, size
+
+    def _started(self):
+        return time.monotonic(), self.wait_clock() if self.wait_clock else 0.0
+
+    def _latency(self, started):
+        elapsed = time.monotonic() - started[0]
+        if self.wait_clock:
+            elapsed -= self.wait_clock() - started[1]
+        return max(elapsed, 0.0)
+
+    def _record(self, count, size, latency):
+        with self._lock:
+            self.batches += 1
+            self.requests += count
+            self.bytes += size
+            self.latency += latency
+            if latency <= self.target_latency:
+                self.limit = min(self.max_count, self.limit + self.step)
+            else:
+                self.limit = max(self.min_count, self.limit // 2)
+
+    def _record_failure(self):
+        with self._lock:
+            self.errors += 1
+            self.limit = max(self.min_count, self.limit // 2)
+
+    def _halves_to_resend(self, error, batch, size):
+        """Record a failed send; return the two halves to resend, or None to re-raise"""
+        self._record_failure()
+        if len(batch) < 2 or not is_payload_error(error):
+            return None
+        with self._lock:
+            self.max_bytes = max(1, min(self.max_bytes, size) // 2)
+        middle = len(batch) // 2
+        return batch[:middle], batch[middle:]
+
+    def send(self, send, batch, size=None):
+        """
+        send(batch), timing it to tune the limits. A batch rejected as too
+        large is split in half and each half sent separately.
+        """
+        if size is None:
+            size = sum(request_size(item) for item in batch)
+
+        started = self._started()
+        try:
+            send(batch)
+        except Exception as e:
+            halves = self._halves_to_resend(e, batch, size)
+            if halves is None:
+                raise
+            for half in halves:
+                self.send(send, half)
+            return
+        self._record(len(batch), size, self._latency(started))
+
+    async def send_async(self, send, batch, size=None):
+        """send() for a coroutine function send (see async_engine.py)"""
+        if size is None:
+            size = sum(request_size(item) for item in batch)
+
+        started = self._started()
+        try:
+            await send(batch)
+        except Exception as e:
+            halves = self._halves_to_resend(e, batch, size)
+            if halves is None:
+                raise
+            for half in halves:
+                await self.send_async(send, half)
+            return
+        self._record(len(batch), size, self._latency(started))
+
+    def stats(self):
+        """Totals so far, for logging"""
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'requests': self.requests,
+                'bytes': self.bytes,
+                'errors': self.errors,
+                'mean_latency': self.latency / self.batches if self.batches else 0.0,
+                'limit': self.limit,
+            }
+
+
+def send_in_chunks(items, send, batcher=None, max_pending=2):
+    """
+    Send items in batches via send(batch), in order.
+    batcher is an AdaptiveBatcher (a fresh one if omitted). Batches are sent
+    from a background thread while the caller keeps producing; the first
+    exception raised by send stops production and is re-raised here.
+    Returns (batches sent, items sent).
+    """
+    if batcher is None:
+        batcher = AdaptiveBatcher()
+
+    pending = queue.Queue(maxsize=max_pending)
+    errors = []
+    sent = [0, 0]
+
+    def sender():
+        while True:
+            batch = pending.get()
+            if batch is _DONE:
+                return
+            if errors:
+                continue  # Drain without sending after a failure
+            requests, size = batch
+            try:
+                batcher.send(send, requests, size)
+                sent[0] += 1
+                sent[1] += len(requests)
+            except BaseException as e:
+                errors.append(e)
+
+    # The sender runs in the caller's context, so context-held state such as
+    # captured output (update_sheet.ThreadOutput) carries over to it
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(sender,),
+                              name='sheets-sender', daemon=True)
+    thread.start()
+    try:
+        for batch in batcher.chunks(items):
+            if errors:
+                break
+            pending.put(batch)
+    finally:
+        pending.put(_DONE)
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return sent[0], sent[1]
@@ -0,0 +1,151 @@
+"""
+Per-cluster detail fetching for NCL challenge clusters
+
+The world page only reports how many questions a cluster has and its total
+points. Each cluster's own page carries the real question titles and point
+values, so this module fetches those pages through a bounded worker pool and
+caches the results per cluster.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+# Default number of cluster pages fetched at once
+DEFAULT_MAX_WORKERS = 8
+
+# In-process cache shared by every call: {cache_key: [question dicts]}
+_memory_cache = {}
+_memory_cache_lock = threading.Lock()
+
+
+def cluster_signature(cluster):
+    """
+    Key identifying one version of a cluster.
+    The question count and total points are part of the key so a cached entry
+    is dropped as soon as cyberskyline changes the cluster.
+    """
+    return f"{cluster.id}-{cluster.question_count}-{cluster.total_points}"
+
+
+def extract_questions(preload_data):
+    """
+    Find the question list inside a cluster page's preload.
+    Returns a list of {'name', 'points'} dicts, or None if no list was found.
+    """
+    stack = [preload_data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            questions = node.get('questions')
+            if isinstance(questions, list) and all(isinstance(q, dict) for q in questions):
+                return [{
+                    'name': q.get('title') or q.get('name') or q.get('question'),
+                    'points': q.get('points')
+                } for q in questions]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
+def _read_disk_cache(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_disk_cache(cache_dir, key, questions):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(questions, f)
+    os.replace(tmp_path, path)
+
+
+def _fetch_one(cluster, fetch_preload, cluster_url, cache_dir):
+    """Fetch (or load from cache) the question details for one cluster"""
+    key = cluster_signature(cluster)
+
+    with _memory_cache_lock:
+        if key in _memory_cache:
+            return _memory_cache[key]
+
+    questions = _read_disk_cache(cache_dir, key) if cache_dir else None
+
+    if questions is None:
+        try:
+            preload_data = fetch_preload(cluster_url(cluster))
+        except Exception as e:
+            print(f"  ⚠ Could not fetch details for '{cluster.name}': {e}")
+            return None
+
+        questions = extract_questions(preload_data)
+        # Only trust a detail page that agrees with the world page
+        if not questions or len(questions) != cluster.question_count:
+            return None
+
+        if cache_dir:
+            _write_disk_cache(cache_dir, key, questions)
+
+    with _memory_cache_lock:
+        _memory_cache[key] = questions
+    return questions
+
+
+def fetch_cluster_details(challenge_clusters, fetch_preload, cluster_url,
+                          cache_dir=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Fetch question details for every Cluster that has an id.
+
+    fetch_preload(url) must return the parsed preload of a page and
+    cluster_url(cluster) must build the cluster's page URL.
+    Returns {cluster_signature: [{'name', 'points'}, ...]} for the clusters
+    whose details were found.
+    """
+    clusters = [c for c in challenge_clusters if c.id and c.questions]
+    if not clusters:
+        return {}
+
+    details = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(clusters))) as pool:
+        futures = {
+            cluster_signature(c): pool.submit(_fetch_one, c, fetch_preload, cluster_url, cache_dir)
+            for c in clusters
+        }
+        for key, future in futures.items():
+            questions = future.result()
+            if questions:
+                details[key] = questions
+
+    return details
+
+
+def apply_cluster_details(challenge_clusters, details):
+    """
+    Return the clusters with real question names and points filled in from
+    fetched details. Clusters without details keep their approximated values.
+    """
+    enriched = []
+    for cluster in challenge_clusters:
+        questions = details.get(cluster_signature(cluster)) if cluster.id else None
+        if not questions:
+            enriched.append(cluster)
+            continue
+
+        enriched.append(cluster.with_questions(
+            replace(
+                question,
+                name=detail.get('name') or question.name,
+                points=detail['points'] if isinstance(detail.get('points'), int) else question.points
+            )
+            for question, detail in zip(cluster.questions, questions)
+        ))
+
+    return enriched
@@ -18,6 +18,110 @@ CYBERSKYLINE_URL = "https://cyberskyline.com/world/your-world-id-here"
 # Gymnasium: https://cyberskyline.com/world/YOUR_GYMNASIUM_WORLD_ID
 # Team Game: https://cyberskyline.com/world/YOUR_TEAM_GAME_WORLD_ID
 
+# Optional: sync several worlds in one run (fetched concurrently).
+# Each world maps to a spreadsheet; 'categories' limits which tabs it syncs
+# and 'tabs' renames tabs (category key -> tab name). Names must be unique
+# across WORLDS and FLEET. Without WORLDS, the single CYBERSKYLINE_URL /
+# SHEET_ID pair above is used.
+# WORLDS = [
+#     {"name": "gym", "url": "https://cyberskyline.com/world/YOUR_GYMNASIUM_WORLD_ID",
+#      "sheet_id": "your-gym-sheet-id"},
+#     {"name": "team", "url": "https://cyberskyline.com/world/YOUR_TEAM_GAME_WORLD_ID",
+#      "sheet_id": "your-team-sheet-id", "tabs": {"enum": "Enum"}},
+# ]
+
+# Optional: fleet mode - keep several teams' copies of the answer sheet in
+# sync from one fetch of CYBERSKYLINE_URL (or the entry's own 'url').
+# Each entry takes the same keys as a WORLDS entry plus 'token_path', the
+# Google credential to write with (defaults to TOKEN_PATH). Every credential
+# gets its own Sheets quota and CATEGORY_WORKERS parallel tabs.
+# FLEET = [
+#     {"name": "alpha", "sheet_id": "team-alpha-sheet-id",
+#      "token_path": "/path/to/alpha_token.pickle"},
+#     {"name": "bravo", "sheet_id": "team-bravo-sheet-id",
+#      "token_path": "/path/to/bravo_token.pickle", "categories": ["crypto", "web"]},
+# ]
+
 # Authentication paths
 COOKIE_FILE = "/path/to/your/cyberskyline_cookies.txt"
 TOKEN_PATH = "/path/to/your/token.pickle"
+
+# Optional: local cache for per-cluster question details
+# CACHE_DIR = "/path/to/cache/ncl-sheet-sync"
+
+# Optional: per-cluster detail fetch (real question names and points)
+# FETCH_CLUSTER_DETAILS = True
+# DETAIL_WORKERS = 8
+# CLUSTER_URL_TEMPLATE = "{world_url}/challenge/{cluster_id}"
+
+# Optional: gzip-encode Sheets request bodies larger than GZIP_MIN_BYTES
+# (helps on slow or congested networks)
+# GZIP_REQUEST_BODIES = True
+# GZIP_MIN_BYTES = 8192
+
+# Optional: cyberskyline fetch policy (retries with backoff, per-request
+# timeout as (connect, read) seconds; the timeout applies to Sheets API
+# calls too)
+# FETCH_RETRIES = 3
+# FETCH_TIMEOUT = (5, 20)
+
+# Optional: when the cyberskyline session has expired, re-extract cookies
+# from the browser automatically and retry once
+# AUTO_REFRESH_COOKIES = True
+
+# Optional: SQLite history of every fetched world (set to None to disable).
+# Query it with: python snapshot_store.py latest|diff|history
+# SNAPSHOT_DB = "/path/to/cache/ncl-sheet-sync/snapshots.sqlite3"
+
+# Optional: compressed, append-only log of raw world data for replay
+# (set to None to disable). Inspect with: python snapshot_log.py info LOG
+# SNAPSHOT_LOG_DIR = "/path/to/cache/ncl-sheet-sync/snapshot-logs"
+
+# Optional: starting number of value ranges / formatting requests in each
+# Sheets batch. Batches are sent while the next one is being built, capped
+# at BATCH_MAX_BYTES, and resized as round trips come in faster or slower
+# than BATCH_TARGET_LATENCY seconds.
+# VALUE_CHUNK_SIZE = 500
+# REQUEST_CHUNK_SIZE = 100
+# BATCH_MAX_BYTES = 2097152
+# BATCH_TARGET_LATENCY = 2.0
+
+# Optional: how many sheets `update_sheet.py all` updates in parallel, and
+# the Sheets API quota (requests per minute) they all share
+# CATEGORY_WORKERS = 4
+# SHEETS_READS_PER_MINUTE = 60
+# SHEETS_WRITES_PER_MINUTE = 60
+
+# Optional: times a Sheets call is retried after 429 or 5xx, with exponential
+# backoff (up to 64s) that honours Retry-After
+# SHEETS_RETRIES = 6
+
+# Optional: poll interval bounds (seconds) for `update_sheet.py watch`. The
+# interval drops to the minimum after a change and grows by WATCH_BACKOFF
+# after every poll that finds nothing new.
+# WATCH_MIN_INTERVAL = 5.0
+# WATCH_MAX_INTERVAL = 60.0
+# WATCH_BACKOFF = 1.5
+
+# Optional: game start (`--at TIME`): pre-warm this many seconds before
+# TIME, then poll this often until the world shows challenges (giving up
+# after GAME_START_TIMEOUT seconds)
+# GAME_START_LEAD = 120
+# GAME_START_POLL_INTERVAL = 1.0
+# GAME_START_TIMEOUT = 900
+
+# Optional: address of the local control server (`update_sheet.py serve`).
+# Keep it on localhost. Every POST needs the SERVE_TOKEN in an
+# X-Sync-Token header; without one, a random token is printed at start-up.
+# SERVE_HOST = "127.0.0.1"
+# SERVE_PORT = 8765
+# SERVE_TOKEN = "a long random string"
+
+# Optional: refresh Google access tokens expiring within this many seconds,
+# and how often watch/serve check them in the background
+# TOKEN_REFRESH_MARGIN = 300
+# TOKEN_REFRESH_INTERVAL = 60
+
+# Optional: Sheets calls in flight at once on the asyncio engine
+# (./update_sheet.py all --yes --async)
+# ASYNC_SHEETS_CONCURRENCY = 8
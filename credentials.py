@@ -0,0 +1,131 @@
+"""
+Google OAuth credentials, loaded once per token file and kept fresh
+
+Every component (gspread clients, the asyncio engine, game start pre-warm)
+gets its credentials from one CredentialManager, so a token file is
+unpickled once per run and all of them share the same Credentials object.
+Access tokens are refreshed ahead of expiry, when they are loaded or by
+a background thread in long-running modes (watch, serve), never in the
+middle of a write. The refreshed token is written back to the token file
+atomically, so the next run starts from a valid token.
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+
+from google.auth.transport.requests import Request as GoogleAuthRequest
+
+# Refresh access tokens that expire within this many seconds
+DEFAULT_REFRESH_MARGIN = 300.0
+# Seconds between expiry checks of the background refresher
+DEFAULT_REFRESH_INTERVAL = 60.0
+
+
+def write_token(token_path, creds):
+    """Pickle creds to token_path atomically (readers never see a partial file)"""
+    directory = os.path.dirname(os.path.abspath(token_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.token-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(creds, f)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(token_path).st_mode & 0o777)
+        except OSError:
+            pass
+        os.replace(tmp_path, token_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class CredentialManager:
+    """
+    Credentials per token file, refreshed when they expire within
+    refresh_margin seconds. Thread-safe; refreshes of one token file are
+    serialized so concurrent callers refresh it only once.
+    """
+
+    def __init__(self, refresh_margin=DEFAULT_REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._creds = {}  # token_path -> Credentials
+        self._locks = {}  # token_path -> Lock
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._stopped = threading.Event()
+
+    def _path_lock(self, token_path):
+        with self._lock:
+            return self._locks.setdefault(token_path, threading.Lock())
+
+    def due(self, creds):
+        """True if creds have no valid token or it expires within refresh_margin"""
+        if not creds.token or not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # expiry is naive UTC
+        return creds.expiry - now < timedelta(seconds=self.refresh_margin)
+
+    def credentials(self, token_path):
+        """The shared Credentials of a token file, refreshed first if due"""
+        with self._path_lock(token_path):
+            creds = self._creds.get(token_path)
+            if creds is None:
+                with open(token_path, 'rb') as token:
+                    creds = pickle.load(token)
+                self._creds[token_path] = creds
+        self.refresh(token_path)
+        return creds
+
+    def refresh(self, token_path, force=False):
+        """
+        Refresh a loaded token file's credentials if due (or force) and write
+        them back; returns True if they were refreshed.
+        """
+        with self._path_lock(token_path):
+            creds = self._creds[token_path]
+            if not getattr(creds, 'refresh_token', None) or not (force or self.due(creds)):
+                return False
+            creds.refresh(GoogleAuthRequest())
+            write_token(token_path, creds)
+            return True
+
+    def refresh_all(self):
+        """Refresh every loaded token file that is due; failures are reported, not raised"""
+        with self._lock:
+            paths = list(self._creds)
+        for token_path in paths:
+            try:
+                if self.refresh(token_path):
+                    print(f"  ✓ Refreshed Google credentials {token_path}")
+            except Exception as e:
+                print(f"  ⚠ Could not refresh Google credentials {token_path}: {e}")
+
+    def start_refresher(self, interval=DEFAULT_REFRESH_INTERVAL):
+        """Check (and refresh) loaded credentials every interval seconds on a daemon thread"""
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._stopped.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, args=(interval,),
+                                               name='credential-refresher', daemon=True)
+            self._refresher.start()
+
+    def stop_refresher(self):
+        with self._lock:
+            refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            self._stopped.set()
+            refresher.join()
+
+    def _refresh_loop(self, interval):
+        while not self._stopped.wait(interval):
+            self.refresh_all()
@@ -0,0 +1,189 @@
+"""
+Scheduled game start: be ready before the clock starts
+
+    ./update_sheet.py all --yes --at 2026-10-24T13:00
+
+sleeps until GAME_START_LEAD seconds before the given time, then does
+everything that doesn't depend on the challenges:
+
+  - loads and refreshes the Google credentials,
+  - opens every spreadsheet and resolves its worksheet IDs,
+  - opens pooled connections to cyberskyline and the Sheets API (and checks
+    the cyberskyline cookies while there is still time to fix them),
+  - plans a synthetic tab once, so the planner and request templates are
+    warm.
+
+From the start time it polls every GAME_START_POLL_INTERVAL seconds until
+the world returns real challenges (not the "Redacted" placeholders listed
+before the game), then syncs straight away, leaving only the
+fetch and the writes on the clock.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from sheet_plan import PHASES, plan_category_sheet
+from synthetic_world import generate_preload
+from transport import RETRYABLE_EXCEPTIONS, CircuitOpenError
+from update_sheet import (
+    CATEGORIES,
+    open_world_sheets,
+    select_worlds,
+    sheet_key,
+    world_category_keys,
+    world_credentials,
+    world_urls,
+)
+from update_sheet_template import (
+    GAME_START_LEAD,
+    GAME_START_POLL_INTERVAL,
+    GAME_START_TIMEOUT,
+    CREDENTIALS,
+    CyberskylineError,
+    fetch_preload,
+    parse_world,
+    store_preload,
+    world_clusters,
+)
+from world_parser import is_redacted
+
+
+def parse_start_time(text):
+    """
+    Start time as a Unix timestamp. Accepts seconds since the epoch, an ISO
+    date and time (local time unless it has an offset) or HH:MM[:SS], the
+    next time that clock time comes round (today, or tomorrow if it has
+    passed). Raises ValueError if text is none of these.
+    """
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        pass
+    try:
+        clock = datetime.strptime(text, '%H:%M:%S' if text.count(':') == 2 else '%H:%M')
+    except ValueError:
+        raise ValueError(f"--at needs an ISO date/time or HH:MM[:SS], not '{text}'") from None
+    now = datetime.now()
+    start = now.replace(hour=clock.hour, minute=clock.minute, second=clock.second, microsecond=0)
+    if start <= now:
+        start += timedelta(days=1)
+    return start.timestamp()
+
+
+def sleep_until(timestamp):
+    while True:
+        remaining = timestamp - time.time()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 60.0))
+
+
+def warm_planner():
+    """Plan one synthetic tab end to end so first-use costs are paid early"""
+    world = parse_world(generate_preload(categories=1, clusters_per_category=4))
+    clusters = next(iter(world['categories'].values())).clusters
+    plan = plan_category_sheet(0, clusters, 3)
+    for phase in PHASES:
+        for _ in plan[phase]:
+            pass
+
+
+def prewarm(worlds, dry_run):
+    """Everything a sync needs that doesn't depend on the challenges; returns open_world_sheets()"""
+    print(f"Pre-warming at {time.strftime('%H:%M:%S')}...")
+
+    for url in world_urls(worlds):
+        try:
+            fetch_preload(url)
+            print(f"  ✓ Connected to {url}")
+        except (CyberskylineError, CircuitOpenError) + RETRYABLE_EXCEPTIONS as e:
+            print(f"  ⚠ {url}: {e}")
+
+    sheets = None
+    if not dry_run:
+        sheets = open_world_sheets(worlds)
+        for world in worlds:
+            opened = sheets[sheet_key(world)]
+            if isinstance(opened, Exception):
+                print(f"  ⚠ Could not open the spreadsheet of {world['name']}: {opened}")
+        # A token refreshed now is good for the whole game start window
+        refreshed = set()
+        for token_path in world_credentials(worlds):
+            try:
+                CREDENTIALS.credentials(token_path)
+                if CREDENTIALS.refresh(token_path, force=True):
+                    refreshed.add(token_path)
+            except Exception as e:
+                print(f"  ⚠ Could not refresh credentials {token_path}: {e}")
+        resolved = sum(len(opened[1]) for opened in sheets.values() if not isinstance(opened, Exception))
+        print(f"  ✓ {len(refreshed)}/{len(world_credentials(worlds))} credentials refreshed, "
+              f"{resolved} worksheets resolved")
+
+    warm_planner()
+    print("  ✓ Planner warmed")
+    return sheets
+
+
+def has_challenges(preload_data, worlds, category_keys):
+    """
+    True once the world lists real challenges (not the redacted placeholders
+    shown before the game) in any category the worlds sync
+    """
+    world_model = parse_world(preload_data)
+    keys = {key for world in worlds for key in world_category_keys(world, category_keys)}
+    return any(not is_redacted(cluster)
+               for key in keys for cluster in world_clusters(world_model, CATEGORIES[key][1]))
+
+
+def poll_until_live(worlds, category_keys, timeout=GAME_START_TIMEOUT,
+                    interval=GAME_START_POLL_INTERVAL):
+    """
+    Poll every world until it returns challenges; returns {url: preload data}
+    for the worlds that went live before the timeout.
+    """
+    waiting = set(world_urls(worlds))
+    live = {}
+    deadline = time.monotonic() + timeout
+    polls = 0
+    while waiting and time.monotonic() < deadline:
+        for url in sorted(waiting):
+            polls += 1
+            try:
+                preload_data = fetch_preload(url)
+            except (CyberskylineError, CircuitOpenError) + RETRYABLE_EXCEPTIONS:
+                continue
+            if has_challenges(preload_data, [w for w in worlds if w['url'] == url], category_keys):
+                print(f"{time.strftime('%H:%M:%S')} {url} is live (after {polls} polls)")
+                store_preload(url, preload_data)
+                live[url] = preload_data
+                waiting.discard(url)
+        if waiting:
+            time.sleep(interval)
+
+    for url in waiting:
+        print(f"ERROR: {url} returned no challenges within {timeout:g}s of the start")
+    return live
+
+
+def wait_for_game_start(start, category_keys, dry_run=True, world_names=None):
+    """
+    Pre-warm before start (a Unix timestamp), then poll from start until the
+    worlds go live. Returns (worlds, {url: preload data}, sheets).
+    """
+    worlds = [world for world in select_worlds(world_names)
+              if world_category_keys(world, category_keys)]
+    if not worlds:
+        return [], {}, None
+
+    print(f"Game starts at {datetime.fromtimestamp(start):%Y-%m-%d %H:%M:%S}; "
+          f"pre-warming {GAME_START_LEAD:g}s before")
+    sleep_until(start - GAME_START_LEAD)
+    sheets = prewarm(worlds, dry_run)
+
+    sleep_until(start)
+    print(f"{time.strftime('%H:%M:%S')} Game start: polling every {GAME_START_POLL_INTERVAL:g}s...")
+    return worlds, poll_until_live(worlds, category_keys), sheets
@@ -0,0 +1,123 @@
+"""
+Compact data model for parsed challenge data
+
+Frozen, slotted dataclasses for categories, clusters and questions. They are
+hashable and compare by value, so they can be used as cache and diff keys.
+The adapters at the bottom convert to and from the plain dicts the older
+code passes around ({'name', 'questions': [{'points', 'index'}], ...}).
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field, replace
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    index: int
+    points: int
+    name: Optional[str]  # None until the real title is known
+
+    @property
+    def label(self):
+        """Text shown in the sheet"""
+        return self.name or f"Question {self.index}"
+
+
+@dataclass(frozen=True, slots=True)
+class Cluster:
+    id: Optional[str]
+    name: str
+    questions: Tuple[Question, ...]
+    total_points: int
+    # Lazily filled cache of content_hash; not part of equality, hash or repr
+    _content_hash: Optional[str] = field(init=False, compare=False, repr=False, default=None)
+
+    @property
+    def question_count(self):
+        return len(self.questions)
+
+    @property
+    def key(self):
+        """Identity of the cluster across fetches: its id, or its name without one"""
+        return self.id or f"name:{self.name}"
+
+    @property
+    def content_hash(self):
+        """Stable hash of everything shown in the sheet for this cluster (computed once)"""
+        if self._content_hash is not None:
+            return self._content_hash
+        payload = json.dumps(
+            [self.name, self.total_points, [[q.index, q.points, q.name] for q in self.questions]],
+            separators=(',', ':')
+        )
+        digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+        object.__setattr__(self, '_content_hash', digest)
+        return digest
+
+    def with_questions(self, questions):
+        return replace(self, questions=tuple(questions))
+
+
+@dataclass(frozen=True, slots=True)
+class Category:
+    name: str
+    sheet_name: Optional[str]
+    clusters: Tuple[Cluster, ...]
+    # Lazily filled cache of content_hash; not part of equality, hash or repr
+    _content_hash: Optional[str] = field(init=False, compare=False, repr=False, default=None)
+
+    @property
+    def total_points(self):
+        return sum(c.total_points for c in self.clusters)
+
+    @property
+    def question_count(self):
+        return sum(c.question_count for c in self.clusters)
+
+    @property
+    def content_hash(self):
+        """Hash over the category's cluster hashes, in sheet order (computed once)"""
+        if self._content_hash is not None:
+            return self._content_hash
+        payload = '\n'.join(c.content_hash for c in self.clusters)
+        digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+        object.__setattr__(self, '_content_hash', digest)
+        return digest
+
+
+# Adapters between the dict form and the dataclasses
+
+def question_from_dict(question):
+    return Question(question['index'], question['points'], question.get('name'))
+
+
+def question_to_dict(question):
+    result = {'points': question.points, 'index': question.index}
+    if question.name:
+        result['name'] = question.name
+    return result
+
+
+def cluster_from_dict(cluster):
+    return Cluster(
+        cluster.get('id'),
+        cluster['name'],
+        tuple(question_from_dict(q) for q in cluster['questions']),
+        cluster['total_points']
+    )
+
+
+def cluster_to_dict(cluster):
+    return {
+        'id': cluster.id,
+        'name': cluster.name,
+        'questions': [question_to_dict(q) for q in cluster.questions],
+        'total_points': cluster.total_points
+    }
+
+
+def as_clusters(challenge_clusters):
+    """Accept clusters as Cluster objects or dicts; return a list of Clusters"""
+    return [c if isinstance(c, Cluster) else cluster_from_dict(c) for c in challenge_clusters]
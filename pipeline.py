@@ -0,0 +1,77 @@
+"""
+Threaded pipeline stages joined by bounded queues
+
+stage(fn, items, workers) runs fn over items on its own worker threads and
+yields the results as they finish. Its input may itself be a stage, so
+
+    written = stage(write, stage(check, stage(plan, fetched)))
+
+runs planning, checking and writing at the same time: the first tab can be
+written while later ones are still being planned. Each stage holds at most
+`maxsize` finished results that nobody has consumed yet, so a slow stage
+holds back the ones before it instead of letting work pile up in memory.
+"""
+
+import queue
+import threading
+
+_DONE = object()
+
+
+def stage(fn, items, workers=1, maxsize=None):
+    """
+    Yield fn(item) for every item, computed on `workers` threads, in the
+    order they finish. Workers pull from items themselves (one at a time),
+    so items can be a lazy or blocking iterable such as another stage.
+    The first exception raised by fn or by items is re-raised here.
+    If the consumer stops early (an error, or closing the generator), the
+    workers finish the item in hand and exit, and items is closed, so the
+    stages feeding this one stop as well instead of blocking forever.
+    """
+    results = queue.Queue(maxsize=maxsize or workers)
+    source = iter(items)
+    source_lock = threading.Lock()
+    stopped = threading.Event()  # set on failure or when the consumer stops
+
+    def worker():
+        try:
+            while not stopped.is_set():
+                with source_lock:
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        return
+                if stopped.is_set():
+                    return
+                results.put((fn(item), None))
+        except BaseException as e:
+            stopped.set()
+            results.put((None, e))
+        finally:
+            results.put(_DONE)
+
+    for i in range(workers):
+        threading.Thread(target=worker, name=f"{getattr(fn, '__name__', 'stage')}-{i}",
+                         daemon=True).start()
+
+    running = workers
+    try:
+        while running:
+            result = results.get()
+            if result is _DONE:
+                running -= 1
+                continue
+            value, error = result
+            if error is not None:
+                raise error
+            yield value
+    finally:
+        # Drain so no worker stays blocked on a full queue, then stop the
+        # stage feeding this one (no worker is pulling from it any more)
+        stopped.set()
+        while running:
+            if results.get() is _DONE:
+                running -= 1
+        close = getattr(source, 'close', None)
+        if close is not None:
+            close()
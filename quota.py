@@ -0,0 +1,122 @@
+"""
+Client-side quota for the Google Sheets API
+
+The Sheets API allows a fixed number of read and write requests per minute
+per user (60 each by default). When several tabs are written in parallel
+every thread draws from the same SheetsQuota, which is installed on the
+gspread session's SheetsAdapter (see transport.install_sheets_adapter), so
+requests wait for a token instead of running into 429 errors. If the server
+still answers 429, the budget is paused for the Retry-After period so every
+thread backs off together.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+# Default Sheets API quota: requests per minute per user
+DEFAULT_READS_PER_MINUTE = 60
+DEFAULT_WRITES_PER_MINUTE = 60
+
+# Seconds the current thread or task has waited on any SheetsQuota
+_waited = contextvars.ContextVar('sheets_quota_waited', default=0.0)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket holding up to capacity tokens, refilled at
+    rate tokens per second. acquire() blocks until a token is available.
+    """
+
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, quota, burst=None):
+        """
+        Bucket that never lets more than quota requests through in any
+        60-second window: burst up front, the rest spread over the minute.
+        """
+        burst = max(1, min(quota, burst if burst is not None else quota // 6))
+        return cls(burst, max(quota - burst, 1) / 60.0)
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available and return 0; otherwise return seconds to wait"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def pause(self, seconds):
+        """Hand out no tokens for the next `seconds` (after a 429 from the server)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping until they are available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class SheetsQuota:
+    """
+    Separate read and write budgets shared by every Sheets request made
+    with one credential. Time spent waiting is tallied per thread (or
+    asyncio task), across every quota, so callers timing a request can tell
+    quota waits from network latency.
+    """
+
+    def __init__(self, reads_per_minute=DEFAULT_READS_PER_MINUTE,
+                 writes_per_minute=DEFAULT_WRITES_PER_MINUTE):
+        self.reads = TokenBucket.per_minute(reads_per_minute)
+        self.writes = TokenBucket.per_minute(writes_per_minute)
+
+    def waited(self):
+        """Total seconds the current thread or task has waited for budget"""
+        return _waited.get()
+
+    def bucket(self, method):
+        """The bucket a request with the given HTTP method draws from"""
+        return self.reads if method.upper() in ('GET', 'HEAD') else self.writes
+
+    def pause(self, method, seconds):
+        """Hold back every request drawing from the same budget as method"""
+        self.bucket(method).pause(seconds)
+
+    def acquire(self, method):
+        """Wait for budget for one request with the given HTTP method"""
+        waited = self.bucket(method).acquire()
+        if waited:
+            _waited.set(_waited.get() + waited)
+        return waited
+
+    async def acquire_async(self, method):
+        """acquire() for coroutines: sleeps on the event loop instead of blocking"""
+        bucket = self.bucket(method)
+        waited = 0.0
+        while True:
+            wait = bucket.try_acquire()
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        if waited:
+            _waited.set(_waited.get() + waited)
+        return waited
@@ -0,0 +1,76 @@
+"""
+Rectangle cover for per-cell formatting intents
+
+The sheet planner knows, cell by cell, which format, dropdown or colour rule
+each cell should get. Sending one request per row repeats the same format
+for every row; cover_rectangles instead groups the cells that share an
+intent into a few rectangular GridRanges (for example every question row of
+a cluster, or the whole G:M band), so one request covers many rows.
+
+Cells are given as row segments (row, start_column, end_column), 0-based
+and end-exclusive like GridRange. Cells in `allowed` may be covered but
+need not be: they let rectangles run across rows where the format makes no
+visible difference, such as blank separator rows for a text-colour rule.
+"""
+
+
+def _runs(segments):
+    """Merge (start, end) column segments of one row into disjoint sorted runs"""
+    runs = []
+    for start, end in sorted(segments):
+        if runs and start <= runs[-1][1]:
+            if end > runs[-1][1]:
+                runs[-1][1] = end
+        else:
+            runs.append([start, end])
+    return [tuple(run) for run in runs]
+
+
+def _overlaps(segments, start, end):
+    return any(s < end and start < e for s, e in segments)
+
+
+def cover_rectangles(required, allowed=()):
+    """
+    Cover every required cell with rectangles that contain only required or
+    allowed cells. Returns (start_row, end_row, start_column, end_column)
+    tuples, end-exclusive, sorted by position. Rows are merged greedily:
+    identical column runs on consecutive rows become one rectangle, then
+    rows at either end holding no required cells are trimmed off.
+    """
+    required_by_row = {}
+    for row, start, end in required:
+        required_by_row.setdefault(row, []).append((start, end))
+    segments_by_row = {row: list(segments) for row, segments in required_by_row.items()}
+    for row, start, end in allowed:
+        segments_by_row.setdefault(row, []).append((start, end))
+
+    rectangles = []
+    open_rects = {}  # (start_column, end_column) -> [start_row, end_row]
+    for row in sorted(segments_by_row):
+        runs = _runs(segments_by_row[row])
+        for run in list(open_rects):
+            rows = open_rects[run]
+            if run not in runs or rows[1] != row:
+                rectangles.append((rows[0], rows[1]) + run)
+                del open_rects[run]
+        for run in runs:
+            if run in open_rects:
+                open_rects[run][1] = row + 1
+            else:
+                open_rects[run] = [row, row + 1]
+    rectangles.extend((rows[0], rows[1]) + run for run, rows in open_rects.items())
+
+    # Trim rows without required cells off both ends; drop empty rectangles
+    trimmed = []
+    for start_row, end_row, start_column, end_column in rectangles:
+        def needed(row):
+            return _overlaps(required_by_row.get(row, ()), start_column, end_column)
+        while start_row < end_row and not needed(start_row):
+            start_row += 1
+        while end_row > start_row and not needed(end_row - 1):
+            end_row -= 1
+        if start_row < end_row:
+            trimmed.append((start_row, end_row, start_column, end_column))
+
+    return sorted(trimmed)
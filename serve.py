@@ -0,0 +1,320 @@
+"""
+Local control server: warm, on-demand syncs
+
+    ./update_sheet.py serve --yes [--port 8765]
+
+keeps the authorized Google clients, every spreadsheet's worksheet map and
+the latest world preloads in memory, and syncs on request, so a sync costs
+the cyberskyline fetch and the Sheets writes but no start-up, token loading
+or metadata reads. Google tokens are refreshed in the background before
+they expire. It listens on SERVE_HOST (127.0.0.1) only.
+
+POSTs must carry the shared token (SERVE_TOKEN, or a random one printed at
+start-up) in an X-Sync-Token header, and requests from a browser page on
+another origin are refused, so a web page can't trigger syncs. Both get 403.
+
+    POST /sync/<category>[,<category>...]   sync tabs ('all' for every category)
+         ?test=1     write to rows 50+
+         ?dry_run=1  preview only
+         ?fresh=0    reuse the preload in memory instead of fetching
+    POST /reload     reopen the spreadsheets (after adding or renaming tabs)
+    GET  /status     running sync, last result per tab, preload ages
+    GET  /metrics    sync and fetch counters, batch statistics
+
+Responses are JSON. One sync runs at a time; a request made while another
+sync is running gets 409. A sync or reload that raises gets 500 with the
+error, which is also recorded in /status (as tab '*') and /metrics.
+"""
+
+import hmac
+import json
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from update_sheet import (
+    CATEGORIES,
+    open_world_sheets,
+    select_worlds,
+    sheet_key,
+    sync_tabs,
+    world_category_keys,
+    world_urls,
+)
+from update_sheet_template import (
+    CATEGORY_WORKERS,
+    CREDENTIALS,
+    REQUEST_BATCHER,
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_TOKEN,
+    TOKEN_REFRESH_INTERVAL,
+    VALUE_BATCHER,
+    fetch_cyberskyline_data,
+)
+
+
+class SyncBusyError(Exception):
+    """Another sync is already running"""
+
+
+class SyncServer:
+    """State shared by every request: warm clients, preloads, results and counters"""
+
+    def __init__(self, worlds, test_mode=False, dry_run=True, fetch_details=True,
+                 workers=CATEGORY_WORKERS):
+        self.worlds = worlds
+        self.test_mode = test_mode
+        self.dry_run = dry_run
+        self.fetch_details = fetch_details
+        self.workers = workers
+        self.sheets = None
+        self.preloads = {}  # url -> (preload data, fetched at)
+        self.last_results = {}  # tab label -> result dict
+        self.running = None
+        self.started_at = time.time()
+        self.counters = {'syncs': 0, 'failed_syncs': 0, 'sync_errors': 0,
+                         'tabs_synced': 0, 'tabs_failed': 0,
+                         'sync_seconds': 0.0, 'fetches': 0, 'fetch_errors': 0, 'fetch_seconds': 0.0}
+        self._sync_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    def reload(self):
+        """(Re)open every spreadsheet with its worksheet map"""
+        if self.dry_run:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            raise SyncBusyError("Can't reload while a sync is running")
+        try:
+            print("Authenticating with Google Sheets...")
+            self.sheets = open_world_sheets(self.worlds)
+            for world in self.worlds:
+                opened = self.sheets[sheet_key(world)]
+                if isinstance(opened, Exception):
+                    print(f"  ⚠ Could not open the spreadsheet of {world['name']}: {opened}")
+        finally:
+            self._sync_lock.release()
+
+    def fetch(self, urls):
+        """Fetch worlds concurrently into memory; failures keep the previous preload"""
+        def fetch_one(url):
+            started = time.monotonic()
+            try:
+                preload_data = fetch_cyberskyline_data(url)
+            except Exception as e:
+                print(f"  ⚠ Could not fetch {url}: {e}")
+                preload_data = None
+            with self._state_lock:
+                self.counters['fetches'] += 1
+                self.counters['fetch_seconds'] += time.monotonic() - started
+                if preload_data is None:
+                    self.counters['fetch_errors'] += 1
+                else:
+                    self.preloads[url] = (preload_data, time.time())
+
+        with ThreadPoolExecutor(max_workers=len(urls) or 1) as pool:
+            list(pool.map(fetch_one, urls))
+
+    def sync(self, category_keys, test_mode=None, dry_run=None, fresh=True):
+        """
+        Sync tabs of category_keys; returns the per-tab results, or the error
+        (under 'error') if the sync raised.
+        """
+        test_mode = self.test_mode if test_mode is None else test_mode
+        dry_run = self.dry_run or bool(dry_run)
+        worlds = [world for world in self.worlds if world_category_keys(world, category_keys)]
+
+        if not self._sync_lock.acquire(blocking=False):
+            running = self.running or {}
+            raise SyncBusyError(f"A sync is already running: {running.get('categories')}")
+        started = time.monotonic()
+        error = None
+        try:
+            self.running = {'categories': category_keys, 'started_at': time.time()}
+            urls = world_urls(worlds)
+            if fresh or any(url not in self.preloads for url in urls):
+                self.fetch(urls)
+            preloads = {url: self.preloads[url][0] for url in urls if url in self.preloads}
+            worlds = [world for world in worlds if world['url'] in preloads]
+
+            results = sync_tabs(worlds, category_keys, test_mode, dry_run, self.fetch_details,
+                                self.workers, preloads, self.sheets) if worlds else []
+        except Exception as e:
+            print(f"  ⚠ Sync of {', '.join(category_keys)} failed: {e}")
+            error = e
+            results = [("*", False, f"Sync failed: {e}")]
+        finally:
+            self.running = None
+            self._sync_lock.release()
+
+        elapsed = time.monotonic() - started
+        finished_at = time.time()
+        with self._state_lock:
+            self.counters['syncs'] += 1
+            self.counters['sync_seconds'] += elapsed
+            if error is not None:
+                self.counters['sync_errors'] += 1
+            if not results or not all(success for _, success, _ in results):
+                self.counters['failed_syncs'] += 1
+            for label, success, message in results:
+                self.counters['tabs_synced' if success else 'tabs_failed'] += 1
+                self.last_results[label] = {'success': success, 'message': message,
+                                            'dry_run': dry_run, 'at': finished_at}
+        result = {
+            'success': bool(results) and all(success for _, success, _ in results),
+            'seconds': round(elapsed, 3),
+            'dry_run': dry_run,
+            'results': [{'tab': label, 'success': success, 'message': message}
+                        for label, success, message in results],
+        }
+        if error is not None:
+            result['error'] = str(error)
+        return result
+
+    def status(self):
+        now = time.time()
+        with self._state_lock:
+            return {
+                'uptime_seconds': round(now - self.started_at, 1),
+                'dry_run': self.dry_run,
+                'running': self.running,
+                'worlds': [world['name'] for world in self.worlds],
+                'preload_age_seconds': {url: round(now - fetched_at, 1)
+                                        for url, (_, fetched_at) in self.preloads.items()},
+                'tabs': dict(self.last_results),
+            }
+
+    def metrics(self):
+        with self._state_lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            'value_batches': VALUE_BATCHER.stats(),
+            'request_batches': REQUEST_BATCHER.stats(),
+        }
+
+
+def parse_categories(text):
+    """Category keys from 'all' or a comma-separated list; raises ValueError on unknown keys"""
+    if text == 'all':
+        return list(CATEGORIES)
+    keys = [key for key in text.lower().split(',') if key]
+    unknown = [key for key in keys if key not in CATEGORIES]
+    if unknown or not keys:
+        raise ValueError(f"Unknown category: {', '.join(unknown) or text!r}")
+    return keys
+
+
+class ControlHandler(BaseHTTPRequestHandler):
+    server_version = 'ncl-sheet-sync'
+
+    def _reply(self, status, body):
+        data = json.dumps(body, indent=2, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _forbidden(self, need_token):
+        """Replies 403 and returns True if the request is from a foreign origin or lacks the token"""
+        origin = self.headers.get('Origin')
+        if origin is not None and origin != self.server.origin:
+            self._reply(403, {'error': f"Requests from {origin} are not allowed"})
+            return True
+        token = self.headers.get('X-Sync-Token', '')
+        if need_token and not hmac.compare_digest(token.encode('utf-8'),
+                                                  self.server.token.encode('utf-8')):
+            self._reply(403, {'error': "Missing or wrong X-Sync-Token header"})
+            return True
+        return False
+
+    def do_GET(self):
+        if self._forbidden(need_token=False):
+            return
+        path = urlsplit(self.path).path.rstrip('/')
+        state = self.server.state
+        if path == '/status':
+            self._reply(200, state.status())
+        elif path == '/metrics':
+            self._reply(200, state.metrics())
+        else:
+            self._reply(404, {'error': f"No such endpoint: {path}"})
+
+    def do_POST(self):
+        if self._forbidden(need_token=True):
+            return
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        state = self.server.state
+
+        if path == '/reload':
+            try:
+                state.reload()
+            except SyncBusyError as e:
+                self._reply(409, {'error': str(e)})
+                return
+            except Exception as e:
+                print(f"  ⚠ Reload failed: {e}")
+                self._reply(500, {'error': f"Reload failed: {e}"})
+                return
+            self._reply(200, {'reloaded': True})
+            return
+        if not path.startswith('/sync/'):
+            self._reply(404, {'error': f"No such endpoint: {path}"})
+            return
+
+        try:
+            category_keys = parse_categories(path[len('/sync/'):])
+        except ValueError as e:
+            self._reply(400, {'error': str(e)})
+            return
+
+        try:
+            result = state.sync(category_keys,
+                                test_mode=query['test'] == '1' if 'test' in query else None,
+                                dry_run=query.get('dry_run') == '1',
+                                fresh=query.get('fresh', '1') != '0')
+        except SyncBusyError as e:
+            self._reply(409, {'error': str(e)})
+            return
+        self._reply(500 if 'error' in result else 200, result)
+
+    def log_message(self, format, *args):
+        print(f"{time.strftime('%H:%M:%S')} {self.address_string()} {format % args}")
+
+
+def serve(test_mode=False, dry_run=True, fetch_details=True, world_names=None,
+          workers=CATEGORY_WORKERS, host=SERVE_HOST, port=SERVE_PORT, token=SERVE_TOKEN):
+    """Warm up and serve sync requests until interrupted (token: see the module docstring)"""
+    worlds = select_worlds(world_names)
+    if not worlds:
+        return False
+
+    state = SyncServer(worlds, test_mode, dry_run, fetch_details, workers)
+    state.reload()
+    if not dry_run:
+        CREDENTIALS.start_refresher(TOKEN_REFRESH_INTERVAL)
+    print("Fetching data from cyberskyline...")
+    state.fetch(world_urls(worlds))
+
+    httpd = ThreadingHTTPServer((host, port), ControlHandler)
+    httpd.daemon_threads = True
+    httpd.state = state
+    httpd.origin = f"http://{host}:{port}"
+    httpd.token = token or secrets.token_urlsafe(24)
+    print(f"Serving on http://{host}:{port} ({'dry run' if dry_run else 'writing to sheets'}; Ctrl-C to stop)")
+    if not token:
+        print(f"  Sync token for this run (set SERVE_TOKEN in config.py to fix it): {httpd.token}")
+    print(f"  curl -X POST -H 'X-Sync-Token: {httpd.token}' http://{host}:{port}/sync/all")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped serving")
+    finally:
+        httpd.server_close()
+    return True
@@ -0,0 +1,373 @@
+"""
+Request planning for a category sheet
+
+Pure functions that lay out challenge clusters on a tab and build the
+Google Sheets requests for it (cell values, dropdowns, formatting and
+conditional formatting). Nothing here talks to the network, so the same
+plan can be sent by update_sheet_template.update_category_sheet or
+inspected offline (see synthetic_world.py).
+"""
+
+from rectangles import cover_rectangles
+from request_templates import RequestTemplate, slot
+
+# Data validation rules
+ANSWER_STATUS_VALIDATION = {
+    'condition': {
+        'type': 'ONE_OF_LIST',
+        'values': [
+            {'userEnteredValue': 'Yes'},
+            {'userEnteredValue': 'No'},
+            {'userEnteredValue': 'N/A'},
+            {'userEnteredValue': 'Needs Validation'},
+            {'userEnteredValue': 'Ready to submit'}
+        ]
+    },
+    'strict': True,
+    'showCustomUi': True
+}
+
+TEAM_MEMBER_VALIDATION = {
+    'condition': {
+        'type': 'ONE_OF_LIST',
+        'values': [
+            {'userEnteredValue': 'Nothing'},
+            {'userEnteredValue': 'Started'},
+            {'userEnteredValue': 'Agree'},
+            {'userEnteredValue': 'Disagree'},
+            {'userEnteredValue': 'Surrender'}
+        ]
+    },
+    'strict': True,
+    'showCustomUi': True
+}
+
+# Column indexes (0-based)
+ANSWER_STATUS_COLUMN = 3          # Column D
+TEAM_MEMBER_COLUMNS = (6, 13)     # Columns G-M
+ALL_COLUMNS = (0, 14)             # Columns A-N
+
+# Request phases of a plan, in the order they are sent
+PHASES = ('updates', 'validation_requests', 'format_requests', 'conditional_format_requests')
+
+# Conditional formatting for the Answer Status dropdown (column D)
+ANSWER_STATUS_FORMATS = [
+    # Yes = white text on green background
+    ('Yes', {
+        'backgroundColor': {'green': 1},
+        'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
+        'backgroundColorStyle': {'rgbColor': {'green': 1}}
+    }),
+    # No = white text on red background
+    ('No', {
+        'backgroundColor': {'red': 1},
+        'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
+        'backgroundColorStyle': {'rgbColor': {'red': 1}}
+    }),
+    # N/A = black text on grey background
+    ('N/A', {
+        'backgroundColor': {'red': 0.85, 'green': 0.85, 'blue': 0.85},
+        'textFormat': {'foregroundColor': {}},
+        'backgroundColorStyle': {'rgbColor': {'red': 0.85, 'green': 0.85, 'blue': 0.85}}
+    }),
+    # Needs Validation = black text on beige/yellowish background
+    ('Needs Validation', {
+        'backgroundColor': {'red': 1, 'green': 0.95, 'blue': 0.8},
+        'textFormat': {'foregroundColor': {}},
+        'backgroundColorStyle': {'rgbColor': {'red': 1, 'green': 0.95, 'blue': 0.8}}
+    }),
+    # Ready to submit = dark green text on light green background
+    ('Ready to submit', {
+        'backgroundColor': {'red': 0.85, 'green': 0.92, 'blue': 0.83},
+        'textFormat': {'foregroundColor': {'green': 0.5}, 'bold': True},
+        'backgroundColorStyle': {'rgbColor': {'red': 0.85, 'green': 0.92, 'blue': 0.83}}
+    }),
+]
+
+# Conditional formatting for the team member dropdowns (columns G-M)
+TEAM_MEMBER_FORMATS = [
+    # Nothing = White
+    ('Nothing', {
+        'backgroundColor': {'red': 1, 'green': 1, 'blue': 1},
+        'textFormat': {'foregroundColor': {}},
+        'backgroundColorStyle': {'rgbColor': {'red': 1, 'green': 1, 'blue': 1}}
+    }),
+    # Started = Light green
+    ('Started', {
+        'backgroundColor': {'red': 0.8509804, 'green': 0.91764706, 'blue': 0.827451},
+        'textFormat': {'foregroundColor': {}},
+        'backgroundColorStyle': {'rgbColor': {'red': 0.8509804, 'green': 0.91764706, 'blue': 0.827451}}
+    }),
+    # Agree = Green, bold
+    ('Agree', {
+        'backgroundColor': {'green': 1},
+        'textFormat': {'foregroundColor': {}, 'bold': True},
+        'backgroundColorStyle': {'rgbColor': {'green': 1}}
+    }),
+    # Disagree = Red background, white bold text
+    ('Disagree', {
+        'backgroundColor': {'red': 1},
+        'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
+        'backgroundColorStyle': {'rgbColor': {'red': 1}}
+    }),
+    # Surrender = Black background, white bold text
+    ('Surrender', {
+        'backgroundColor': {},
+        'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
+        'backgroundColorStyle': {'rgbColor': {}}
+    }),
+]
+
+
+def grid_range(sheet_id, start_row_index, end_row_index, start_column_index, end_column_index):
+    """GridRange dict (0-based, end exclusive)"""
+    return {
+        'sheetId': sheet_id,
+        'startRowIndex': start_row_index,
+        'endRowIndex': end_row_index,
+        'startColumnIndex': start_column_index,
+        'endColumnIndex': end_column_index
+    }
+
+
+def layout_category(challenge_clusters, start_row):
+    """
+    Assign sheet rows to Clusters: a marker row per cluster, one row per
+    question and a blank row after each cluster.
+    Returns (marker_rows, question_rows, next_row) where marker_rows is a list
+    of (row, cluster) and question_rows a list of (row, question).
+    """
+    marker_rows = []
+    question_rows = []
+    current_row = start_row
+
+    for cluster in challenge_clusters:
+        marker_rows.append((current_row, cluster))
+        current_row += 1
+
+        for question in cluster.questions:
+            question_rows.append((current_row, question))
+            current_row += 1
+
+        # Blank row after each challenge
+        current_row += 1
+
+    return marker_rows, question_rows, current_row
+
+
+def iter_value_updates(marker_rows, question_rows):
+    """Yield cell value updates (worksheet.batch_update format) in sheet order"""
+    questions_by_row = dict(question_rows)
+    rows = sorted([row for row, _ in marker_rows] + list(questions_by_row))
+    markers_by_row = dict(marker_rows)
+
+    for row in rows:
+        if row in markers_by_row:
+            yield {
+                'range': f'A{row}',
+                'values': [[markers_by_row[row].name]]
+            }
+            continue
+
+        question = questions_by_row[row]
+        # Update columns A, D, and N
+        yield {
+            'range': f'A{row}',
+            'values': [[question.label]]
+        }
+        yield {
+            'range': f'D{row}',
+            'values': [['N/A']]  # Default Answer Status
+        }
+        yield {
+            'range': f'N{row}',
+            'values': [[question.points]]
+        }
+        # Set default values for team member columns (columns G-M)
+        yield {
+            'range': f'G{row}:M{row}',
+            'values': [['Nothing'] * 7]
+        }
+
+
+# GridRange of every template; filled in per rectangle by _stamp
+_RANGE = grid_range(slot('sheet_id'), slot('start_row'), slot('end_row'),
+                    slot('start_column'), slot('end_column'))
+
+
+def _conditional_rule(range_, value, format_):
+    return {
+        'addConditionalFormatRule': {
+            'rule': {
+                'ranges': [range_],
+                'booleanRule': {
+                    'condition': {
+                        'type': 'TEXT_EQ',
+                        'values': [{'userEnteredValue': value}]
+                    },
+                    'format': format_
+                }
+            },
+            'index': 0
+        }
+    }
+
+
+# Request shapes, compiled once; only sheetId and row/column bounds vary
+ANSWER_STATUS_VALIDATION_TEMPLATE = RequestTemplate({
+    'setDataValidation': {
+        'range': _RANGE,
+        'rule': ANSWER_STATUS_VALIDATION
+    }
+})
+
+TEAM_MEMBER_VALIDATION_TEMPLATE = RequestTemplate({
+    'setDataValidation': {
+        'range': _RANGE,
+        'rule': TEAM_MEMBER_VALIDATION
+    }
+})
+
+MARKER_ROW_TEMPLATE = RequestTemplate({
+    'repeatCell': {
+        'range': _RANGE,
+        'cell': {
+            'userEnteredFormat': {
+                'backgroundColor': {
+                    'red': 0.85,
+                    'green': 0.85,
+                    'blue': 0.85
+                }
+            }
+        },
+        'fields': 'userEnteredFormat.backgroundColor'
+    }
+})
+
+QUESTION_ROW_TEMPLATE = RequestTemplate({
+    'repeatCell': {
+        'range': _RANGE,
+        'cell': {
+            'userEnteredFormat': {
+                'backgroundColor': {'red': 1, 'green': 1, 'blue': 1},
+                'borders': {
+                    'top': {'style': 'SOLID', 'width': 1},
+                    'bottom': {'style': 'SOLID', 'width': 1},
+                    'left': {'style': 'SOLID', 'width': 1},
+                    'right': {'style': 'SOLID', 'width': 1}
+                }
+            }
+        },
+        'fields': 'userEnteredFormat.backgroundColor,userEnteredFormat.borders'
+    }
+})
+
+# White text for team member columns G-M (makes "Nothing" invisible)
+TEAM_MEMBER_TEXT_TEMPLATE = RequestTemplate({
+    'repeatCell': {
+        'range': _RANGE,
+        'cell': {
+            'userEnteredFormat': {
+                'textFormat': {
+                    'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}
+                }
+            }
+        },
+        'fields': 'userEnteredFormat.textFormat.foregroundColor'
+    }
+})
+
+ANSWER_STATUS_RULE_TEMPLATES = [
+    RequestTemplate(_conditional_rule(_RANGE, value, format_))
+    for value, format_ in ANSWER_STATUS_FORMATS
+]
+
+TEAM_MEMBER_RULE_TEMPLATES = [
+    RequestTemplate(_conditional_rule(_RANGE, value, format_))
+    for value, format_ in TEAM_MEMBER_FORMATS
+]
+
+
+def _row_segments(row_numbers, columns):
+    """Cell segments (row index, start column, end column) for 1-based row numbers"""
+    return [(row_num - 1, columns[0], columns[1]) for row_num in row_numbers]
+
+
+def _band(row_numbers, columns):
+    """Segments for every row from the first to the last of row_numbers"""
+    if not row_numbers:
+        return []
+    return _row_segments(range(min(row_numbers), max(row_numbers) + 1), columns)
+
+
+def _stamp(template, sheet_id, rectangles):
+    for start_row, end_row, start_column, end_column in rectangles:
+        yield template.stamp(sheet_id=sheet_id, start_row=start_row, end_row=end_row,
+                             start_column=start_column, end_column=end_column)
+
+
+def iter_validation_requests(sheet_id, question_row_numbers):
+    """Yield dropdowns for Answer Status (D) and team members (G-M) on every question row"""
+    answer_cells = _row_segments(question_row_numbers, (ANSWER_STATUS_COLUMN, ANSWER_STATUS_COLUMN + 1))
+    team_cells = _row_segments(question_row_numbers, TEAM_MEMBER_COLUMNS)
+
+    yield from _stamp(ANSWER_STATUS_VALIDATION_TEMPLATE, sheet_id, cover_rectangles(answer_cells))
+    yield from _stamp(TEAM_MEMBER_VALIDATION_TEMPLATE, sheet_id, cover_rectangles(team_cells))
+
+
+def iter_format_requests(sheet_id, marker_row_numbers, question_row_numbers):
+    """Yield formatting: grey marker rows, white bordered question rows, invisible 'Nothing' in G-M"""
+    # Grey background for marker rows
+    marker_cells = _row_segments(marker_row_numbers, ALL_COLUMNS)
+    yield from _stamp(MARKER_ROW_TEMPLATE, sheet_id, cover_rectangles(marker_cells))
+
+    # White background and borders for question rows
+    question_cells = _row_segments(question_row_numbers, ALL_COLUMNS)
+    yield from _stamp(QUESTION_ROW_TEMPLATE, sheet_id, cover_rectangles(question_cells))
+
+    # Text colour in G-M only shows on question rows, so marker and blank
+    # rows may be included and the whole band becomes one range
+    team_cells = _row_segments(question_row_numbers, TEAM_MEMBER_COLUMNS)
+    team_band = _band(question_row_numbers, TEAM_MEMBER_COLUMNS)
+    yield from _stamp(TEAM_MEMBER_TEXT_TEMPLATE, sheet_id, cover_rectangles(team_cells, team_band))
+
+
+def iter_conditional_format_requests(sheet_id, question_row_numbers):
+    """Yield dropdown colour rules for Answer Status (D) and team members (G-M)"""
+    # Rules only match dropdown values, which marker and blank rows never
+    # hold, so each rule covers the whole band of question rows
+    answer_columns = (ANSWER_STATUS_COLUMN, ANSWER_STATUS_COLUMN + 1)
+    answer_rectangles = cover_rectangles(_row_segments(question_row_numbers, answer_columns),
+                                         _band(question_row_numbers, answer_columns))
+    team_rectangles = cover_rectangles(_row_segments(question_row_numbers, TEAM_MEMBER_COLUMNS),
+                                       _band(question_row_numbers, TEAM_MEMBER_COLUMNS))
+
+    for template in ANSWER_STATUS_RULE_TEMPLATES:
+        yield from _stamp(template, sheet_id, answer_rectangles)
+    for template in TEAM_MEMBER_RULE_TEMPLATES:
+        yield from _stamp(template, sheet_id, team_rectangles)
+
+
+def plan_category_sheet(sheet_id, challenge_clusters, start_row):
+    """
+    Everything needed to write Clusters to a tab starting at start_row.
+    Returns a dict with the layout (marker_rows, question_rows, next_row) and
+    a generator of requests for each phase (updates, validation_requests,
+    format_requests, conditional_format_requests). The generators are lazy,
+    so requests are only built as they are sent; each can be consumed once.
+    Value updates are dicts; the other phases yield batchUpdate requests as
+    JSON fragments (see request_templates.py).
+    """
+    marker_rows, question_rows, next_row = layout_category(challenge_clusters, start_row)
+    marker_row_numbers = [row for row, _ in marker_rows]
+    question_row_numbers = [row for row, _ in question_rows]
+
+    return {
+        'marker_rows': marker_rows,
+        'question_rows': question_rows,
+        'next_row': next_row,
+        'updates': iter_value_updates(marker_rows, question_rows),
+        'validation_requests': iter_validation_requests(sheet_id, question_row_numbers),
+        'format_requests': iter_format_requests(sheet_id, marker_row_numbers, question_row_numbers),
+        'conditional_format_requests': iter_conditional_format_requests(sheet_id, question_row_numbers),
+    }
@@ -7,7 +7,10 @@ pkgs.mkShell {
       gspread
       google-auth-oauthlib
       requests
+      brotli  # Lets requests decode Content-Encoding: br
+      httpx  # asyncio engine (async_engine.py)
       websocket-client  # For WebSocket exploration
+      pytest  # tests/
     ]))
 
     # Utilities
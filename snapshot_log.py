@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Append-only, compressed log of raw world preloads for fast replay
+
+Each world gets two files:
+    <name>.log  frames of compressed preload JSON, appended in fetch order
+    <name>.idx  fixed-width records (timestamp, offset, length, codec, sha1),
+                memory-mapped for O(1) access to snapshot N and binary search
+                by time
+
+Reading snapshot N or a time window only decompresses the frames needed.
+`replay` runs each snapshot through parse_world and the sheet planner.
+Frames are zstd-compressed when the zstandard package is installed, zlib
+otherwise; the codec is recorded per frame so mixed logs stay readable.
+A log has a single writer (the process fetching that world).
+
+Usage:
+    python snapshot_log.py info LOG
+    python snapshot_log.py replay LOG [START_TIMESTAMP] [END_TIMESTAMP]
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+FRAME_MAGIC = b'NCLF'
+# magic, codec, payload length
+FRAME_HEADER = struct.Struct('<4sBI')
+# timestamp, frame offset, payload length, codec, (padding), sha1 of the raw JSON
+INDEX_RECORD = struct.Struct('<dQIB3x20s')
+
+
+def _compress(data):
+    if HAS_ZSTD:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=9).compress(data)
+    return CODEC_ZLIB, zlib.compress(data, 9)
+
+
+def _decompress(codec, payload):
+    if codec == CODEC_ZSTD:
+        if not HAS_ZSTD:
+            raise RuntimeError("Frame is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+    raise ValueError(f"Unknown frame codec {codec}")
+
+
+class SnapshotLog:
+    """
+    Append-only preload log. path is the log path without extension.
+    Supports len(), log[n], append() and window iteration; use as a
+    context manager or call close().
+    """
+
+    def __init__(self, path):
+        self.log_path = f"{path}.log"
+        self.index_path = f"{path}.idx"
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Make sure both files exist so readers can open them
+        for file_path in (self.log_path, self.index_path):
+            open(file_path, 'ab').close()
+
+        self._log = open(self.log_path, 'rb')
+        self._index_file = open(self.index_path, 'rb')
+        self._index = None
+        self._count = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-map the index to pick up frames appended since opening"""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+        size = os.fstat(self._index_file.fileno()).st_size
+        # Ignore a torn trailing record left by an interrupted append
+        self._count = size // INDEX_RECORD.size
+        if self._count:
+            self._index = mmap.mmap(self._index_file.fileno(), self._count * INDEX_RECORD.size,
+                                    access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        self._log.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def record(self, n):
+        """Index record n as (timestamp, offset, length, codec, sha1)"""
+        if n < 0:
+            n += self._count
+        if not 0 <= n < self._count:
+            raise IndexError(f"snapshot {n} out of range (log has {self._count})")
+        return INDEX_RECORD.unpack_from(self._index, n * INDEX_RECORD.size)
+
+    def timestamp(self, n):
+        return self.record(n)[0]
+
+    def read_raw(self, n):
+        """Decompressed JSON bytes of snapshot n"""
+        _, offset, length, codec, _ = self.record(n)
+        self._log.seek(offset + FRAME_HEADER.size)
+        return _decompress(codec, self._log.read(length))
+
+    def __getitem__(self, n):
+        """Preload data of snapshot n (negative indexes count from the end)"""
+        return json.loads(self.read_raw(n))
+
+    def append(self, preload_data, timestamp=None, skip_unchanged=True):
+        """
+        Append a preload as a new frame and return its index.
+        With skip_unchanged, a preload identical to the last frame is not
+        stored again and the last frame's index is returned.
+        """
+        raw = json.dumps(preload_data, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        digest = hashlib.sha1(raw).digest()
+        if skip_unchanged and self._count and self.record(-1)[4] == digest:
+            return self._count - 1
+
+        codec, payload = _compress(raw)
+        timestamp = timestamp if timestamp is not None else time.time()
+
+        with open(self.log_path, 'ab') as log:
+            offset = log.seek(0, os.SEEK_END)
+            log.write(FRAME_HEADER.pack(FRAME_MAGIC, codec, len(payload)) + payload)
+            log.flush()
+            os.fsync(log.fileno())
+
+        # The index is written after the frame, so it never points past the log.
+        # Writing right after the last whole record drops a torn tail left by an
+        # interrupted append, which would otherwise misalign every later record.
+        end = self._count * INDEX_RECORD.size
+        with open(self.index_path, 'r+b') as index:
+            index.truncate(end)
+            index.seek(end)
+            index.write(INDEX_RECORD.pack(timestamp, offset, len(payload), codec, digest))
+
+        self.refresh()
+        return self._count - 1
+
+    def bisect(self, timestamp):
+        """Index of the first snapshot taken at or after timestamp"""
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self.timestamp(mid) < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def iter_window(self, start=None, end=None):
+        """Yield (index, timestamp, preload) for snapshots with start <= timestamp < end"""
+        first = self.bisect(start) if start is not None else 0
+        last = self.bisect(end) if end is not None else self._count
+        for n in range(first, last):
+            yield n, self.timestamp(n), self[n]
+
+
+def replay(log, plan, start=None, end=None):
+    """
+    Feed every snapshot in a time window to plan(preload_data).
+    Returns (snapshot count, seconds spent).
+    """
+    started = time.perf_counter()
+    count = 0
+    for _, _, preload_data in log.iter_window(start, end):
+        plan(preload_data)
+        count += 1
+    return count, time.perf_counter() - started
+
+
+def _format_time(timestamp):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('info', 'replay'):
+        print(__doc__)
+        return 1
+
+    path = sys.argv[2]
+    if path.endswith('.log') or path.endswith('.idx'):
+        path = path[:-4]
+
+    with SnapshotLog(path) as log:
+        if sys.argv[1] == 'info':
+            size = os.path.getsize(log.log_path)
+            print(f"{len(log)} snapshots, {size / 1024:.1f} KiB compressed")
+            if len(log):
+                print(f"  First: {_format_time(log.timestamp(0))}")
+                print(f"  Last:  {_format_time(log.timestamp(-1))}")
+            return 0
+
+        from world_parser import parse_world
+        from sheet_plan import PHASES, plan_category_sheet
+
+        def plan(preload_data):
+            for category in parse_world(preload_data)['categories'].values():
+                category_plan = plan_category_sheet(0, category.clusters, 3)
+                # Requests are built lazily; drain them so the replay measures it
+                for phase in PHASES:
+                    for _ in category_plan[phase]:
+                        pass
+
+        start = float(sys.argv[3]) if len(sys.argv) > 3 else None
+        end = float(sys.argv[4]) if len(sys.argv) > 4 else None
+        count, elapsed = replay(log, plan, start, end)
+        print(f"Replayed {count} snapshots in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+SQLite store of every fetched world, normalized per snapshot
+
+Each fetch of a world is recorded as a snapshot with its categories,
+clusters and questions plus content hashes, so questions like "when did
+cluster X appear?" or "did points change?" are answered locally.
+Consecutive identical fetches share one snapshot (last_seen_at is bumped).
+
+Usage:
+    python snapshot_store.py latest [WORLD_URL]
+    python snapshot_store.py diff OLD_ID NEW_ID
+    python snapshot_store.py history CLUSTER_NAME [WORLD_URL]
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+from models import Category, Cluster, Question
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    world_url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_seen_at REAL NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_world ON snapshots (world_url, fetched_at);
+
+CREATE TABLE IF NOT EXISTS categories (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    name TEXT NOT NULL,
+    sheet_name TEXT,
+    position INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS clusters (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    category TEXT NOT NULL,
+    cluster_key TEXT NOT NULL,
+    cluster_id TEXT,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    question_count INTEGER NOT NULL,
+    total_points INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, category, cluster_key)
+);
+CREATE INDEX IF NOT EXISTS idx_clusters_key ON clusters (cluster_key, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_clusters_name ON clusters (name, snapshot_id);
+
+CREATE TABLE IF NOT EXISTS questions (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    category TEXT NOT NULL,
+    cluster_key TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    name TEXT,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, category, cluster_key, idx)
+);
+"""
+
+
+def world_hash(world):
+    """Content hash of a parsed world (see world_parser.parse_world)"""
+    payload = '\n'.join(f"{name}:{category.content_hash}"
+                        for name, category in world['categories'].items())
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def cluster_keys(clusters):
+    """
+    Stored key of each cluster: Cluster.key, with '#2', '#3', ... appended
+    to repeats, so clusters sharing a name (and no id) don't collide
+    """
+    seen = {}
+    keys = []
+    for cluster in clusters:
+        count = seen[cluster.key] = seen.get(cluster.key, 0) + 1
+        keys.append(cluster.key if count == 1 else f"{cluster.key}#{count}")
+    return keys
+
+
+class SnapshotStore:
+    """Snapshot history in one SQLite file; usable as a context manager"""
+
+    def __init__(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, world_url, world, fetched_at=None):
+        """
+        Record a parsed world as a snapshot and return its id.
+        If it matches the latest snapshot of the same world, that snapshot is
+        reused and only its last_seen_at is updated.
+        """
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        content_hash = world_hash(world)
+
+        with self.conn:
+            latest = self.latest_snapshot(world_url)
+            if latest and latest['content_hash'] == content_hash:
+                self.conn.execute("UPDATE snapshots SET last_seen_at = ? WHERE id = ?",
+                                  (fetched_at, latest['id']))
+                return latest['id']
+
+            snapshot_id = self.conn.execute(
+                "INSERT INTO snapshots (world_url, fetched_at, last_seen_at, content_hash) "
+                "VALUES (?, ?, ?, ?)",
+                (world_url, fetched_at, fetched_at, content_hash)
+            ).lastrowid
+
+            category_rows = []
+            cluster_rows = []
+            question_rows = []
+            for position, (name, category) in enumerate(world['categories'].items()):
+                category_rows.append((snapshot_id, name, category.sheet_name, position,
+                                      category.content_hash))
+                keys = cluster_keys(category.clusters)
+                for cluster_position, (key, cluster) in enumerate(zip(keys, category.clusters)):
+                    cluster_rows.append((snapshot_id, name, key, cluster.id, cluster.name,
+                                         cluster_position, cluster.question_count,
+                                         cluster.total_points, cluster.content_hash))
+                    question_rows.extend((snapshot_id, name, key, q.index, q.name, q.points)
+                                         for q in cluster.questions)
+
+            self.conn.executemany("INSERT INTO categories VALUES (?, ?, ?, ?, ?)", category_rows)
+            self.conn.executemany("INSERT INTO clusters VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", cluster_rows)
+            self.conn.executemany("INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?)", question_rows)
+
+        return snapshot_id
+
+    def latest_snapshot(self, world_url=None):
+        """Latest snapshot row (of one world, or of any), or None"""
+        if world_url is None:
+            row = self.conn.execute(
+                "SELECT * FROM snapshots ORDER BY fetched_at DESC, id DESC LIMIT 1").fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT * FROM snapshots WHERE world_url = ? "
+                "ORDER BY fetched_at DESC, id DESC LIMIT 1", (world_url,)).fetchone()
+        return dict(row) if row else None
+
+    def load_world(self, snapshot_id):
+        """Rebuild the parsed world model of a snapshot (for offline use)"""
+        questions = {}
+        for row in self.conn.execute(
+                "SELECT category, cluster_key, idx, name, points FROM questions "
+                "WHERE snapshot_id = ? ORDER BY category, cluster_key, idx", (snapshot_id,)):
+            questions.setdefault((row['category'], row['cluster_key']), []).append(
+                Question(row['idx'], row['points'], row['name']))
+
+        clusters = {}
+        for row in self.conn.execute(
+                "SELECT * FROM clusters WHERE snapshot_id = ? ORDER BY category, position",
+                (snapshot_id,)):
+            clusters.setdefault(row['category'], []).append(Cluster(
+                row['cluster_id'], row['name'],
+                tuple(questions.get((row['category'], row['cluster_key']), ())),
+                row['total_points']))
+
+        categories = {}
+        sheets = {}
+        for row in self.conn.execute(
+                "SELECT name, sheet_name FROM categories WHERE snapshot_id = ? ORDER BY position",
+                (snapshot_id,)):
+            categories[row['name']] = Category(row['name'], row['sheet_name'],
+                                               tuple(clusters.get(row['name'], ())))
+            if row['sheet_name']:
+                sheets[row['sheet_name']] = row['name']
+
+        return {'categories': categories, 'sheets': sheets}
+
+    def diff(self, old_id, new_id):
+        """
+        Clusters added, removed and changed between two snapshots.
+        Returns {'added': [...], 'removed': [...], 'changed': [...]} of row dicts;
+        changed rows carry both old_* and new_* counts and points.
+        """
+        added = self.conn.execute(
+            "SELECT n.* FROM clusters n LEFT JOIN clusters o "
+            "ON o.snapshot_id = ? AND o.category = n.category AND o.cluster_key = n.cluster_key "
+            "WHERE n.snapshot_id = ? AND o.cluster_key IS NULL "
+            "ORDER BY n.category, n.position", (old_id, new_id)).fetchall()
+        removed = self.conn.execute(
+            "SELECT o.* FROM clusters o LEFT JOIN clusters n "
+            "ON n.snapshot_id = ? AND n.category = o.category AND n.cluster_key = o.cluster_key "
+            "WHERE o.snapshot_id = ? AND n.cluster_key IS NULL "
+            "ORDER BY o.category, o.position", (new_id, old_id)).fetchall()
+        changed = self.conn.execute(
+            "SELECT n.category, n.cluster_key, n.name, "
+            "o.question_count AS old_question_count, n.question_count AS new_question_count, "
+            "o.total_points AS old_total_points, n.total_points AS new_total_points "
+            "FROM clusters n JOIN clusters o "
+            "ON o.snapshot_id = ? AND o.category = n.category AND o.cluster_key = n.cluster_key "
+            "WHERE n.snapshot_id = ? AND o.content_hash != n.content_hash "
+            "ORDER BY n.category, n.position", (old_id, new_id)).fetchall()
+
+        return {
+            'added': [dict(row) for row in added],
+            'removed': [dict(row) for row in removed],
+            'changed': [dict(row) for row in changed],
+        }
+
+    def cluster_history(self, cluster, world_url=None):
+        """
+        Every recorded version of a cluster (by cluster key or name), oldest first.
+        The first row answers "when did this cluster appear?".
+        """
+        query = (
+            "SELECT s.id AS snapshot_id, s.world_url, s.fetched_at, s.last_seen_at, "
+            "c.category, c.name, c.question_count, c.total_points, c.content_hash "
+            "FROM clusters c JOIN snapshots s ON s.id = c.snapshot_id "
+            "WHERE (c.cluster_key = ? OR c.name = ?)"
+        )
+        params = [cluster, cluster]
+        if world_url is not None:
+            query += " AND s.world_url = ?"
+            params.append(world_url)
+        query += " ORDER BY s.fetched_at, s.id"
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+
+def _format_time(timestamp):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+
+def main():
+    from update_sheet_template import SNAPSHOT_DB
+
+    if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help', 'help'] or not SNAPSHOT_DB:
+        print(__doc__)
+        return 1
+
+    command = sys.argv[1]
+    with SnapshotStore(SNAPSHOT_DB) as store:
+        if command == 'latest':
+            snapshot = store.latest_snapshot(sys.argv[2] if len(sys.argv) > 2 else None)
+            if not snapshot:
+                print("No snapshots recorded yet")
+                return 1
+            print(f"Snapshot {snapshot['id']} of {snapshot['world_url']}")
+            print(f"  First fetched: {_format_time(snapshot['fetched_at'])}")
+            print(f"  Last seen:     {_format_time(snapshot['last_seen_at'])}")
+            world = store.load_world(snapshot['id'])
+            for name, category in world['categories'].items():
+                print(f"  {name:35s} {len(category.clusters):3d} challenges "
+                      f"{category.question_count:4d} questions {category.total_points:5d} points")
+
+        elif command == 'diff' and len(sys.argv) >= 4:
+            changes = store.diff(int(sys.argv[2]), int(sys.argv[3]))
+            for row in changes['added']:
+                print(f"  + [{row['category']}] {row['name']} "
+                      f"({row['question_count']} questions, {row['total_points']} points)")
+            for row in changes['removed']:
+                print(f"  - [{row['category']}] {row['name']}")
+            for row in changes['changed']:
+                print(f"  ~ [{row['category']}] {row['name']}: "
+                      f"{row['old_question_count']} -> {row['new_question_count']} questions, "
+                      f"{row['old_total_points']} -> {row['new_total_points']} points")
+            if not any(changes.values()):
+                print("No changes")
+
+        elif command == 'history' and len(sys.argv) >= 3:
+            history = store.cluster_history(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+            if not history:
+                print(f"No cluster '{sys.argv[2]}' recorded")
+                return 1
+            for row in history:
+                print(f"  {_format_time(row['fetched_at'])} snapshot {row['snapshot_id']}: "
+                      f"{row['question_count']} questions, {row['total_points']} points")
+
+        else:
+            print(__doc__)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
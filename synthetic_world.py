@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic world generator for scale testing
+
+Emits preload-shaped data ({'report': {'modules': [...]}}) with a chosen
+number of categories, clusters and questions, so parse_world /
+parse_category_challenges and the sheet planner can be exercised at sizes
+no live world reaches (500 clusters, 5,000 questions, ...).
+The same arguments and seed always produce the same world.
+
+Usage:
+    python synthetic_world.py [--categories N] [--clusters N] [--questions N|MIN-MAX] [--seed N]
+
+Prints, per category, the rows the layout needs (flagging tabs that run past
+the row 100 safety-check range) and how many requests each phase sends.
+"""
+
+import json
+import random
+import sys
+
+# Default per-question point values to draw from
+DEFAULT_POINT_CHOICES = (10, 15, 20, 25, 30, 40, 50, 60, 75, 100)
+
+# Real NCL category names first, so small worlds map onto real sheet tabs
+NCL_CATEGORY_NAMES = (
+    "Open Source Intelligence",
+    "Cryptography",
+    "Password Cracking",
+    "Log Analysis",
+    "Network Traffic Analysis",
+    "Forensics",
+    "Scanning & Reconnaissance",
+    "Web Application Exploitation",
+    "Enumeration & Exploitation",
+)
+
+
+def _question_count(rng, questions_per_cluster):
+    if isinstance(questions_per_cluster, int):
+        return questions_per_cluster
+    low, high = questions_per_cluster
+    return rng.randint(low, high)
+
+
+def generate_world(categories=9, clusters_per_category=8, questions_per_cluster=(1, 8),
+                   point_choices=DEFAULT_POINT_CHOICES, seed=0):
+    """
+    Generate a world with per-question detail.
+    questions_per_cluster is a count or an inclusive (min, max) range and
+    point_choices the per-question point values to draw from.
+    Returns a list of modules: {'name', 'clusters': [{'_id', 'name', 'challenges',
+    'points', 'questions': [{'title', 'points'}]}]}.
+    """
+    rng = random.Random(seed)
+    modules = []
+
+    for category_index in range(categories):
+        if category_index < len(NCL_CATEGORY_NAMES):
+            category_name = NCL_CATEGORY_NAMES[category_index]
+        else:
+            category_name = f"Synthetic Category {category_index + 1}"
+
+        clusters = []
+        for cluster_index in range(clusters_per_category):
+            count = _question_count(rng, questions_per_cluster)
+            questions = [{
+                'title': f"Synthetic question {cluster_index + 1}.{i + 1}",
+                'points': rng.choice(point_choices)
+            } for i in range(count)]
+
+            clusters.append({
+                '_id': f"syn{category_index:03d}{cluster_index:04d}",
+                'name': f"{category_name} Challenge {cluster_index + 1}",
+                'challenges': count,
+                'points': sum(q['points'] for q in questions),
+                'questions': questions
+            })
+
+        modules.append({'name': category_name, 'clusters': clusters})
+
+    return modules
+
+
+def generate_preload(categories=9, clusters_per_category=8, questions_per_cluster=(1, 8),
+                     point_choices=DEFAULT_POINT_CHOICES, seed=0):
+    """World page preload, as fetch_cyberskyline_data would return it"""
+    modules = generate_world(categories, clusters_per_category, questions_per_cluster,
+                             point_choices, seed)
+    return {'report': {'modules': [{
+        'name': module['name'],
+        'clusters': [{key: value for key, value in cluster.items() if key != 'questions'}
+                     for cluster in module['clusters']]
+    } for module in modules]}}
+
+
+def generate_cluster_preloads(categories=9, clusters_per_category=8, questions_per_cluster=(1, 8),
+                              point_choices=DEFAULT_POINT_CHOICES, seed=0):
+    """Cluster page preloads keyed by cluster id (for exercising cluster_details)"""
+    modules = generate_world(categories, clusters_per_category, questions_per_cluster,
+                             point_choices, seed)
+    return {
+        cluster['_id']: {'challenge': {'name': cluster['name'], 'questions': cluster['questions']}}
+        for module in modules for cluster in module['clusters']
+    }
+
+
+def _flag_value(flag, default):
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+def main():
+    if any(arg in sys.argv for arg in ['-h', '--help', 'help']):
+        print(__doc__)
+        return 0
+
+    from world_parser import parse_world
+    from sheet_plan import PHASES, plan_category_sheet
+
+    questions = _flag_value('--questions', '1-8')
+    if '-' in questions:
+        low, high = questions.split('-', 1)
+        questions_per_cluster = (int(low), int(high))
+    else:
+        questions_per_cluster = int(questions)
+
+    preload_data = generate_preload(
+        categories=int(_flag_value('--categories', 9)),
+        clusters_per_category=int(_flag_value('--clusters', 8)),
+        questions_per_cluster=questions_per_cluster,
+        seed=int(_flag_value('--seed', 0))
+    )
+
+    world = parse_world(preload_data)
+    start_row, end_row = 3, 100
+
+    print(f"{'Category':35s} {'clusters':>8s} {'questions':>9s} {'rows':>9s} "
+          f"{'values':>7s} {'valid.':>7s} {'format':>7s} {'cond.':>7s} {'KiB':>7s}")
+
+    for name, category in world['categories'].items():
+        plan = plan_category_sheet(0, category.clusters, start_row)
+        last_row = plan['next_row'] - 1
+        # Count and size each phase as its generator is drained
+        counts = {}
+        size = 0
+        for phase in PHASES:
+            counts[phase] = 0
+            for request in plan[phase]:
+                counts[phase] += 1
+                size += len(request if isinstance(request, str) else json.dumps(request))
+        flag = " ⚠ past row 100" if last_row > end_row else ""
+        print(f"{name[:35]:35s} {len(category.clusters):8d} {category.question_count:9d} "
+              f"{f'{start_row}-{last_row}':>9s} {counts['updates']:7d} "
+              f"{counts['validation_requests']:7d} {counts['format_requests']:7d} "
+              f"{counts['conditional_format_requests']:7d} {size / 1024:7.0f}{flag}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('gspread')
+try:
+    import config  # noqa: F401
+except ImportError:
+    pytest.skip("needs config.py", allow_module_level=True)
+
+import game_start
+from synthetic_world import generate_preload
+from world_parser import REDACTED_NAME, is_redacted, parse_world
+
+URL = 'https://example.invalid/world'
+WORLDS = [{'name': 'default', 'url': URL}]
+
+
+def test_past_clock_time_means_tomorrow():
+    passed = datetime.now() - timedelta(minutes=5)
+    start = game_start.parse_start_time(f"{passed:%H:%M:%S}")
+    assert 0 < start - time.time() <= 24 * 3600
+    assert datetime.fromtimestamp(start).date() == (passed + timedelta(days=1)).date()
+
+
+def test_bad_start_time_names_the_flag():
+    with pytest.raises(ValueError, match='--at'):
+        game_start.parse_start_time('banana')
+
+
+def redacted_preload():
+    """A world as listed before the game goes live"""
+    preload_data = generate_preload(categories=2, clusters_per_category=3)
+    for module in preload_data['report']['modules']:
+        for cluster in module['clusters']:
+            cluster['name'] = REDACTED_NAME
+    return preload_data
+
+
+def test_redacted_clusters_are_not_live():
+    world = parse_world(redacted_preload())
+    clusters = [c for category in world['categories'].values() for c in category.clusters]
+    assert clusters and all(is_redacted(c) for c in clusters)
+    assert not game_start.has_challenges(redacted_preload(), WORLDS, ['osint', 'crypto'])
+    assert game_start.has_challenges(generate_preload(categories=2), WORLDS, ['osint', 'crypto'])
+
+
+def test_poll_keeps_going_while_redacted(monkeypatch):
+    fetched = [redacted_preload(), redacted_preload(), generate_preload(categories=2)]
+    monkeypatch.setattr(game_start, 'fetch_preload', lambda url: fetched.pop(0))
+    monkeypatch.setattr(game_start, 'store_preload', lambda url, preload_data: None)
+    monkeypatch.setattr(game_start.time, 'sleep', lambda seconds: None)
+
+    live = game_start.poll_until_live(WORLDS, ['osint'], timeout=60, interval=0)
+
+    assert not fetched
+    assert not any(is_redacted(c) for c in parse_world(live[URL])['categories']['Open Source Intelligence'].clusters)
+
+
+def test_poll_gives_up_on_a_world_that_stays_redacted(monkeypatch):
+    polls = []
+    monkeypatch.setattr(game_start, 'fetch_preload', lambda url: polls.append(url) or redacted_preload())
+    monkeypatch.setattr(game_start.time, 'sleep', lambda seconds: None)
+
+    assert game_start.poll_until_live(WORLDS, ['osint'], timeout=0.05, interval=0) == {}
+    assert len(polls) > 1
@@ -0,0 +1,46 @@
+import copy
+import pickle
+
+import pytest
+
+from models import Category, Cluster, Question
+from synthetic_world import generate_preload
+from world_parser import parse_world
+
+
+def sample_category():
+    world = parse_world(generate_preload(categories=1, clusters_per_category=3))
+    return next(iter(world['categories'].values()))
+
+
+@pytest.mark.parametrize('hashed', [False, True])
+@pytest.mark.parametrize('round_trip', [
+    lambda value: pickle.loads(pickle.dumps(value)),
+    copy.deepcopy,
+    copy.copy,
+], ids=['pickle', 'deepcopy', 'copy'])
+def test_round_trip(round_trip, hashed):
+    category = sample_category()
+    if hashed:
+        category.content_hash  # fills the lazy caches
+    copied = round_trip(category)
+
+    assert copied == category and hash(copied) == hash(category)
+    assert copied.content_hash == category.content_hash
+    assert copied.clusters[0].content_hash == category.clusters[0].content_hash
+    assert round_trip(category.clusters[0].questions[0]) == category.clusters[0].questions[0]
+
+
+def test_content_hash_is_not_part_of_equality():
+    cluster = Cluster('id1', 'Challenge', (Question(1, 10, None),), 10)
+    fresh = Cluster('id1', 'Challenge', (Question(1, 10, None),), 10)
+    cluster.content_hash
+    assert cluster == fresh and hash(cluster) == hash(fresh)
+    assert '_content_hash' not in repr(cluster)
+
+
+def test_with_questions_recomputes_the_hash():
+    cluster = Cluster('id1', 'Challenge', (Question(1, 10, None),), 10)
+    renamed = cluster.with_questions([Question(1, 10, "Real name")])
+    assert renamed.content_hash != cluster.content_hash
+    assert Category('Cat', None, (cluster,)).content_hash != Category('Cat', None, (renamed,)).content_hash
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from pipeline import stage
+
+
+def stage_threads():
+    """Stage worker threads still alive (after giving exiting ones a moment)"""
+    threads = [t for t in threading.enumerate() if t.name.startswith(('double-', 'identity-'))]
+    for thread in threads:
+        thread.join(timeout=1)
+    return [t for t in threads if t.is_alive()]
+
+
+def double(x):
+    return 2 * x
+
+
+def identity(x):
+    return x
+
+
+def test_every_item_once():
+    assert sorted(stage(double, range(100), workers=4)) == [2 * x for x in range(100)]
+    assert sorted(stage(double, stage(identity, range(50), workers=3), workers=2)) == \
+        [2 * x for x in range(50)]
+
+
+def test_fn_error_propagates():
+    def fail_on_seven(x):
+        if x == 7:
+            raise ValueError("seven")
+        return x
+
+    with pytest.raises(ValueError, match="seven"):
+        list(stage(fail_on_seven, range(20), workers=3))
+    assert not stage_threads()
+
+
+def test_upstream_error_propagates_through_stages():
+    def items():
+        yield from range(5)
+        raise RuntimeError("fetch failed")
+
+    with pytest.raises(RuntimeError, match="fetch failed"):
+        list(stage(double, stage(identity, items(), workers=2), workers=2))
+    assert not stage_threads()
+
+
+def test_early_stop_closes_the_source():
+    closed = threading.Event()
+
+    def items():
+        try:
+            yield from range(1000)
+        finally:
+            closed.set()
+
+    inner = stage(identity, items(), workers=2)
+    outer = stage(double, inner, workers=2)
+    assert next(outer) % 2 == 0
+    outer.close()
+
+    assert closed.is_set()
+    assert not stage_threads()
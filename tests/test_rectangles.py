@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from rectangles import cover_rectangles
+
+
+def cells(segments):
+    """Every (row, column) cell of (row, start_column, end_column) segments"""
+    return {(row, column) for row, start, end in segments for column in range(start, end)}
+
+
+def covered(rectangles):
+    return {(row, column)
+            for start_row, end_row, start_column, end_column in rectangles
+            for row in range(start_row, end_row) for column in range(start_column, end_column)}
+
+
+def test_question_rows_of_two_clusters():
+    # Rows 3-5 and 8-9 need D:E; the blank rows between them are not allowed
+    required = [(row, 3, 5) for row in (3, 4, 5, 8, 9)]
+    assert cover_rectangles(required) == [(3, 6, 3, 5), (8, 10, 3, 5)]
+
+
+def test_allowed_rows_join_rectangles():
+    required = [(row, 6, 13) for row in (3, 4, 5, 8, 9)]
+    allowed = [(row, 6, 13) for row in (6, 7)]
+    assert cover_rectangles(required, allowed) == [(3, 10, 6, 13)]
+
+
+def test_allowed_cells_alone_are_not_covered():
+    assert cover_rectangles([(5, 0, 2)], [(row, 0, 2) for row in range(10)]) == [(5, 6, 0, 2)]
+    assert cover_rectangles([], [(1, 0, 3)]) == []
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_cover_is_exact(seed):
+    rng = random.Random(seed)
+    required, allowed = [], []
+    for row in range(rng.randint(1, 40)):
+        for _ in range(rng.randint(0, 3)):
+            start = rng.randrange(0, 12)
+            segment = (row, start, start + rng.randint(1, 4))
+            (required if rng.random() < 0.6 else allowed).append(segment)
+
+    rectangles = cover_rectangles(required, allowed)
+
+    assert cells(required) <= covered(rectangles) <= cells(required) | cells(allowed)
+    assert all(start_row < end_row and start_column < end_column
+               for start_row, end_row, start_column, end_column in rectangles)
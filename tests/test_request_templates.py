@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from request_templates import RequestTemplate, batch_update_body, slot
+
+
+def range_request(**extra):
+    return {'repeatCell': {
+        'range': {'sheetId': slot('sheet_id'), 'startRowIndex': slot('start_row'),
+                  'endRowIndex': slot('end_row')},
+        'cell': {'userEnteredFormat': {'numberFormat': {'type': 'PERCENT', 'pattern': '0.0%'}}},
+        'fields': 'userEnteredFormat.numberFormat',
+        **extra,
+    }}
+
+
+def test_stamp_fills_every_slot():
+    template = RequestTemplate(range_request())
+    assert template.fields == ('sheet_id', 'start_row', 'end_row')
+
+    fragment = template.stamp(sheet_id=7, start_row=2, end_row=10)
+    assert json.loads(fragment)['repeatCell']['range'] == {
+        'sheetId': 7, 'startRowIndex': 2, 'endRowIndex': 10}
+
+
+def test_literal_percent_signs_survive():
+    template = RequestTemplate(range_request(note='100% done, 50%(d) left'))
+    request = json.loads(template.stamp(sheet_id=0, start_row=0, end_row=1))
+    assert request['repeatCell']['cell']['userEnteredFormat']['numberFormat']['pattern'] == '0.0%'
+    assert request['repeatCell']['note'] == '100% done, 50%(d) left'
+
+
+def test_stamp_matches_the_plain_request():
+    template = RequestTemplate(range_request())
+    expected = range_request()
+    expected['repeatCell']['range'] = {'sheetId': 3, 'startRowIndex': 4, 'endRowIndex': 5}
+    assert json.loads(template.stamp(sheet_id=3, start_row=4, end_row=5)) == expected
+
+
+def test_repeated_slot_is_one_field():
+    template = RequestTemplate({'a': slot('row'), 'b': [slot('row'), slot('column')]})
+    assert template.fields == ('row', 'column')
+    assert json.loads(template.stamp(row=1, column=2)) == {'a': 1, 'b': [1, 2]}
+
+
+def test_missing_value_raises():
+    with pytest.raises(KeyError):
+        RequestTemplate(range_request()).stamp(sheet_id=0, start_row=0)
+
+
+def test_slot_inside_a_string_is_rejected():
+    with pytest.raises(ValueError):
+        RequestTemplate({'formula': f"=A{slot('row')}"})
+
+
+def test_batch_update_body_is_json():
+    fragments = [RequestTemplate(range_request()).stamp(sheet_id=0, start_row=i, end_row=i + 1)
+                 for i in range(3)]
+    body = json.loads(batch_update_body(fragments).decode('utf-8'))
+    assert [r['repeatCell']['range']['startRowIndex'] for r in body['requests']] == [0, 1, 2]
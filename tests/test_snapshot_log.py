@@ -0,0 +1,46 @@
+from snapshot_log import INDEX_RECORD, SnapshotLog
+
+
+def test_append_and_read(tmp_path):
+    with SnapshotLog(str(tmp_path / 'w')) as log:
+        assert log.append({'n': 1}, timestamp=10.0) == 0
+        assert log.append({'n': 2}, timestamp=20.0) == 1
+        assert len(log) == 2
+        assert log[0] == {'n': 1}
+        assert log[-1] == {'n': 2}
+        assert log.timestamp(1) == 20.0
+
+
+def test_unchanged_preload_is_not_stored_again(tmp_path):
+    with SnapshotLog(str(tmp_path / 'w')) as log:
+        log.append({'n': 1}, timestamp=10.0)
+        assert log.append({'n': 1}, timestamp=20.0) == 0
+        assert len(log) == 1
+
+
+def test_window_and_bisect(tmp_path):
+    with SnapshotLog(str(tmp_path / 'w')) as log:
+        for n in range(5):
+            log.append({'n': n}, timestamp=float(n * 10))
+        assert log.bisect(15.0) == 2
+        assert [n for n, _, _ in log.iter_window(10.0, 30.0)] == [1, 2]
+
+
+def test_append_after_torn_index_tail(tmp_path):
+    path = str(tmp_path / 'w')
+    with SnapshotLog(path) as log:
+        log.append({'n': 1}, timestamp=10.0)
+    with open(f"{path}.idx", 'ab') as index:
+        index.write(b'\xff' * 10)  # an append interrupted mid-record
+
+    with SnapshotLog(path) as log:
+        assert len(log) == 1
+        assert log.append({'n': 2}, timestamp=20.0) == 1
+        assert log[1] == {'n': 2}
+        assert log.timestamp(1) == 20.0
+
+    with SnapshotLog(path) as log:
+        assert len(log) == 2
+        assert [log[n] for n in range(2)] == [{'n': 1}, {'n': 2}]
+    with open(f"{path}.idx", 'rb') as index:
+        assert len(index.read()) == 2 * INDEX_RECORD.size
@@ -0,0 +1,42 @@
+from models import Category, Cluster, Question
+from snapshot_store import SnapshotStore, cluster_keys
+from synthetic_world import generate_preload
+from world_parser import parse_world
+
+URL = 'https://example.invalid/world'
+
+
+def world_of(*clusters):
+    return {'categories': {'Cryptography': Category('Cryptography', 'Crypto', tuple(clusters))},
+            'sheets': {'Crypto': 'Cryptography'}}
+
+
+def unnamed(name, points):
+    return Cluster(None, name, (Question(1, points, None),), points)
+
+
+def test_record_and_load_round_trip(tmp_path):
+    world = parse_world(generate_preload(categories=3, clusters_per_category=4))
+    with SnapshotStore(str(tmp_path / 'snapshots.db')) as store:
+        snapshot_id = store.record(URL, world, fetched_at=1.0)
+        assert store.record(URL, world, fetched_at=2.0) == snapshot_id
+        assert store.load_world(snapshot_id) == world
+        assert store.latest_snapshot(URL)['last_seen_at'] == 2.0
+
+
+def test_clusters_with_the_same_name_and_no_id(tmp_path):
+    world = world_of(unnamed("Decode", 10), unnamed("Decode", 20), unnamed("Other", 5))
+    assert cluster_keys(world['categories']['Cryptography'].clusters) == [
+        'name:Decode', 'name:Decode#2', 'name:Other']
+
+    with SnapshotStore(str(tmp_path / 'snapshots.db')) as store:
+        old_id = store.record(URL, world, fetched_at=1.0)
+        assert store.load_world(old_id) == world
+
+        # The second 'Decode' changes; only it is reported
+        new_id = store.record(URL, world_of(unnamed("Decode", 10), unnamed("Decode", 30),
+                                            unnamed("Other", 5)), fetched_at=2.0)
+        changes = store.diff(old_id, new_id)
+        assert not changes['added'] and not changes['removed']
+        assert [(row['cluster_key'], row['old_total_points'], row['new_total_points'])
+                for row in changes['changed']] == [('name:Decode#2', 20, 30)]
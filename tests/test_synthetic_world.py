@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from sheet_plan import (
+    ANSWER_STATUS_COLUMN,
+    ANSWER_STATUS_FORMATS,
+    PHASES,
+    TEAM_MEMBER_FORMATS,
+    plan_category_sheet,
+)
+from synthetic_world import generate_preload
+from world_parser import parse_world
+
+SIZES = [
+    # clusters per category, questions per cluster
+    (1, 1),
+    (8, (1, 8)),
+    (50, 5),
+    (500, (1, 10)),
+]
+
+
+def drain(plan):
+    """Every request of a plan, per phase; request fragments are parsed from JSON"""
+    return {phase: [request if isinstance(request, dict) else json.loads(request)
+                    for request in plan[phase]]
+            for phase in PHASES}
+
+
+def test_same_seed_same_world():
+    assert generate_preload(seed=3) == generate_preload(seed=3)
+    assert generate_preload(seed=3) != generate_preload(seed=4)
+
+
+@pytest.mark.parametrize('clusters, questions', SIZES)
+def test_parse_world(clusters, questions):
+    preload_data = generate_preload(categories=3, clusters_per_category=clusters,
+                                    questions_per_cluster=questions)
+    world = parse_world(preload_data)
+
+    assert len(world['categories']) == 3
+    for module in preload_data['report']['modules']:
+        category = world['categories'][module['name']]
+        assert len(category.clusters) == clusters
+        assert category.question_count == sum(c['challenges'] for c in module['clusters'])
+        assert [c.total_points for c in category.clusters] == [c['points'] for c in module['clusters']]
+
+
+@pytest.mark.parametrize('clusters, questions', SIZES)
+@pytest.mark.parametrize('start_row', [3, 50])
+def test_plan_rows_and_request_counts(clusters, questions, start_row):
+    world = parse_world(generate_preload(categories=2, clusters_per_category=clusters,
+                                         questions_per_cluster=questions))
+    for category in world['categories'].values():
+        plan = plan_category_sheet(7, category.clusters, start_row)
+        requests = drain(plan)
+        question_count = category.question_count
+
+        # A marker and a blank row per cluster, one row per question
+        assert plan['next_row'] == start_row + 2 * clusters + question_count
+        rows = [row for row, _ in plan['marker_rows']] + [row for row, _ in plan['question_rows']]
+        assert len(set(rows)) == len(rows)
+        assert min(rows) == start_row and max(rows) < plan['next_row']
+
+        # Marker name per cluster; name, status, points and members per question
+        assert len(requests['updates']) == clusters + 4 * question_count
+        # One rectangle per cluster's question block for each dropdown column set
+        assert len(requests['validation_requests']) == 2 * clusters
+        assert len(requests['format_requests']) == 2 * clusters + 1
+        assert len(requests['conditional_format_requests']) == (
+            len(ANSWER_STATUS_FORMATS) + len(TEAM_MEMBER_FORMATS))
+
+
+@pytest.mark.parametrize('clusters, questions', SIZES)
+def test_requests_stay_inside_the_planned_rows(clusters, questions):
+    world = parse_world(generate_preload(categories=1, clusters_per_category=clusters,
+                                         questions_per_cluster=questions))
+    category = next(iter(world['categories'].values()))
+    plan = plan_category_sheet(7, category.clusters, 3)
+    requests = drain(plan)
+    question_rows = {row for row, _ in plan['question_rows']}
+
+    for update in requests['updates']:
+        row = int(''.join(ch for ch in update['range'].split(':')[0] if ch.isdigit()))
+        assert 3 <= row < plan['next_row']
+
+    # Answer Status dropdowns cover exactly the question rows (0-based, end exclusive)
+    covered = set()
+    for request in requests['validation_requests']:
+        grid = request['setDataValidation']['range']
+        assert grid['sheetId'] == 7
+        if grid['startColumnIndex'] == ANSWER_STATUS_COLUMN:
+            covered.update(range(grid['startRowIndex'] + 1, grid['endRowIndex'] + 1))
+    assert covered == question_rows
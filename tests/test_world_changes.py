@@ -0,0 +1,102 @@
+import copy
+
+from models import Category, Cluster, Question
+from synthetic_world import generate_preload
+from world_changes import (
+    ClusterAdded,
+    ClusterRemoved,
+    NamesChanged,
+    PointsChanged,
+    QuestionCountChanged,
+    changed_categories,
+    diff_worlds,
+)
+from world_parser import parse_world
+
+
+def cluster(cluster_id, name, points, question_names=None):
+    names = question_names or [None] * len(points)
+    return Cluster(cluster_id, name,
+                   tuple(Question(i + 1, p, n) for i, (p, n) in enumerate(zip(points, names))),
+                   sum(points))
+
+
+def world_of(**categories):
+    return {'categories': {name: Category(name, None, tuple(clusters))
+                           for name, clusters in categories.items()},
+            'sheets': {}}
+
+
+OLD = world_of(Crypto=[cluster('a', "Alpha", [10, 10]), cluster('b', "Beta", [20])],
+               Web=[cluster('w', "Web 1", [5])])
+
+
+def events_between(**changes):
+    new = world_of(**{**{name: list(c.clusters) for name, c in OLD['categories'].items()},
+                      **changes})
+    return list(diff_worlds(OLD, new))
+
+
+def test_unchanged_world_has_no_events():
+    assert list(diff_worlds(OLD, copy.deepcopy(OLD))) == []
+
+
+def test_cluster_added():
+    new_cluster = cluster('c', "Gamma", [15, 15])
+    events = events_between(Crypto=list(OLD['categories']['Crypto'].clusters) + [new_cluster])
+    assert events == [ClusterAdded('Crypto', new_cluster)]
+    assert "New challenge 'Gamma' (2 questions, 30 points)" in str(events[0])
+
+
+def test_cluster_removed():
+    beta = OLD['categories']['Crypto'].clusters[1]
+    events = events_between(Crypto=[OLD['categories']['Crypto'].clusters[0]])
+    assert events == [ClusterRemoved('Crypto', beta)]
+
+
+def test_question_count_changed():
+    alpha = OLD['categories']['Crypto'].clusters[0]
+    grown = cluster('a', "Alpha", [10, 10, 0])
+    events = events_between(Crypto=[grown, OLD['categories']['Crypto'].clusters[1]])
+    assert QuestionCountChanged('Crypto', alpha, grown) in events
+    assert "2 -> 3 questions" in str(events[0])
+
+
+def test_points_changed():
+    beta = OLD['categories']['Crypto'].clusters[1]
+    repriced = cluster('b', "Beta", [25])
+    events = events_between(Crypto=[OLD['categories']['Crypto'].clusters[0], repriced])
+    assert events == [PointsChanged('Crypto', beta, repriced)]
+    assert "20 -> 25 points" in str(events[0])
+
+
+def test_names_changed():
+    web = OLD['categories']['Web'].clusters[0]
+    renamed = cluster('w', "Web Intro", [5])
+    titled = cluster('w', "Web 1", [5], ["Find the flag"])
+    assert events_between(Web=[renamed]) == [NamesChanged('Web', web, renamed)]
+    assert "renamed to 'Web Intro'" in str(events_between(Web=[renamed])[0])
+    assert events_between(Web=[titled]) == [NamesChanged('Web', web, titled)]
+
+
+def test_changed_categories_in_order():
+    events = events_between(Web=[cluster('w', "Web 1", [6])],
+                            Crypto=[cluster('a', "Alpha", [10, 10])])
+    assert changed_categories(events) == ['Crypto', 'Web']
+
+
+def test_first_world_is_all_added():
+    world = parse_world(generate_preload(categories=2, clusters_per_category=3))
+    events = list(diff_worlds(None, world))
+    assert len(events) == 6 and all(isinstance(e, ClusterAdded) for e in events)
+
+
+def test_unlock_in_a_preload():
+    old_preload = generate_preload(categories=2, clusters_per_category=3)
+    new_preload = copy.deepcopy(old_preload)
+    unlocked = dict(new_preload['report']['modules'][1]['clusters'][0], _id='new', name="Unlocked")
+    new_preload['report']['modules'][1]['clusters'].append(unlocked)
+
+    events = list(diff_worlds(parse_world(old_preload), parse_world(new_preload)))
+    assert [type(e) for e in events] == [ClusterAdded]
+    assert events[0].category == "Cryptography" and events[0].cluster.name == "Unlocked"
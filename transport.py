@@ -0,0 +1,277 @@
+"""
+HTTP transport helpers shared by the cyberskyline and Google Sheets clients
+
+- Response compression: advertise gzip (and brotli when a decoder is
+  installed) and decode bodies incrementally while streaming
+- Request compression: optional gzip encoding of large outgoing Sheets
+  request bodies via a transport adapter mounted on gspread's session
+- Fetch policy: bounded retries with jittered exponential backoff, and a
+  circuit breaker that fails fast once a host keeps failing
+"""
+
+import codecs
+import gzip
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# urllib3 decodes 'br' only when one of these is importable; don't advertise
+# an encoding we can't decode
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+ACCEPT_ENCODING = 'gzip, br' if HAS_BROTLI else 'gzip'
+
+# Chunk size used when streaming response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Default threshold above which outgoing Sheets bodies are gzipped
+DEFAULT_GZIP_MIN_BYTES = 8 * 1024
+
+
+def iter_text(response, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield a streamed (stream=True) response body as text chunks.
+    Content-Encoding is decoded chunk by chunk as data arrives, so the
+    compressed and decompressed bodies are never both held in full.
+    """
+    # requests guesses ISO-8859-1 for text/* without a charset; pages here are UTF-8
+    declared = 'charset' in response.headers.get('Content-Type', '').lower()
+    encoding = response.encoding if declared and response.encoding else 'utf-8'
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def read_text(response, chunk_size=STREAM_CHUNK_SIZE):
+    """Read a streamed (stream=True) response body as text"""
+    return ''.join(iter_text(response, chunk_size))
+
+
+class SheetsAdapter(HTTPAdapter):
+    """
+    Transport adapter for sheets.googleapis.com.
+    When gzip_min_bytes is set, request bodies at least that large are sent
+    gzip-encoded (the Sheets API accepts Content-Encoding: gzip uploads).
+    When quota is set (a quota.SheetsQuota), every request waits for read or
+    write budget before it is sent.
+    When retry_policy is set (a RetryPolicy), responses with a status in
+    RETRY_STATUSES are retried with exponential backoff, honouring
+    Retry-After; a 429 also pauses the shared quota for that long. Its
+    timeout applies to requests sent without one (gspread sends none), so a
+    hung connection fails the call instead of blocking forever.
+    """
+
+    # Statuses Google asks clients to retry with exponential backoff
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, gzip_min_bytes=None, quota=None, retry_policy=None, **kwargs):
+        self.gzip_min_bytes = gzip_min_bytes
+        self.quota = quota
+        self.retry_policy = retry_policy
+        super().__init__(**kwargs)
+
+    def _compress_body(self, request):
+        body = request.body
+        if not body or self.gzip_min_bytes is None:
+            return
+        if 'Content-Encoding' in request.headers:
+            return
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if not isinstance(body, bytes) or len(body) < self.gzip_min_bytes:
+            return
+
+        request.body = gzip.compress(body, compresslevel=6)
+        request.headers['Content-Encoding'] = 'gzip'
+        request.headers['Content-Length'] = str(len(request.body))
+
+    def send(self, request, **kwargs):
+        self._compress_body(request)
+        if kwargs.get('timeout') is None and self.retry_policy is not None:
+            kwargs['timeout'] = self.retry_policy.timeout
+        attempt = 0
+        while True:
+            if self.quota is not None:
+                self.quota.acquire(request.method)
+            response = super().send(request, **kwargs)
+
+            policy = self.retry_policy
+            if (policy is None or attempt >= policy.retries
+                    or response.status_code not in self.RETRY_STATUSES):
+                return response
+
+            delay = policy.delay(attempt, retry_after_seconds(response))
+            print(f"  ⚠ Sheets API HTTP {response.status_code} - retrying in {delay:.1f}s "
+                  f"({attempt + 1}/{policy.retries})")
+            response.close()
+            if response.status_code == 429 and self.quota is not None:
+                # Every thread waits out the quota; acquire() above sleeps for it
+                self.quota.pause(request.method, delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+
+def gspread_session(gc):
+    """The requests session behind a gspread client (gspread 5 and 6)"""
+    http_client = getattr(gc, 'http_client', None)
+    if http_client is not None:
+        return http_client.session
+    return gc.session
+
+
+def install_sheets_adapter(gc, gzip_min_bytes=None, quota=None, retry_policy=None, pool_maxsize=10):
+    """Mount a SheetsAdapter on a gspread client's session and return it"""
+    session = gspread_session(gc)
+    adapter = SheetsAdapter(gzip_min_bytes=gzip_min_bytes, quota=quota,
+                            retry_policy=retry_policy, pool_maxsize=pool_maxsize)
+    session.mount('https://sheets.googleapis.com/', adapter)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    return adapter
+
+
+class TransientHTTPError(Exception):
+    """A response worth retrying (5xx or 429)"""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host that has been failing repeatedly"""
+
+
+# Failures that may succeed on a later attempt
+RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    TransientHTTPError,
+)
+
+
+def retry_after_seconds(response):
+    """The Retry-After header of a response in seconds, or None"""
+    retry_after = response.headers.get('Retry-After')
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except ValueError:
+        return None
+
+
+def raise_for_transient_status(response):
+    """Raise TransientHTTPError for 5xx and 429 responses"""
+    if response.status_code >= 500 or response.status_code == 429:
+        raise TransientHTTPError(response.status_code, retry_after_seconds(response))
+
+
+class RetryPolicy:
+    """
+    Bounded retries with exponential backoff and full jitter.
+    timeout is passed to requests as-is: (connect, read) seconds.
+    """
+
+    def __init__(self, retries=3, backoff_base=0.5, backoff_max=8.0, timeout=(5, 20)):
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt (0-based)"""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Stops calling a host after failure_threshold consecutive failures.
+    After reset_timeout seconds one trial call is let through (half-open);
+    its success closes the circuit, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError(
+                    f"circuit open after {self._failures} consecutive failures"
+                )
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def call_with_retries(fn, policy, breaker=None):
+    """
+    Call fn() under a retry policy and optional circuit breaker.
+    Only RETRYABLE_EXCEPTIONS are retried; anything else propagates at once.
+    """
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = fn()
+        except RETRYABLE_EXCEPTIONS as e:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt >= policy.retries:
+                raise
+            delay = policy.delay(attempt, getattr(e, 'retry_after', None))
+            print(f"  ⚠ {e} - retrying in {delay:.1f}s ({attempt + 1}/{policy.retries})")
+            time.sleep(delay)
+            attempt += 1
+            continue
+        except Exception:
+            # The host answered; the failure is ours (bad page, parse error)
+            if breaker is not None:
+                breaker.record_success()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
@@ -1,5 +1,5 @@
 #!/usr/bin/env nix-shell
-#!nix-shell -i python3 -p python312Packages.gspread python312Packages.google-auth-oauthlib python312Packages.requests
+#!nix-shell -i python3 -p python312Packages.gspread python312Packages.google-auth-oauthlib python312Packages.requests python312Packages.brotli python312Packages.httpx
 
 """
 Unified sheet updater - updates any category sheet or all sheets
@@ -8,19 +8,42 @@ Usage:
     ./update_sheet.py osint --yes        # Update OSINT sheet
     ./update_sheet.py osint --test --yes # Update OSINT sheet (rows 50+)
     ./update_sheet.py all --yes          # Update all sheets
+    ./update_sheet.py all --no-details   # Skip per-cluster detail fetch
+    ./update_sheet.py all --world gym    # Only the 'gym' world from config.WORLDS
+    ./update_sheet.py all --yes --jobs 1 # Update sheets one at a time
+    ./update_sheet.py watch --yes        # Sync new challenges as they unlock
+    ./update_sheet.py all --yes --at 13:00  # Pre-warm, then sync at game start
+    ./update_sheet.py serve --yes        # Warm server: POST /sync/osint with its X-Sync-Token
 """
 
 import sys
 import os
+import io
+import contextlib
+import contextvars
+import fnmatch
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 # Add current directory to path to import template
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from pipeline import stage
 from update_sheet_template import (
+    CATEGORY_WORKERS,
+    SERVE_PORT,
+    ConfigError,
     authenticate_gsheets,
+    load_worlds,
+    fetch_worlds,
     fetch_cyberskyline_data,
-    parse_category_challenges,
-    update_category_sheet
+    parse_world,
+    world_clusters,
+    enrich_challenge_clusters,
+    update_category_sheet,
+    prepare_category_sheet,
+    apply_category_sheet
 )
 
 # Category mappings
@@ -38,54 +61,262 @@ CATEGORIES = {
 
 def show_usage():
     """Show usage information"""
-    print("Usage: ./update_sheet.py <category> [--test] [--yes]")
+    print("Usage: ./update_sheet.py <category>... [--test] [--yes] [--world NAME]")
     print("\nAvailable categories:")
     for key, (sheet_name, category_name) in CATEGORIES.items():
         print(f"  {key:12s} - {category_name}")
     print(f"  {'all':12s} - Update all category sheets")
+    print(f"  {'watch':12s} - Keep polling and sync categories whose challenges change")
+    print(f"  {'serve':12s} - Run a local HTTP server that syncs on request (serve.py)")
     print("\nFlags:")
     print("  --test    Write to rows 50+ instead of rows 3+ (for testing)")
     print("  --yes     Actually update the sheet (without this, just preview)")
+    print("  --no-details  Skip fetching real question names/points per cluster")
+    print("  --world NAME  Only sync the named world(s) from config.WORLDS (repeatable)")
+    print(f"  --jobs N      Update up to N sheets in parallel with 'all' (default {CATEGORY_WORKERS})")
+    print("  --async       Run on the asyncio engine (async_engine.py, needs httpx; one-off syncs only)")
+    print("  --interval MIN,MAX  Poll interval bounds in seconds for watch")
+    print("  --at TIME     Pre-warm before TIME (ISO date/time or HH:MM), sync once the game goes live")
+    print("  --port N      Port for serve (default from config.SERVE_PORT)")
+    print("  --include PATTERN  Only sync categories matching a glob (key, tab or category name)")
+    print("  --exclude PATTERN  Skip categories matching a glob (repeatable, also for watch)")
     print("\nExamples:")
     print("  ./update_sheet.py osint              # Preview OSINT")
     print("  ./update_sheet.py osint --yes        # Update OSINT")
     print("  ./update_sheet.py all --yes          # Update all sheets")
-
-def update_single_category(category_key, test_mode=False, dry_run=True):
-    """Update a single category sheet"""
+    print("  ./update_sheet.py osint crypto web --yes   # Several sheets, one fetch and auth")
+    print("  ./update_sheet.py all --exclude 'scan*'    # Everything but Scanning")
+    print("  ./update_sheet.py watch --yes        # Sync new challenges as they unlock")
+
+class ThreadOutput:
+    """
+    sys.stdout stand-in that buffers what each capturing thread prints, so
+    tabs updated in parallel can be reported one after another. The buffer
+    lives in a context variable, so helper threads started in the capturing
+    thread's context (see batching.send_in_chunks) print into it too.
+    Threads that aren't capturing print straight through.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = contextvars.ContextVar('thread_output', default=None)
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        return (self._buffer.get() or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def capture(self, fn, *args):
+        """Call fn(*args) with this thread's output buffered; returns (result, output)"""
+        buffer = io.StringIO()
+        token = self._buffer.set(buffer)
+        try:
+            return fn(*args), buffer.getvalue()
+        finally:
+            self._buffer.reset(token)
+
+    def emit(self, text):
+        """Print captured output in one piece, straight to the real stream"""
+        with self._lock:
+            self._stream.write(text)
+            self._stream.flush()
+
+_thread_output_lock = threading.Lock()
+_thread_output_users = 0
+
+@contextlib.contextmanager
+def thread_output():
+    """
+    Route sys.stdout through one shared ThreadOutput while in use. Concurrent
+    syncs (serve, watch) share it; the real stream is restored after the last.
+    """
+    global _thread_output_users
+    with _thread_output_lock:
+        if _thread_output_users == 0:
+            sys.stdout = ThreadOutput(sys.stdout)
+        _thread_output_users += 1
+        output = sys.stdout
+    try:
+        yield output
+    finally:
+        with _thread_output_lock:
+            _thread_output_users -= 1
+            if _thread_output_users == 0:
+                sys.stdout = output._stream
+
+def world_sheet_name(world, category_key):
+    """Tab name for a category in a world's spreadsheet"""
+    return world.get('tabs', {}).get(category_key, CATEGORIES[category_key][0])
+
+def world_category_keys(world, category_keys):
+    """Category keys to sync for a world (honours the world's 'categories' subset)"""
+    if world.get('categories'):
+        return [key for key in category_keys if key in world['categories']]
+    return list(category_keys)
+
+def select_worlds(world_names=None):
+    """Configured worlds, optionally narrowed to the --world names given"""
+    try:
+        worlds = load_worlds()
+    except ConfigError as e:
+        print(f"ERROR: {e}")
+        return []
+    if not world_names:
+        return worlds
+
+    selected = [world for world in worlds if world['name'] in world_names]
+    unknown = set(world_names) - {world['name'] for world in selected}
+    if unknown:
+        print(f"ERROR: Unknown world(s): {', '.join(sorted(unknown))}")
+        print(f"Available: {', '.join(world['name'] for world in worlds)}")
+        return []
+    return selected
+
+def world_urls(worlds):
+    """Distinct cyberskyline urls of worlds (fleet sheets share one)"""
+    return list(dict.fromkeys(world['url'] for world in worlds))
+
+def world_credentials(worlds):
+    """Distinct Google token files used by worlds"""
+    return list(dict.fromkeys(world['token_path'] for world in worlds))
+
+def print_fetching(worlds):
+    urls = world_urls(worlds)
+    if len(urls) == 1:
+        print("Fetching data from cyberskyline...")
+    else:
+        print(f"Fetching data from cyberskyline ({len(urls)} worlds concurrently)...")
+
+def fetch_all_worlds(worlds):
+    """Fetch every world concurrently, reporting the ones that failed"""
+    print_fetching(worlds)
+    fetched = fetch_worlds(worlds)
+    for name, result in fetched.items():
+        if isinstance(result, Exception):
+            print(f"ERROR: Could not fetch world '{name}': {result}")
+    return fetched
+
+def update_single_category(category_key, test_mode=False, dry_run=True, fetch_details=True, world_names=None):
+    """Update a single category sheet (in every selected world)"""
     if category_key not in CATEGORIES:
         print(f"ERROR: Unknown category '{category_key}'")
         print(f"Available: {', '.join(CATEGORIES.keys())}")
         return False
 
-    sheet_name, category_name = CATEGORIES[category_key]
+    _, category_name = CATEGORIES[category_key]
 
-    print(f"Fetching data from cyberskyline...")
-    preload_data = fetch_cyberskyline_data()
+    worlds = [world for world in select_worlds(world_names)
+              if world_category_keys(world, [category_key])]
+    if not worlds:
+        return False
 
-    print(f"Parsing {category_name} challenges...")
-    challenges = parse_category_challenges(preload_data, category_name)
+    auth_pool = ThreadPoolExecutor(max_workers=4)
+    auths = {}
+    if not dry_run:
+        # Authenticate (once per credential) while cyberskyline is being fetched
+        print("Authenticating with Google Sheets...")
+        auths = {path: auth_pool.submit(authenticate_gsheets, path) for path in world_credentials(worlds)}
+    auth_pool.shutdown(wait=False)
 
-    if not challenges:
-        print(f"No challenges found for {category_name}")
-        return False
+    fetched = fetch_all_worlds(worlds)
+    success = True
 
-    print(f"Found {len(challenges)} challenges with {sum(len(c['questions']) for c in challenges)} total questions\n")
+    for world in worlds:
+        preload_data = fetched[world['name']]
+        if isinstance(preload_data, Exception):
+            success = False
+            continue
 
-    if dry_run:
-        print("\n*** DRY RUN MODE ***")
-        print("Use --yes flag to actually update the sheet\n")
-        print("Preview only - no changes made.")
-        return True
+        if len(worlds) > 1:
+            print(f"\n# World: {world['name']}")
 
-    print("Authenticating with Google Sheets...")
-    gc = authenticate_gsheets()
+        sheet_name = world_sheet_name(world, category_key)
+
+        print(f"Parsing {category_name} challenges...")
+        challenges = world_clusters(parse_world(preload_data), category_name)
+
+        if not challenges:
+            print(f"No challenges found for {category_name}")
+            success = False
+            continue
+
+        if fetch_details:
+            print("Fetching question details per challenge...")
+            challenges = enrich_challenge_clusters(challenges, world['url'])
+
+        print(f"Found {len(challenges)} challenges with {sum(c.question_count for c in challenges)} total questions\n")
+
+        if dry_run:
+            print("\n*** DRY RUN MODE ***")
+            print("Use --yes flag to actually update the sheet\n")
+            print("Preview only - no changes made.")
+            continue
+
+        gc = auths[world['token_path']].result()
+        if not update_category_sheet(gc, sheet_name, challenges, test_mode, world['sheet_id']):
+            success = False
 
-    success = update_category_sheet(gc, sheet_name, challenges, test_mode)
     return success
 
-def update_all_categories(test_mode=False, dry_run=True):
-    """Update all category sheets"""
+def sheet_key(world):
+    """Identifies a world's spreadsheet as opened with its credential (see open_world_sheets)"""
+    return (world['token_path'], world['sheet_id'])
+
+def open_world_sheets(worlds, max_workers=8):
+    """
+    Authenticate once per credential and load every world's spreadsheet
+    with its tabs by title, several spreadsheets at a time.
+    Returns {sheet_key(world): (spreadsheet, {title: worksheet})}, with the
+    exception in place of any spreadsheet that couldn't be opened.
+    """
+    def authenticate(token_path):
+        try:
+            return authenticate_gsheets(token_path)
+        except Exception as e:
+            return e
+
+    def open_sheet(key):
+        token_path, sheet_id = key
+        gc = clients[token_path]
+        if isinstance(gc, Exception):
+            return gc
+        try:
+            spreadsheet = gc.open_by_key(sheet_id)
+            return spreadsheet, {ws.title: ws for ws in spreadsheet.worksheets()}
+        except Exception as e:
+            return e
+
+    keys = list(dict.fromkeys(sheet_key(world) for world in worlds))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys)))) as pool:
+        credentials = world_credentials(worlds)
+        clients = dict(zip(credentials, pool.map(authenticate, credentials)))
+        return dict(zip(keys, pool.map(open_sheet, keys)))
+
+def guarded(label, fn):
+    """fn() for one tab, turning an exception into a failed (label, success, message) result"""
+    try:
+        return fn()
+    except Exception as e:
+        print(f"ERROR updating {label}: {e}")
+        return (label, False, str(e))
+
+def completed(value):
+    """A Future already resolved to value"""
+    future = Future()
+    future.set_result(value)
+    return future
+
+def update_all_categories(test_mode=False, dry_run=True, fetch_details=True, world_names=None,
+                          workers=CATEGORY_WORKERS, category_keys=None, preloads=None, sheets=None):
+    """
+    Update all category sheets (in every selected world); see sync_tabs.
+    category_keys limits the tabs synced (default: every category).
+    """
     if dry_run:
         print("\n*** DRY RUN MODE ***")
         print("Use --yes flag to actually update the sheets\n")
@@ -93,46 +324,198 @@ def update_all_categories(test_mode=False, dry_run=True):
     if test_mode:
         print("*** TEST MODE: Writing to rows 50+ ***\n")
 
+    category_keys = list(category_keys or CATEGORIES)
     print("="*70)
-    print("NCL Sheet Updater - All Categories")
+    if len(category_keys) == len(CATEGORIES):
+        print("NCL Sheet Updater - All Categories")
+    else:
+        print(f"NCL Sheet Updater - {', '.join(CATEGORIES[key][1] for key in category_keys)}")
     print("="*70)
 
-    print("\nFetching data from cyberskyline...")
-    preload_data = fetch_cyberskyline_data()
+    worlds = [world for world in select_worlds(world_names)
+              if world_category_keys(world, category_keys)]
+    if not worlds:
+        return False
 
-    if not dry_run:
+    print()
+    results = sync_tabs(worlds, category_keys, test_mode, dry_run, fetch_details, workers,
+                        preloads, sheets)
+    return print_results(results, dry_run, test_mode)
+
+def sync_tabs(worlds, category_keys, test_mode=False, dry_run=True, fetch_details=True,
+              workers=CATEGORY_WORKERS, preloads=None, sheets=None):
+    """
+    Sync the category_keys tabs of worlds; returns a (label, success,
+    message) result per tab, in tab order.
+    Runs as a pipeline: Sheets authentication and spreadsheet metadata load
+    while cyberskyline downloads, each world is parsed as soon as it arrives,
+    and tabs are safety-checked and written by one shared pool of `workers`
+    threads per Google credential in the run, so the first tab is written
+    while later ones are still being planned. The pool is shared, not
+    partitioned: tabs of a slow or throttled credential can occupy all of
+    it. Every tab written with one credential shares that credential's
+    Sheets quota, so more workers never means more requests per minute.
+    Fleet spreadsheets sharing a world cost one fetch and parse.
+    preloads ({url: preload data}) stands in for the fetch and sheets (from
+    open_world_sheets) for authentication, so long-running modes (watch,
+    serve) can reuse them.
+    """
+    if preloads is None:
+        print_fetching(worlds)
+    if not dry_run and sheets is None:
         print("Authenticating with Google Sheets...")
-        gc = authenticate_gsheets()
-
-    results = []
-
-    for category_key, (sheet_name, category_name) in CATEGORIES.items():
-        print(f"\n{'#'*70}")
-        print(f"# Processing: {sheet_name}")
-        print(f"{'#'*70}")
-
-        print(f"Parsing {category_name} challenges...")
-        challenges = parse_category_challenges(preload_data, category_name)
 
-        if not challenges:
-            print(f"WARNING: No challenges found for {category_name}")
-            results.append((sheet_name, False, "No challenges found"))
-            continue
-
-        print(f"Found {len(challenges)} challenges with {sum(len(c['questions']) for c in challenges)} total questions")
-
-        if not dry_run:
+    def label_prefix(world):
+        return f"{world['name']}/" if len(worlds) > 1 else ""
+
+    def plan_world(fetch):
+        """
+        Parse one fetched world into a job per category tab of every
+        spreadsheet synced from it (fleet sheets share one parse).
+        """
+        url, future = fetch
+        sharing = [(index, world) for index, world in enumerate(worlds) if world['url'] == url]
+
+        def failed(action, e):
+            """A failed result per world synced from this url, in place of its tabs"""
+            jobs = []
+            for index, world in sharing:
+                print(f"ERROR: Could not {action} world '{world['name']}': {e}")
+                jobs.append({'order': (index, -1), 'output': '',
+                             'result': (f"{label_prefix(world)}*", False,
+                                        f"{action.capitalize()} failed: {e}")})
+            return jobs
+
+        def plan():
+            try:
+                preload_data = future.result()
+            except Exception as e:
+                return failed("fetch", e)
             try:
-                success = update_category_sheet(gc, sheet_name, challenges, test_mode)
-                results.append((sheet_name, success, "Success" if success else "Failed"))
+                return plan_jobs(preload_data)
             except Exception as e:
-                print(f"ERROR updating {sheet_name}: {e}")
-                results.append((sheet_name, False, str(e)))
+                return failed("plan", e)
+
+        def plan_jobs(preload_data):
+            world_model = parse_world(preload_data)
+            keys = [key for key in category_keys
+                    if any(key in world_category_keys(world, category_keys) for _, world in sharing)]
+            parsed = {key: world_clusters(world_model, CATEGORIES[key][1]) for key in keys}
+
+            if fetch_details:
+                names = ', '.join(world['name'] for _, world in sharing)
+                print(f"Fetching question details per challenge{f' ({names})' if len(worlds) > 1 else ''}...")
+                # One worker pool across every category of the world
+                enriched = iter(enrich_challenge_clusters(
+                    [c for challenges in parsed.values() for c in challenges], url
+                ))
+                for key, challenges in parsed.items():
+                    parsed[key] = [next(enriched) for _ in challenges]
+
+            jobs = []
+            for index, world in sharing:
+                for position, category_key in enumerate(world_category_keys(world, category_keys)):
+                    sheet_name = world_sheet_name(world, category_key)
+                    jobs.append({'order': (index, position), 'label': f"{label_prefix(world)}{sheet_name}",
+                                 'world': world, 'category_key': category_key, 'sheet_name': sheet_name,
+                                 'challenges': parsed[category_key], 'output': '', 'result': None})
+            return jobs
+
+        jobs, text = output.capture(plan)
+        output.emit(text)
+        return jobs
+
+    def check(job):
+        """Plan a tab and run its safety check"""
+        if job['result'] is not None:
+            return job
+        label = job['label']
+        challenges = job['challenges']
+
+        def prepare():
+            print(f"\n{'#'*70}")
+            print(f"# Processing: {label}")
+            print(f"{'#'*70}")
+
+            if not challenges:
+                print(f"WARNING: No challenges found for {CATEGORIES[job['category_key']][1]}")
+                return (label, False, "No challenges found")
+
+            print(f"Found {len(challenges)} challenges with {sum(c.question_count for c in challenges)} total questions")
+
+            if dry_run:
+                print(f"[DRY RUN] Would update {label} with {len(challenges)} challenges")
+                return (label, True, "Dry run")
+
+            opened = opened_sheets.result()[sheet_key(job['world'])]
+            if isinstance(opened, Exception):
+                raise opened
+            spreadsheet, tabs = opened
+            if job['sheet_name'] not in tabs:
+                print(f"ERROR: Sheet '{job['sheet_name']}' not found")
+                return (label, False, "Failed")
+
+            job['prepared'] = prepare_category_sheet(spreadsheet, tabs[job['sheet_name']],
+                                                     challenges, test_mode)
+            return None if job['prepared'] else (label, False, "Failed")
+
+        job['result'], text = output.capture(guarded, label, prepare)
+        job['output'] += text
+        return job
+
+    def write(job):
+        """Clear and write a checked tab"""
+        if job['result'] is not None:
+            return job
+
+        def apply():
+            success = apply_category_sheet(job.pop('prepared'))
+            return (job['label'], success, "Success" if success else "Failed")
+
+        job['result'], text = output.capture(guarded, job['label'], apply)
+        job['output'] += text
+        return job
+
+    # One at a time for a dry run, so the preview reads in tab order. Each
+    # credential has its own Sheets quota, so the shared pool grows by `workers`
+    # per credential (any credential's tabs may use any of its threads).
+    tab_workers = 1 if dry_run else max(1, workers) * len(world_credentials(worlds))
+    if not dry_run:
+        print(f"\nWriting up to {tab_workers} sheets at a time as they are planned...")
+
+    finished = []
+    with thread_output() as output, ThreadPoolExecutor(max_workers=len(world_urls(worlds)) + 1) as pool:
+        if dry_run:
+            opened_sheets = None
+        elif sheets is not None:
+            opened_sheets = completed(sheets)
         else:
-            print(f"[DRY RUN] Would update {sheet_name} with {len(challenges)} challenges")
-            results.append((sheet_name, True, "Dry run"))
+            opened_sheets = pool.submit(open_world_sheets, worlds)
 
-    # Print summary
+        # One fetch per distinct url, however many spreadsheets are synced from it
+        if preloads is not None:
+            fetches = {completed(preloads[url]): url for url in world_urls(worlds)}
+        else:
+            fetches = {pool.submit(fetch_cyberskyline_data, url): url for url in world_urls(worlds)}
+        fetched = ((fetches[future], future) for future in as_completed(fetches))
+
+        planned = stage(plan_world, fetched, workers=len(fetches))
+        written = stage(write, stage(check, itertools.chain.from_iterable(planned), tab_workers),
+                        tab_workers)
+        try:
+            for job in written:
+                output.emit(job['output'])
+                finished.append(job)
+        finally:
+            # Stops every stage's workers if the loop ends early
+            written.close()
+            planned.close()
+
+    finished.sort(key=lambda job: job['order'])
+    return [job['result'] for job in finished]
+
+def print_results(results, dry_run, test_mode):
+    """Print the per-sheet summary; returns True if every sheet succeeded"""
     print(f"\n{'='*70}")
     print("Summary")
     print(f"{'='*70}\n")
@@ -155,21 +538,150 @@ def update_all_categories(test_mode=False, dry_run=True):
 
     return successful == total
 
+def flag_values(flag):
+    """All values given for a repeatable flag, e.g. --world gym --world team"""
+    values = []
+    for i, arg in enumerate(sys.argv):
+        if arg == flag and i + 1 < len(sys.argv):
+            values.extend(v for v in sys.argv[i + 1].split(',') if v)
+    return values
+
+def positive_number(flag, text, convert=int):
+    """A flag value as a positive number; raises ValueError naming the flag otherwise"""
+    try:
+        value = convert(text)
+    except ValueError:
+        value = 0
+    if not value > 0:
+        raise ValueError(f"{flag} needs a positive number, not '{text}'")
+    return value
+
+def number_flag(flag, default, convert=int):
+    """
+    Last value given for a numeric flag, or default if it isn't given.
+    Raises ValueError naming the flag if the value isn't a positive number.
+    """
+    values = flag_values(flag)
+    return positive_number(flag, values[-1], convert) if values else default
+
+# Flags followed by a value, which is therefore not a category
+VALUE_FLAGS = ('--world', '--jobs', '--interval', '--at', '--port', '--include', '--exclude')
+
+def positional_args():
+    """Command-line arguments that are neither flags nor flag values"""
+    args = []
+    for i, arg in enumerate(sys.argv[1:], start=1):
+        if not arg.startswith('--') and sys.argv[i - 1] not in VALUE_FLAGS:
+            args.append(arg.lower())
+    return args
+
+def category_matches(key, pattern):
+    """True if a category's key, tab name or category name matches a glob pattern (any case)"""
+    sheet_name, category_name = CATEGORIES[key]
+    return any(fnmatch.fnmatchcase(text.lower(), pattern.lower())
+               for text in (key, sheet_name, category_name))
+
+def select_categories(names, include=(), exclude=()):
+    """
+    Category keys, in CATEGORIES order, for names ('all', category keys or
+    glob patterns such as 'c*'), narrowed to those matching an include
+    pattern (if any) and without those matching an exclude pattern.
+    No names means 'all' only when include patterns are given.
+    Prints an error and returns None if a name or pattern matches nothing.
+    """
+    if not names and not include:
+        print("ERROR: No category given (name one, a pattern, 'all' or use --include)")
+        print(f"Available: {', '.join(CATEGORIES.keys())}")
+        return None
+    selected = set()
+    for name in names or ['all']:
+        found = list(CATEGORIES) if name == 'all' else [
+            key for key in CATEGORIES if category_matches(key, name)]
+        if not found:
+            print(f"ERROR: Unknown category '{name}'")
+            print(f"Available: {', '.join(CATEGORIES.keys())}")
+            return None
+        selected.update(found)
+
+    category_keys = [key for key in CATEGORIES if key in selected
+                     and (not include or any(category_matches(key, p) for p in include))
+                     and not any(category_matches(key, p) for p in exclude)]
+    if not category_keys:
+        print("ERROR: No categories left after --include/--exclude")
+        return None
+    return category_keys
+
 def main():
     # Check for help flags
     if len(sys.argv) < 2 or sys.argv[1] in ['-h', '--help', 'help']:
         show_usage()
         return 0 if len(sys.argv) > 1 else 1
 
-    category = sys.argv[1].lower()
+    if '--async' in sys.argv:
+        from async_engine import main as async_main
+        return async_main()
+
+    names = positional_args()
+    command = names[0] if names else sys.argv[1].lower()
+    if command in ("watch", "serve"):
+        names = names[1:] or ['all']
+    include, exclude = flag_values('--include'), flag_values('--exclude')
+    category_keys = select_categories(names, include, exclude)
+    if category_keys is None:
+        return 1
     test_mode = '--test' in sys.argv
     dry_run = '--yes' not in sys.argv
-
-    if category == "all":
-        success = update_all_categories(test_mode, dry_run)
+    fetch_details = '--no-details' not in sys.argv
+    world_names = flag_values('--world')
+    if command == "serve" and flag_values('--at'):
+        print("ERROR: --at can't be combined with serve (POST /sync/all at game start instead)\n")
+        show_usage()
+        return 1
+    try:
+        workers = number_flag('--jobs', CATEGORY_WORKERS)
+        port = number_flag('--port', SERVE_PORT)
+        bounds = [positive_number('--interval', value, float) for value in flag_values('--interval')]
+        if flag_values('--at'):
+            from game_start import parse_start_time
+            start_time = parse_start_time(flag_values('--at')[-1])
+    except ValueError as e:
+        print(f"ERROR: {e}\n")
+        show_usage()
+        return 1
+    sheets = None
+    synced = None
+
+    if flag_values('--at'):
+        from game_start import wait_for_game_start
+        worlds, preloads, sheets = wait_for_game_start(start_time, category_keys, dry_run,
+                                                       world_names)
+        if not preloads:
+            return 1
+        success = update_all_categories(
+            test_mode, dry_run, fetch_details,
+            [world['name'] for world in worlds if world['url'] in preloads], workers,
+            category_keys=category_keys, preloads=preloads, sheets=sheets)
+        if command != "watch":
+            return 0 if success else 1
+        synced = preloads if success else None
+
+    if command == "serve":
+        from serve import serve
+        success = serve(test_mode, dry_run, fetch_details, world_names, workers, port=port)
+        return 0 if success else 1
+    elif command == "watch":
+        from watch import AdaptiveInterval, watch
+        interval = AdaptiveInterval(*bounds[:2]) if bounds else None
+        success = watch(test_mode, dry_run, fetch_details, world_names, workers, interval, sheets,
+                        category_keys=category_keys, synced=synced)
+        return 0 if success else 1
+    elif len(names) == 1 and names[0] in CATEGORIES and not include and not exclude:
+        success = update_single_category(names[0], test_mode, dry_run, fetch_details, world_names)
         return 0 if success else 1
     else:
-        success = update_single_category(category, test_mode, dry_run)
+        # Several categories share one fetch, auth and spreadsheet metadata
+        success = update_all_categories(test_mode, dry_run, fetch_details, world_names, workers,
+                                        category_keys=category_keys)
         return 0 if success else 1
 
 if __name__ == "__main__":
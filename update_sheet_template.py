@@ -1,5 +1,5 @@
 #!/usr/bin/env nix-shell
-#!nix-shell -i python3 -p python312Packages.gspread python312Packages.google-auth-oauthlib python312Packages.requests
+#!nix-shell -i python3 -p python312Packages.gspread python312Packages.google-auth-oauthlib python312Packages.requests python312Packages.brotli
 
 """
 Template for updating NCL category sheets
@@ -9,122 +9,439 @@ This file contains the core logic that can be used by individual sheet update sc
 import gspread
 from google.oauth2.credentials import Credentials
 import os
-import pickle
 import requests
+from requests.adapters import HTTPAdapter
 import re
 import json
 import sys
+import hashlib
+import itertools
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batching import (DEFAULT_CHUNK_SIZE, DEFAULT_MAX_BYTES, DEFAULT_TARGET_LATENCY,
+                      AdaptiveBatcher, announced, send_in_chunks)
+from cluster_details import DEFAULT_MAX_WORKERS, fetch_cluster_details, apply_cluster_details
+from credentials import DEFAULT_REFRESH_INTERVAL, DEFAULT_REFRESH_MARGIN, CredentialManager
+from models import as_clusters
+from quota import DEFAULT_READS_PER_MINUTE, DEFAULT_WRITES_PER_MINUTE, SheetsQuota
+from request_templates import post_batch_update
+from snapshot_store import SnapshotStore
+from snapshot_log import SnapshotLog
+from sheet_plan import plan_category_sheet
+from transport import (
+    ACCEPT_ENCODING, DEFAULT_GZIP_MIN_BYTES, RETRYABLE_EXCEPTIONS,
+    CircuitBreaker, CircuitOpenError, RetryPolicy,
+    call_with_retries, install_sheets_adapter, iter_text, raise_for_transient_status
+)
+# Parsing lives in world_parser (no Google or config imports); re-exported for older callers
+from world_parser import CATEGORY_MAP, parse_category_challenges, parse_cluster, parse_world, world_clusters  # noqa: F401
 
 # Import configuration
 try:
+    import config
     from config import SHEET_ID, CYBERSKYLINE_URL, COOKIE_FILE, TOKEN_PATH
 except ImportError:
     print("ERROR: config.py not found!")
     print("Please copy config.example.py to config.py and fill in your values.")
     sys.exit(1)
 
-# Map cyberskyline category names to sheet tab names
-CATEGORY_MAP = {
-    "Open Source Intelligence": "OSINT",
-    "Cryptography": "Crypto",
-    "Password Cracking": "Cracking",
-    "Log Analysis": "Log",
-    "Network Traffic Analysis": "NTA",
-    "Forensics": "Forensics",
-    "Scanning & Reconnaissance": "Scanning",
-    "Web Application Exploitation": "Web",
-    "Enumeration & Exploitation": "Enum and Exploit"
-}
-
-# Data validation rules
-ANSWER_STATUS_VALIDATION = {
-    'condition': {
-        'type': 'ONE_OF_LIST',
-        'values': [
-            {'userEnteredValue': 'Yes'},
-            {'userEnteredValue': 'No'},
-            {'userEnteredValue': 'N/A'},
-            {'userEnteredValue': 'Needs Validation'},
-            {'userEnteredValue': 'Ready to submit'}
-        ]
-    },
-    'strict': True,
-    'showCustomUi': True
-}
-
-TEAM_MEMBER_VALIDATION = {
-    'condition': {
-        'type': 'ONE_OF_LIST',
-        'values': [
-            {'userEnteredValue': 'Nothing'},
-            {'userEnteredValue': 'Started'},
-            {'userEnteredValue': 'Agree'},
-            {'userEnteredValue': 'Disagree'},
-            {'userEnteredValue': 'Surrender'}
-        ]
-    },
-    'strict': True,
-    'showCustomUi': True
-}
-
-def authenticate_gsheets():
-    """Authenticate with Google Sheets API"""
-    with open(TOKEN_PATH, 'rb') as token:
-        creds = pickle.load(token)
-    return gspread.authorize(creds)
-
-def fetch_cyberskyline_data():
-    """Fetch challenge data from cyberskyline"""
-    with open(COOKIE_FILE, 'r') as f:
-        cookies_str = f.read().strip()
-
-    headers = {
-        'Cookie': cookies_str,
-        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/115.0'
-    }
+# Optional settings (older config.py files may not define these)
+CACHE_DIR = getattr(config, 'CACHE_DIR', os.path.expanduser("~/.cache/ncl-sheet-sync"))
+FETCH_CLUSTER_DETAILS = getattr(config, 'FETCH_CLUSTER_DETAILS', True)
+CLUSTER_URL_TEMPLATE = getattr(config, 'CLUSTER_URL_TEMPLATE', "{world_url}/challenge/{cluster_id}")
+DETAIL_WORKERS = getattr(config, 'DETAIL_WORKERS', DEFAULT_MAX_WORKERS)
+GZIP_REQUEST_BODIES = getattr(config, 'GZIP_REQUEST_BODIES', False)
+GZIP_MIN_BYTES = getattr(config, 'GZIP_MIN_BYTES', DEFAULT_GZIP_MIN_BYTES)
+FETCH_RETRIES = getattr(config, 'FETCH_RETRIES', 3)
+FETCH_TIMEOUT = getattr(config, 'FETCH_TIMEOUT', (5, 20))
+AUTO_REFRESH_COOKIES = getattr(config, 'AUTO_REFRESH_COOKIES', True)
+SNAPSHOT_DB = getattr(config, 'SNAPSHOT_DB', os.path.join(CACHE_DIR, 'snapshots.sqlite3'))
+SNAPSHOT_LOG_DIR = getattr(config, 'SNAPSHOT_LOG_DIR', os.path.join(CACHE_DIR, 'snapshot-logs'))
+VALUE_CHUNK_SIZE = getattr(config, 'VALUE_CHUNK_SIZE', 500)
+REQUEST_CHUNK_SIZE = getattr(config, 'REQUEST_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+BATCH_MAX_BYTES = getattr(config, 'BATCH_MAX_BYTES', DEFAULT_MAX_BYTES)
+BATCH_TARGET_LATENCY = getattr(config, 'BATCH_TARGET_LATENCY', DEFAULT_TARGET_LATENCY)
+SHEETS_READS_PER_MINUTE = getattr(config, 'SHEETS_READS_PER_MINUTE', DEFAULT_READS_PER_MINUTE)
+SHEETS_WRITES_PER_MINUTE = getattr(config, 'SHEETS_WRITES_PER_MINUTE', DEFAULT_WRITES_PER_MINUTE)
+SHEETS_RETRIES = getattr(config, 'SHEETS_RETRIES', 6)
+CATEGORY_WORKERS = getattr(config, 'CATEGORY_WORKERS', 4)
+ASYNC_SHEETS_CONCURRENCY = getattr(config, 'ASYNC_SHEETS_CONCURRENCY', 8)
+WATCH_MIN_INTERVAL = getattr(config, 'WATCH_MIN_INTERVAL', 5.0)
+WATCH_MAX_INTERVAL = getattr(config, 'WATCH_MAX_INTERVAL', 60.0)
+WATCH_BACKOFF = getattr(config, 'WATCH_BACKOFF', 1.5)
+GAME_START_LEAD = getattr(config, 'GAME_START_LEAD', 120.0)
+GAME_START_POLL_INTERVAL = getattr(config, 'GAME_START_POLL_INTERVAL', 1.0)
+GAME_START_TIMEOUT = getattr(config, 'GAME_START_TIMEOUT', 900.0)
+SERVE_HOST = getattr(config, 'SERVE_HOST', '127.0.0.1')
+SERVE_PORT = getattr(config, 'SERVE_PORT', 8765)
+SERVE_TOKEN = getattr(config, 'SERVE_TOKEN', None)
+TOKEN_REFRESH_MARGIN = getattr(config, 'TOKEN_REFRESH_MARGIN', DEFAULT_REFRESH_MARGIN)
+TOKEN_REFRESH_INTERVAL = getattr(config, 'TOKEN_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/115.0'
+
+class ConfigError(Exception):
+    """config.py describes something this tool can't sync"""
+
+class CyberskylineError(Exception):
+    """Cyberskyline answered, but not with a usable world page"""
+
+class SessionExpiredError(CyberskylineError):
+    """Cyberskyline served its login page: the session cookie has expired"""
+
+# Shared by every cyberskyline request, including per-cluster detail fetches
+FETCH_POLICY = RetryPolicy(retries=FETCH_RETRIES, timeout=FETCH_TIMEOUT)
+# World pages; detail pages trip their own breaker, so failing ones never block world fetches
+CYBERSKYLINE_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+DETAIL_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+
+# One Sheets budget per Google credential, however many tabs run in parallel
+SHEETS_QUOTA = SheetsQuota(SHEETS_READS_PER_MINUTE, SHEETS_WRITES_PER_MINUTE)
+_SHEETS_QUOTAS = {TOKEN_PATH: SHEETS_QUOTA}
+_SHEETS_QUOTAS_LOCK = threading.Lock()
+
+# Sheets calls rejected with 429/5xx are retried with backoff up to 64s, as Google recommends
+SHEETS_POLICY = RetryPolicy(retries=SHEETS_RETRIES, backoff_base=1.0, backoff_max=64.0,
+                            timeout=FETCH_TIMEOUT)
+
+# Batch sizes for Sheets writes, tuned from observed latency across categories
+VALUE_BATCHER = AdaptiveBatcher(start_count=VALUE_CHUNK_SIZE, max_count=max(VALUE_CHUNK_SIZE, 2000),
+                                max_bytes=BATCH_MAX_BYTES, target_latency=BATCH_TARGET_LATENCY,
+                                wait_clock=SHEETS_QUOTA.waited)
+REQUEST_BATCHER = AdaptiveBatcher(start_count=REQUEST_CHUNK_SIZE, max_count=max(REQUEST_CHUNK_SIZE, 1000),
+                                  max_bytes=BATCH_MAX_BYTES, target_latency=BATCH_TARGET_LATENCY,
+                                  wait_clock=SHEETS_QUOTA.waited)
+
+def sheets_quota(token_path=TOKEN_PATH):
+    """The Sheets budget shared by every request made with one credential (token file)"""
+    with _SHEETS_QUOTAS_LOCK:
+        if token_path not in _SHEETS_QUOTAS:
+            _SHEETS_QUOTAS[token_path] = SheetsQuota(SHEETS_READS_PER_MINUTE, SHEETS_WRITES_PER_MINUTE)
+        return _SHEETS_QUOTAS[token_path]
+
+# Google credentials and gspread clients, one per token file, shared by every caller
+CREDENTIALS = CredentialManager(TOKEN_REFRESH_MARGIN)
+_GSHEETS_CLIENTS = {}
+_GSHEETS_CLIENTS_LOCK = threading.Lock()
+
+def authenticate_gsheets(token_path=TOKEN_PATH):
+    """
+    Authenticate with Google Sheets API. Returns the same client for every
+    call with one token file; its token is refreshed ahead of expiry.
+    """
+    creds = CREDENTIALS.credentials(token_path)
+    with _GSHEETS_CLIENTS_LOCK:
+        if token_path not in _GSHEETS_CLIENTS:
+            gc = gspread.authorize(creds)
+            install_sheets_adapter(gc, GZIP_MIN_BYTES if GZIP_REQUEST_BODIES else None,
+                                   sheets_quota(token_path), retry_policy=SHEETS_POLICY,
+                                   pool_maxsize=max(10, CATEGORY_WORKERS * 2))
+            _GSHEETS_CLIENTS[token_path] = gc
+        return _GSHEETS_CLIENTS[token_path]
+
+_session = None
+_session_lock = threading.Lock()
+# Bumped on every cookie refresh so concurrent fetches refresh only once
+_cookie_generation = 0
+_refresh_lock = threading.Lock()
+
+# Bytes of a page examined for signs of the login page before reading the rest
+PREFLIGHT_CHARS = 16 * 1024
+LOGIN_PATH_MARKERS = ('/login', '/signin', '/auth')
+LOGIN_PAGE_MARKERS = ('type="password"', "type='password'", 'name="password"')
+
+def cyberskyline_session():
+    """Shared HTTP session for cyberskyline (pooled connections, cookie header set)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            with open(COOKIE_FILE, 'r') as f:
+                cookies_str = f.read().strip()
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=max(DETAIL_WORKERS, 10))
+            session.mount('https://', adapter)
+            session.headers.update({
+                'Cookie': cookies_str,
+                'User-Agent': USER_AGENT,
+                'Accept-Encoding': ACCEPT_ENCODING
+            })
+            _session = session
+        return _session
 
-    response = requests.get(CYBERSKYLINE_URL, headers=headers)
-    match = re.search(r'window\.preload\s*=\s*({.*?});', response.text, re.DOTALL)
-    preload_data = json.loads(match.group(1))
-    return preload_data
+def refresh_cookies():
+    """
+    Re-extract cyberskyline cookies from the browser (utils/auto_setup.py),
+    save them to COOKIE_FILE and use them for subsequent requests.
+    Returns True if fresh cookies were found.
+    """
+    global _cookie_generation
+    from utils.auto_setup import find_and_extract_cookies
 
-def parse_category_challenges(preload_data, category_name):
-    """Parse challenge data for a specific category"""
-    modules = preload_data.get('report', {}).get('modules', [])
+    print("  Cyberskyline session expired - re-extracting cookies from browser...")
+    cookies, browser = find_and_extract_cookies()
+    if not cookies:
+        return False
+
+    tmp_path = f"{COOKIE_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(cookies)
+    os.replace(tmp_path, COOKIE_FILE)
+
+    cyberskyline_session().headers['Cookie'] = cookies
+    _cookie_generation += 1
+    print(f"  ✓ Refreshed cookies from {browser}")
+    return True
+
+def looks_like_login(final_url, head):
+    """Cheap check on the final URL and the first bytes of a page"""
+    if any(marker in str(final_url).lower() for marker in LOGIN_PATH_MARKERS):
+        return True
+    return 'window.preload' not in head and any(marker in head for marker in LOGIN_PAGE_MARKERS)
+
+def extract_preload(html, url):
+    """The window.preload data embedded in a cyberskyline page"""
+    match = re.search(r'window\.preload\s*=\s*({.*?});', html, re.DOTALL)
+    if not match:
+        raise CyberskylineError(f"No window.preload data in page {url}")
+    return json.loads(match.group(1))
+
+def _fetch_preload_once(url):
+    with cyberskyline_session().get(url, stream=True, timeout=FETCH_POLICY.timeout) as response:
+        raise_for_transient_status(response)
+        if response.status_code in (401, 403):
+            raise SessionExpiredError(f"HTTP {response.status_code} from {url}")
+        if response.status_code >= 400:
+            raise CyberskylineError(f"HTTP {response.status_code} from {url}")
+
+        # Preflight: bail out on the login page before downloading the rest
+        chunks = iter_text(response)
+        head = ''
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= PREFLIGHT_CHARS:
+                break
+        if looks_like_login(response.url, head):
+            raise SessionExpiredError(f"Redirected to the login page ({response.url})")
+
+        html = head + ''.join(chunks)
+
+    return extract_preload(html, url)
+
+def fetch_preload(url):
+    """
+    Fetch a cyberskyline page and return its window.preload data.
+    Retries transient failures with jittered backoff; once cyberskyline keeps
+    failing, the shared circuit breaker makes further calls fail immediately.
+    """
+    generation = _cookie_generation
+    try:
+        return call_with_retries(lambda: _fetch_preload_once(url), FETCH_POLICY, CYBERSKYLINE_BREAKER)
+    except SessionExpiredError:
+        if not AUTO_REFRESH_COOKIES:
+            raise
+        with _refresh_lock:
+            # Another thread may already have refreshed the cookies
+            if generation == _cookie_generation and not refresh_cookies():
+                raise
+        return call_with_retries(lambda: _fetch_preload_once(url), FETCH_POLICY, CYBERSKYLINE_BREAKER)
+
+def fetch_detail_preload(url):
+    """
+    fetch_preload for cluster detail pages: its own circuit breaker and no
+    cookie refresh, since a failed detail page just falls back to summary data
+    """
+    return call_with_retries(lambda: _fetch_preload_once(url), FETCH_POLICY, DETAIL_BREAKER)
+
+def _world_digest(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+
+def _preload_cache_path(url):
+    return os.path.join(CACHE_DIR, f"preload-{_world_digest(url)}.json")
+
+def snapshot_log_path(url):
+    """Path (without extension) of a world's compressed preload log"""
+    return os.path.join(SNAPSHOT_LOG_DIR, f"world-{_world_digest(url)}")
+
+def save_cached_preload(url, preload_data):
+    """Keep the latest good preload of a world as an offline fallback"""
+    path = _preload_cache_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(preload_data, f)
+    os.replace(tmp_path, path)
+
+def load_cached_preload(url):
+    """Most recent cached preload of a world, or (None, None) if there is none"""
+    path = _preload_cache_path(url)
+    try:
+        with open(path, 'r') as f:
+            return json.load(f), os.path.getmtime(path)
+    except (OSError, ValueError):
+        return None, None
 
-    for module in modules:
-        if module['name'] == category_name:
-            challenge_clusters = []
+def fetch_cyberskyline_data(url=CYBERSKYLINE_URL):
+    """
+    Fetch challenge data from cyberskyline.
+    Falls back to the most recently cached preload when the site can't be
+    reached; raises if there is nothing cached either.
+    """
+    try:
+        preload_data = fetch_preload(url)
+    except (CyberskylineError, CircuitOpenError) + RETRYABLE_EXCEPTIONS as e:
+        preload_data, cached_at = load_cached_preload(url)
+        if preload_data is None:
+            raise
+        age = int(time.time() - cached_at)
+        print(f"  ⚠ Fetch failed ({e}); using cached data from {age}s ago")
+        return preload_data
+
+    store_preload(url, preload_data)
+    return preload_data
 
-            for cluster in module.get('clusters', []):
-                cluster_name = cluster['name']
-                num_questions = cluster['challenges']
-                cluster_points = cluster['points']
+def store_preload(url, preload_data):
+    """Cache a freshly fetched preload and record it in the snapshot history"""
+    try:
+        save_cached_preload(url, preload_data)
+    except OSError as e:
+        print(f"  ⚠ Could not cache preload: {e}")
 
-                questions = []
-                if num_questions > 0:
-                    avg_points = cluster_points // num_questions
+    record_snapshot(url, preload_data)
+    append_snapshot_log(url, preload_data)
 
-                    for i in range(num_questions):
-                        if i == num_questions - 1:
-                            points = cluster_points - (avg_points * (num_questions - 1))
-                        else:
-                            points = avg_points
+def append_snapshot_log(url, preload_data):
+    """Append a fetched preload to the world's replay log (if enabled); never fails the fetch"""
+    if not SNAPSHOT_LOG_DIR:
+        return None
+    try:
+        with SnapshotLog(snapshot_log_path(url)) as log:
+            return log.append(preload_data)
+    except (OSError, ValueError) as e:
+        print(f"  ⚠ Could not append to snapshot log: {e}")
+        return None
+
+def record_snapshot(url, preload_data):
+    """Record a fetched world in the snapshot store (if enabled); never fails the fetch"""
+    if not SNAPSHOT_DB:
+        return None
+    try:
+        with SnapshotStore(SNAPSHOT_DB) as store:
+            return store.record(url, parse_world(preload_data))
+    except (sqlite3.Error, OSError, KeyError, TypeError) as e:
+        print(f"  ⚠ Could not record snapshot: {e}")
+        return None
 
-                        questions.append({
-                            'points': points,
-                            'index': i + 1
-                        })
+def load_worlds():
+    """
+    Worlds to sync in one run.
+    Uses config.WORLDS and config.FLEET when set, otherwise the single
+    CYBERSKYLINE_URL/SHEET_ID pair. Each world is a dict with 'name', 'url',
+    'sheet_id', 'token_path' (Google credential) and optional 'categories'
+    (category keys to sync) and 'tabs' (category key -> tab name).
+    FLEET entries are team spreadsheets of CYBERSKYLINE_URL unless they give
+    their own 'url'; worlds sharing a url are fetched only once.
+    Raises ConfigError if two worlds end up with the same name.
+    """
+    worlds = getattr(config, 'WORLDS', None) or []
+    fleet = getattr(config, 'FLEET', None) or []
+    if not worlds and not fleet:
+        return [{'name': 'default', 'url': CYBERSKYLINE_URL, 'sheet_id': SHEET_ID,
+                 'token_path': TOKEN_PATH}]
+
+    entries = [(world, world['url'], f"world{i + 1}") for i, world in enumerate(worlds)]
+    entries += [(sheet, sheet.get('url', CYBERSKYLINE_URL), f"team{i + 1}") for i, sheet in enumerate(fleet)]
+
+    normalized = []
+    for world, url, default_name in entries:
+        normalized.append({
+            'name': world.get('name') or default_name,
+            'url': url,
+            'sheet_id': world.get('sheet_id', SHEET_ID),
+            'token_path': world.get('token_path', TOKEN_PATH),
+            'categories': world.get('categories'),
+            'tabs': world.get('tabs') or {}
+        })
 
-                challenge_clusters.append({
-                    'name': cluster_name,
-                    'questions': questions,
-                    'total_points': cluster_points
-                })
+    names = [world['name'] for world in normalized]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ConfigError(f"World names must be unique in WORLDS and FLEET: {', '.join(duplicates)}")
+    return normalized
 
-            return challenge_clusters
+def fetch_worlds(worlds):
+    """
+    Fetch every world's preload concurrently, once per distinct url.
+    Returns {world name: preload data}, with the exception in place of the
+    data for any world that failed, so one bad world doesn't sink the rest.
+    """
+    urls = list(dict.fromkeys(world['url'] for world in worlds))
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=len(urls) or 1) as pool:
+        futures = {url: pool.submit(fetch_cyberskyline_data, url) for url in urls}
+        for url, future in futures.items():
+            try:
+                fetched[url] = future.result()
+            except Exception as e:
+                fetched[url] = e
+    return {world['name']: fetched[world['url']] for world in worlds}
+
+def cluster_detail_url(cluster, world_url=CYBERSKYLINE_URL):
+    """URL of a cluster's own page, which lists its real questions"""
+    return CLUSTER_URL_TEMPLATE.format(world_url=world_url.rstrip('/'),
+                                       cluster_id=cluster.id)
+
+def enrich_challenge_clusters(challenge_clusters, world_url=CYBERSKYLINE_URL):
+    """
+    Replace approximated question names and points with the real ones.
+    Cluster pages are fetched concurrently and cached per cluster; any cluster
+    whose details can't be fetched keeps its approximated values.
+    Accepts Cluster objects or dicts and returns a list of Clusters.
+    """
+    challenge_clusters = as_clusters(challenge_clusters)
+    if not FETCH_CLUSTER_DETAILS:
+        return challenge_clusters
+
+    details = fetch_cluster_details(
+        challenge_clusters,
+        fetch_detail_preload,
+        lambda cluster: cluster_detail_url(cluster, world_url),
+        cache_dir=os.path.join(CACHE_DIR, 'clusters'),
+        max_workers=DETAIL_WORKERS
+    )
+    return apply_cluster_details(challenge_clusters, details)
+
+def find_existing_work(answer_status_cells, team_member_cells, start_row):
+    """
+    Look for non-default dropdown values in cells read from column D and
+    columns G-M (lists of rows, as the Sheets API returns them).
+    Returns True if work found.
+    """
+    # Check Answer Status cells for non-default values
+    for i, row in enumerate(answer_status_cells, start=start_row):
+        if row and len(row) > 0:
+            value = row[0].strip() if row[0] else ""
+            # Non-default if it's not empty and not "N/A"
+            if value and value != "N/A":
+                print(f"  ⚠ Found work in Answer Status (row {i}): '{value}'")
+                return True
+
+    # Check team member cells for non-default values
+    for i, row in enumerate(team_member_cells, start=start_row):
+        if row:
+            for col_idx, cell in enumerate(row):
+                value = cell.strip() if cell else ""
+                # Non-default if it's not empty and not "Nothing"
+                if value and value != "Nothing":
+                    col_letter = chr(ord('G') + col_idx)  # G, H, I, J, K, L, M
+                    print(f"  ⚠ Found work in team member column {col_letter} (row {i}): '{value}'")
+                    return True
 
-    return []
+    print("  ✓ No existing work detected - safe to proceed")
+    return False
 
 def check_existing_work(worksheet, start_row, end_row):
     """
@@ -144,546 +461,162 @@ def check_existing_work(worksheet, start_row, end_row):
         team_member_range = f'G{start_row}:M{end_row}'
         team_member_cells = worksheet.get(team_member_range)
 
-        # Check Answer Status cells for non-default values
-        for i, row in enumerate(answer_status_cells, start=start_row):
-            if row and len(row) > 0:
-                value = row[0].strip() if row[0] else ""
-                # Non-default if it's not empty and not "N/A"
-                if value and value != "N/A":
-                    print(f"  ⚠ Found work in Answer Status (row {i}): '{value}'")
-                    return True
-
-        # Check team member cells for non-default values
-        for i, row in enumerate(team_member_cells, start=start_row):
-            if row:
-                for col_idx, cell in enumerate(row):
-                    value = cell.strip() if cell else ""
-                    # Non-default if it's not empty and not "Nothing"
-                    if value and value != "Nothing":
-                        col_letter = chr(ord('G') + col_idx)  # G, H, I, J, K, L, M
-                        print(f"  ⚠ Found work in team member column {col_letter} (row {i}): '{value}'")
-                        return True
-
-        print("  ✓ No existing work detected - safe to proceed")
-        return False
+        return find_existing_work(answer_status_cells, team_member_cells, start_row)
 
     except Exception as e:
         print(f"  ⚠ Error checking for existing work: {e}")
         print("  Aborting update as a safety precaution")
         return True
 
-def update_category_sheet(gc, sheet_name, challenge_clusters, test_mode=False):
-    """Update a category sheet with challenge data"""
-    spreadsheet = gc.open_by_key(SHEET_ID)
-
-    try:
-        worksheet = spreadsheet.worksheet(sheet_name)
-    except gspread.exceptions.WorksheetNotFound:
-        print(f"ERROR: Sheet '{sheet_name}' not found")
-        return False
-
+def print_existing_work_abort():
     print(f"\n{'='*70}")
-    print(f"Updating {sheet_name} Sheet")
+    print("ERROR: Existing work detected in sheet!")
+    print("Aborting update to prevent data loss.")
+    print("Clear the sheet manually first if you want to regenerate it.")
     print(f"{'='*70}\n")
 
-    # Start from row 50 for testing (will use row 3 in production)
+def sheet_rows(plan, test_mode):
+    """
+    Rows (start_row, end_row) to safety-check and clear for a plan: 3-100,
+    or 50-150 in test mode, extended to the plan's last row if it needs more.
+    """
     start_row = 50 if test_mode else 3
     end_row = 150 if test_mode else 100
 
-    # Safety check: abort if any work has been done
-    if check_existing_work(worksheet, start_row, end_row):
-        print(f"\n{'='*70}")
-        print("ERROR: Existing work detected in sheet!")
-        print("Aborting update to prevent data loss.")
-        print("Clear the sheet manually first if you want to regenerate it.")
-        print(f"{'='*70}\n")
-        return False
+    # Never write past the range that was safety-checked and cleared
+    last_row = plan['next_row'] - 1
+    if last_row > end_row:
+        print(f"⚠ Challenges need rows {start_row}-{last_row}, past row {end_row}; "
+              f"checking and clearing through row {last_row}")
+        end_row = last_row
+    return start_row, end_row
 
-    # Clear existing data in the range
-    print(f"Clearing rows {start_row}-{end_row}...")
-    worksheet.batch_clear([f'A{start_row}:N{end_row}'])
+def print_adding_rows(row_count, end_row):
+    print(f"Adding {end_row - row_count} rows: the tab has {row_count}, the update needs {end_row}...")
 
-    # Show what we're about to do
+def print_plan(challenge_clusters, plan, start_row, test_mode):
+    """Show the challenge structure and the rows about to be written"""
     print("\nChallenge structure from cyberskyline:")
     for i, cluster in enumerate(challenge_clusters, 1):
-        print(f"  Challenge {i}: {cluster['name']}")
-        print(f"    Questions: {len(cluster['questions'])}")
-        print(f"    Total Points: {cluster['total_points']}")
-        print(f"    Point distribution: {[q['points'] for q in cluster['questions']]}")
+        print(f"  Challenge {i}: {cluster.name}")
+        print(f"    Questions: {cluster.question_count}")
+        print(f"    Total Points: {cluster.total_points}")
+        print(f"    Point distribution: {[q.points for q in cluster.questions]}")
     print()
 
-    current_row = start_row
-
     if test_mode:
         print("*** TEST MODE: Writing to rows 50+ to avoid clobbering data ***\n")
 
-    updates = []
-
-    # Track question rows for adding validation later
-    question_rows = []
-    marker_rows = []
-
-    for cluster in challenge_clusters:
-        # Add challenge marker row
-        print(f"Row {current_row}: Challenge marker '{cluster['name']}'")
-        marker_rows.append(current_row)
-        updates.append({
-            'range': f'A{current_row}',
-            'values': [[cluster['name']]]
-        })
-
-        current_row += 1
-
-        # Add question rows
-        for question in cluster['questions']:
-            question_text = f"Question {question['index']}"
-            print(f"  Row {current_row}: {question_text} - {question['points']} points")
-
-            question_rows.append(current_row)
-
-            # Update columns A, D, and N
-            updates.append({
-                'range': f'A{current_row}',
-                'values': [[question_text]]
-            })
-            updates.append({
-                'range': f'D{current_row}',
-                'values': [['N/A']]  # Default Answer Status
-            })
-            updates.append({
-                'range': f'N{current_row}',
-                'values': [[question['points']]]
-            })
-
-            # Set default values for team member columns (columns G-M)
-            updates.append({
-                'range': f'G{current_row}:M{current_row}',
-                'values': [['Nothing', 'Nothing', 'Nothing', 'Nothing', 'Nothing', 'Nothing', 'Nothing']]
-            })
-
-            current_row += 1
-
-        # Add blank row after each challenge
-        current_row += 1
+    questions_by_row = dict(plan['question_rows'])
+    for row, cluster in plan['marker_rows']:
+        print(f"Row {row}: Challenge marker '{cluster.name}'")
+        for question_row in range(row + 1, row + 1 + cluster.question_count):
+            question = questions_by_row[question_row]
+            print(f"  Row {question_row}: {question.label} - {question.points} points")
 
     print(f"\n{'='*70}")
-    print(f"Total rows to update: {current_row - start_row}")
+    print(f"Total rows to update: {plan['next_row'] - start_row}")
     print(f"Starting at row: {start_row}")
-    print(f"Ending at row: {current_row - 1}")
+    print(f"Ending at row: {plan['next_row'] - 1}")
     print(f"{'='*70}\n")
 
-    # Apply updates
-    print("Updating cell values...")
-    worksheet.batch_update(updates)
-
-    print("Adding data validation (dropdowns)...")
-    # Build validation requests for all question rows
-    validation_requests = []
-
-    for row_num in question_rows:
-        row_index = row_num - 1  # 0-indexed
-
-        # Column D (Answer Status) validation
-        validation_requests.append({
-            'setDataValidation': {
-                'range': {
-                    'sheetId': worksheet.id,
-                    'startRowIndex': row_index,
-                    'endRowIndex': row_index + 1,
-                    'startColumnIndex': 3,  # Column D
-                    'endColumnIndex': 4
-                },
-                'rule': ANSWER_STATUS_VALIDATION
-            }
-        })
-
-        # Columns G-M (Team member) validation
-        for col_idx in range(6, 13):  # Columns G-M (0-indexed: 6-12)
-            validation_requests.append({
-                'setDataValidation': {
-                    'range': {
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_index,
-                        'endRowIndex': row_index + 1,
-                        'startColumnIndex': col_idx,
-                        'endColumnIndex': col_idx + 1
-                    },
-                    'rule': TEAM_MEMBER_VALIDATION
-                }
-            })
-
-    # Apply validations in batch
-    spreadsheet.batch_update({'requests': validation_requests})
-
-    print("Applying cell formatting (colors, borders)...")
-    # Format all cells
-    format_requests = []
-
-    # Grey background for marker rows
-    for row_num in marker_rows:
-        format_requests.append({
-            'repeatCell': {
-                'range': {
-                    'sheetId': worksheet.id,
-                    'startRowIndex': row_num - 1,  # 0-indexed
-                    'endRowIndex': row_num,
-                    'startColumnIndex': 0,
-                    'endColumnIndex': 14  # Columns A-N
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {
-                            'red': 0.85,
-                            'green': 0.85,
-                            'blue': 0.85
-                        }
-                    }
-                },
-                'fields': 'userEnteredFormat.backgroundColor'
-            }
-        })
-
-    # Format question rows
-    for row_num in question_rows:
-        row_index = row_num - 1
-
-        # White background for all cells in question rows
-        format_requests.append({
-            'repeatCell': {
-                'range': {
-                    'sheetId': worksheet.id,
-                    'startRowIndex': row_index,
-                    'endRowIndex': row_index + 1,
-                    'startColumnIndex': 0,
-                    'endColumnIndex': 14
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {'red': 1, 'green': 1, 'blue': 1},
-                        'borders': {
-                            'top': {'style': 'SOLID', 'width': 1},
-                            'bottom': {'style': 'SOLID', 'width': 1},
-                            'left': {'style': 'SOLID', 'width': 1},
-                            'right': {'style': 'SOLID', 'width': 1}
-                        }
-                    }
-                },
-                'fields': 'userEnteredFormat.backgroundColor,userEnteredFormat.borders'
-            }
-        })
-
-        # White text for team member columns G-M (makes "Nothing" invisible)
-        format_requests.append({
-            'repeatCell': {
-                'range': {
-                    'sheetId': worksheet.id,
-                    'startRowIndex': row_index,
-                    'endRowIndex': row_index + 1,
-                    'startColumnIndex': 6,  # Column G
-                    'endColumnIndex': 13  # Column M
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {
-                            'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}
-                        }
-                    }
-                },
-                'fields': 'userEnteredFormat.textFormat.foregroundColor'
-            }
-        })
-
-    spreadsheet.batch_update({'requests': format_requests})
-
-    print("Adding conditional formatting for dropdown colors...")
-    # Add conditional formatting rules for Answer Status (D) and team member columns (G-M)
-    conditional_format_requests = []
-
-    # Build ranges for all question rows
-    for row_num in question_rows:
-        # Answer Status (Column D) conditional formatting
-        # Yes = white text on green background
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 3,  # Column D
-                        'endColumnIndex': 4
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Yes'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'green': 1},
-                            'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
-                            'backgroundColorStyle': {'rgbColor': {'green': 1}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+def print_update_summary(sheet_name, challenge_clusters):
+    print(f"\n✓ {sheet_name} sheet updated successfully!")
+    print(f"  - {len(challenge_clusters)} challenges")
+    print(f"  - {sum(c.question_count for c in challenge_clusters)} questions")
+    print(f"  - Dropdowns added to Answer Status and team member columns")
+    print(f"  - Challenge markers formatted with grey background")
+    print(f"  - Conditional formatting applied for dropdown colors")
 
-        # No = white text on red background
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 3,
-                        'endColumnIndex': 4
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'No'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 1},
-                            'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
-                            'backgroundColorStyle': {'rgbColor': {'red': 1}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+def update_category_sheet(gc, sheet_name, challenge_clusters, test_mode=False, sheet_id=SHEET_ID):
+    """
+    Update a category sheet with challenge data.
+    challenge_clusters may be Cluster objects or the older dict form.
+    """
+    spreadsheet = gc.open_by_key(sheet_id)
 
-        # N/A = black text on grey background
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 3,
-                        'endColumnIndex': 4
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'N/A'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 0.85, 'green': 0.85, 'blue': 0.85},
-                            'textFormat': {'foregroundColor': {}},
-                            'backgroundColorStyle': {'rgbColor': {'red': 0.85, 'green': 0.85, 'blue': 0.85}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+    try:
+        worksheet = spreadsheet.worksheet(sheet_name)
+    except gspread.exceptions.WorksheetNotFound:
+        print(f"ERROR: Sheet '{sheet_name}' not found")
+        return False
 
-        # Needs Validation = black text on beige/yellowish background
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 3,
-                        'endColumnIndex': 4
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Needs Validation'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 1, 'green': 0.95, 'blue': 0.8},
-                            'textFormat': {'foregroundColor': {}},
-                            'backgroundColorStyle': {'rgbColor': {'red': 1, 'green': 0.95, 'blue': 0.8}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+    prepared = prepare_category_sheet(spreadsheet, worksheet, challenge_clusters, test_mode)
+    if prepared is None:
+        return False
+    return apply_category_sheet(prepared)
 
-        # Ready to submit = dark green text on light green background
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 3,
-                        'endColumnIndex': 4
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Ready to submit'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 0.85, 'green': 0.92, 'blue': 0.83},
-                            'textFormat': {'foregroundColor': {'green': 0.5}, 'bold': True},
-                            'backgroundColorStyle': {'rgbColor': {'red': 0.85, 'green': 0.92, 'blue': 0.83}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+def prepare_category_sheet(spreadsheet, worksheet, challenge_clusters, test_mode=False):
+    """
+    Plan a tab and run the safety check; reads only, writes nothing.
+    Returns the prepared update for apply_category_sheet, or None if the
+    tab already holds work and must not be cleared.
+    """
+    challenge_clusters = as_clusters(challenge_clusters)
 
-        # Team member columns (G-M) conditional formatting
-        # Nothing = White
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 6,
-                        'endColumnIndex': 13
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Nothing'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 1, 'green': 1, 'blue': 1},
-                            'textFormat': {'foregroundColor': {}},
-                            'backgroundColorStyle': {'rgbColor': {'red': 1, 'green': 1, 'blue': 1}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+    print(f"\n{'='*70}")
+    print(f"Updating {worksheet.title} Sheet")
+    print(f"{'='*70}\n")
 
-        # Started = Light green
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 6,
-                        'endColumnIndex': 13
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Started'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 0.8509804, 'green': 0.91764706, 'blue': 0.827451},
-                            'textFormat': {'foregroundColor': {}},
-                            'backgroundColorStyle': {'rgbColor': {'red': 0.8509804, 'green': 0.91764706, 'blue': 0.827451}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+    # Start from row 50 for testing (will use row 3 in production)
+    start_row = 50 if test_mode else 3
+    plan = plan_category_sheet(worksheet.id, challenge_clusters, start_row)
+    start_row, end_row = sheet_rows(plan, test_mode)
+
+    # Safety check: abort if any work has been done. Rows past the tab's
+    # grid can't hold work (or be read); apply_category_sheet adds them.
+    checked_end = min(end_row, worksheet.row_count)
+    if checked_end >= start_row and check_existing_work(worksheet, start_row, checked_end):
+        print_existing_work_abort()
+        return None
+
+    return {
+        'spreadsheet': spreadsheet,
+        'worksheet': worksheet,
+        'challenge_clusters': challenge_clusters,
+        'plan': plan,
+        'start_row': start_row,
+        'end_row': end_row,
+        'test_mode': test_mode,
+    }
 
-        # Agree = Green, bold
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 6,
-                        'endColumnIndex': 13
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Agree'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'green': 1},
-                            'textFormat': {'foregroundColor': {}, 'bold': True},
-                            'backgroundColorStyle': {'rgbColor': {'green': 1}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+def apply_category_sheet(prepared):
+    """Clear and write a tab prepared by prepare_category_sheet"""
+    spreadsheet = prepared['spreadsheet']
+    worksheet = prepared['worksheet']
+    challenge_clusters = prepared['challenge_clusters']
+    plan = prepared['plan']
+    start_row, end_row = prepared['start_row'], prepared['end_row']
 
-        # Disagree = Red background, white bold text
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 6,
-                        'endColumnIndex': 13
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Disagree'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 1},
-                            'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
-                            'backgroundColorStyle': {'rgbColor': {'red': 1}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+    # Large worlds can need more rows than the tab's grid has (1000 by default)
+    if worksheet.row_count < end_row:
+        print_adding_rows(worksheet.row_count, end_row)
+        worksheet.add_rows(end_row - worksheet.row_count)
 
-        # Surrender = Black background, white bold text
-        conditional_format_requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': worksheet.id,
-                        'startRowIndex': row_num - 1,
-                        'endRowIndex': row_num,
-                        'startColumnIndex': 6,
-                        'endColumnIndex': 13
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_EQ',
-                            'values': [{'userEnteredValue': 'Surrender'}]
-                        },
-                        'format': {
-                            'backgroundColor': {},
-                            'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True},
-                            'backgroundColorStyle': {'rgbColor': {}}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+    # Clear existing data in the range
+    print(f"Clearing rows {start_row}-{end_row}...")
+    worksheet.batch_clear([f'A{start_row}:N{end_row}'])
 
-    # Apply conditional formatting in batches (max 100 requests at a time)
-    batch_size = 100
-    for i in range(0, len(conditional_format_requests), batch_size):
-        batch = conditional_format_requests[i:i+batch_size]
-        spreadsheet.batch_update({'requests': batch})
+    # Show what we're about to do
+    print_plan(challenge_clusters, plan, start_row, prepared['test_mode'])
 
-    print(f"\n✓ {sheet_name} sheet updated successfully!")
-    print(f"  - {len(challenge_clusters)} challenges")
-    print(f"  - {sum(len(c['questions']) for c in challenge_clusters)} questions")
-    print(f"  - Dropdowns added to Answer Status and team member columns")
-    print(f"  - Challenge markers formatted with grey background")
-    print(f"  - Conditional formatting applied for dropdown colors")
+    # Apply updates. Requests are generated lazily and sent in chunks as they
+    # fill, so building the next chunk overlaps with sending the previous one.
+    print("Updating cell values...")
+    batches, sent = send_in_chunks(plan['updates'], worksheet.batch_update, VALUE_BATCHER)
+    print(f"  Sent {sent} value ranges in {batches} batches")
+
+    # Dropdowns, formatting and conditional formatting share one request stream
+    format_stream = itertools.chain(
+        announced("Adding data validation (dropdowns)...", plan['validation_requests']),
+        announced("Applying cell formatting (colors, borders)...", plan['format_requests']),
+        announced("Adding conditional formatting for dropdown colors...",
+                  plan['conditional_format_requests'])
+    )
+    batches, sent = send_in_chunks(
+        format_stream, lambda batch: post_batch_update(spreadsheet, batch), REQUEST_BATCHER)
+    print(f"  Sent {sent} formatting requests in {batches} batches")
+
+    print_update_summary(worksheet.title, challenge_clusters)
 
     return True
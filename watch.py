@@ -0,0 +1,197 @@
+"""
+Watch mode: keep the sheets in step with the world during a competition
+
+    ./update_sheet.py watch --yes
+
+syncs every selected category once from the first fetch of each world, so
+it starts from sheets known to match the world, then polls and syncs only
+when a world's preload content hash changes, and then only the categories
+whose challenges changed (see world_changes.py). After a game start sync
+(--at) the synced data is the starting point instead. The poll interval
+adapts: it drops to the minimum after a change, when more unlocks are
+likely to follow, and backs off towards the maximum while nothing
+changes, so cyberskyline is not hammered during quiet stretches. The cyberskyline session and the Google credentials and
+spreadsheets are opened once and reused by every poll and sync, and the
+Google tokens are refreshed in the background before they expire.
+
+Tabs that already hold team work are still protected by the safety check:
+their sync is skipped and the changes are reported instead. Categories
+whose sync fails (refused by the safety check, or an error) stay pending
+and are synced again on every poll until a sync succeeds.
+"""
+
+import hashlib
+import json
+import random
+import time
+
+from update_sheet import (
+    CATEGORIES,
+    open_world_sheets,
+    select_worlds,
+    update_all_categories,
+    world_urls,
+)
+from update_sheet_template import (
+    CATEGORY_WORKERS,
+    CREDENTIALS,
+    TOKEN_REFRESH_INTERVAL,
+    WATCH_BACKOFF,
+    WATCH_MAX_INTERVAL,
+    WATCH_MIN_INTERVAL,
+    CyberskylineError,
+    fetch_preload,
+    parse_world,
+    store_preload,
+)
+from transport import RETRYABLE_EXCEPTIONS, CircuitOpenError
+from world_changes import changed_categories, diff_worlds
+
+
+def preload_digest(preload_data):
+    """Content hash of a world's raw preload data"""
+    text = json.dumps(preload_data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class AdaptiveInterval:
+    """
+    Poll interval between min_interval and max_interval seconds: reset to
+    the minimum after a change, multiplied by backoff after each quiet poll.
+    """
+
+    def __init__(self, min_interval=WATCH_MIN_INTERVAL, max_interval=WATCH_MAX_INTERVAL,
+                 backoff=WATCH_BACKOFF):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.current = min_interval
+
+    def record(self, changed):
+        if changed:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.max_interval, self.current * self.backoff)
+
+    def next_delay(self):
+        """Seconds to sleep before the next poll (with a little jitter)"""
+        return self.current * random.uniform(0.9, 1.1)
+
+
+class WorldPoller:
+    """Fetches one world and reports what changed since the previous poll"""
+
+    def __init__(self, url):
+        self.url = url
+        self.digest = None
+        self.world = None
+        self.preload_data = None
+        self.pending = set()  # category keys changed but not yet synced
+
+    def baseline(self, preload_data):
+        """Start from preload data the sheets were just synced with"""
+        self._accept(preload_data)
+
+    def _accept(self, preload_data):
+        self.digest = preload_digest(preload_data)
+        self.world = parse_world(preload_data)
+        self.preload_data = preload_data
+
+    def poll(self):
+        """
+        Fetch the world. Returns the change events since the last poll, an
+        empty list if the content is unchanged or the change touches no
+        challenge, or None when this is the first successful fetch.
+        """
+        preload_data = fetch_preload(self.url)
+        digest = preload_digest(preload_data)
+        if digest == self.digest:
+            return []
+
+        first = self.world is None
+        old_world = self.world
+        self._accept(preload_data)
+        store_preload(self.url, preload_data)
+        return None if first else list(diff_worlds(old_world, self.world))
+
+
+def category_keys_for(events):
+    """Category keys (see update_sheet.CATEGORIES) touched by change events"""
+    names = changed_categories(events)
+    return [key for key, (_, category_name) in CATEGORIES.items() if category_name in names]
+
+
+def watch(test_mode=False, dry_run=True, fetch_details=True, world_names=None,
+          workers=CATEGORY_WORKERS, interval=None, sheets=None, category_keys=None, synced=None):
+    """
+    Poll the selected worlds until interrupted, syncing changed categories
+    (only those in category_keys, if given). sheets (from open_world_sheets)
+    reuses spreadsheets that are already open. synced ({url: preload data})
+    are worlds just synced, which need no sync on their first fetch.
+    """
+    worlds = select_worlds(world_names)
+    if not worlds:
+        return False
+
+    interval = interval or AdaptiveInterval()
+    pollers = {url: WorldPoller(url) for url in world_urls(worlds)}
+    for url, preload_data in (synced or {}).items():
+        if url in pollers:
+            pollers[url].baseline(preload_data)
+
+    if not dry_run:
+        if sheets is None:
+            print("Authenticating with Google Sheets...")
+            sheets = open_world_sheets(worlds)
+        CREDENTIALS.start_refresher(TOKEN_REFRESH_INTERVAL)
+
+    print(f"Watching {len(pollers)} world(s), polling every "
+          f"{interval.min_interval:g}-{interval.max_interval:g}s (Ctrl-C to stop)")
+    if dry_run:
+        print("*** DRY RUN MODE: changes are reported, sheets are not updated ***")
+
+    try:
+        while True:
+            changed = False
+            for url, poller in pollers.items():
+                try:
+                    events = poller.poll()
+                except (CyberskylineError, CircuitOpenError) + RETRYABLE_EXCEPTIONS as e:
+                    print(f"  ⚠ {time.strftime('%H:%M:%S')} Poll failed for {url}: {e}")
+                    events = []
+
+                if events is None:
+                    print(f"{time.strftime('%H:%M:%S')} Fetched {url}; syncing every category "
+                          f"once, then watching for changes")
+                    poller.pending.update(category_keys or CATEGORIES)
+                elif events:
+                    changed = True
+                    print(f"\n{time.strftime('%H:%M:%S')} {len(events)} change(s) in {url}:")
+                    for event in events:
+                        print(f"  {event}")
+                    poller.pending.update(key for key in category_keys_for(events)
+                                          if category_keys is None or key in category_keys)
+                if not poller.pending:
+                    continue
+
+                pending_keys = [key for key in CATEGORIES if key in poller.pending]
+                try:
+                    succeeded = update_all_categories(
+                        test_mode, dry_run, fetch_details,
+                        [world['name'] for world in worlds if world['url'] == url],
+                        workers, category_keys=pending_keys,
+                        preloads={url: poller.preload_data}, sheets=sheets)
+                except Exception as e:
+                    print(f"  ⚠ {time.strftime('%H:%M:%S')} Sync failed for {url}: {e}")
+                    succeeded = False
+                if succeeded:
+                    poller.pending.difference_update(pending_keys)
+                else:
+                    print(f"  ⚠ {len(pending_keys)} category tab(s) of {url} will be synced "
+                          f"again on the next poll")
+
+            interval.record(changed)
+            time.sleep(interval.next_delay())
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    return True
@@ -0,0 +1,130 @@
+"""
+Change detection between two parsed worlds
+
+Compares two world models (see world_parser.parse_world) and emits
+typed events for what changed. Categories whose content hash is unchanged
+are skipped outright, and inside a changed category clusters are matched by
+key and compared by content hash, so the work done is proportional to the
+changes rather than the size of the world.
+"""
+
+from dataclasses import dataclass
+
+from models import Cluster
+
+
+@dataclass(frozen=True)
+class ClusterAdded:
+    category: str
+    cluster: Cluster
+
+    def __str__(self):
+        return (f"[{self.category}] New challenge '{self.cluster.name}' "
+                f"({self.cluster.question_count} questions, {self.cluster.total_points} points)")
+
+
+@dataclass(frozen=True)
+class ClusterRemoved:
+    category: str
+    cluster: Cluster
+
+    def __str__(self):
+        return f"[{self.category}] Challenge '{self.cluster.name}' removed"
+
+
+@dataclass(frozen=True)
+class QuestionCountChanged:
+    category: str
+    old: Cluster
+    new: Cluster
+
+    def __str__(self):
+        return (f"[{self.category}] '{self.new.name}': "
+                f"{self.old.question_count} -> {self.new.question_count} questions")
+
+
+@dataclass(frozen=True)
+class PointsChanged:
+    category: str
+    old: Cluster
+    new: Cluster
+
+    def __str__(self):
+        old_points = [q.points for q in self.old.questions]
+        new_points = [q.points for q in self.new.questions]
+        if self.old.total_points != self.new.total_points:
+            return (f"[{self.category}] '{self.new.name}': "
+                    f"{self.old.total_points} -> {self.new.total_points} points")
+        return f"[{self.category}] '{self.new.name}': points {old_points} -> {new_points}"
+
+
+@dataclass(frozen=True)
+class NamesChanged:
+    """Only the challenge name or question names differ"""
+    category: str
+    old: Cluster
+    new: Cluster
+
+    def __str__(self):
+        if self.old.name != self.new.name:
+            return f"[{self.category}] '{self.old.name}' renamed to '{self.new.name}'"
+        return f"[{self.category}] '{self.new.name}': question names updated"
+
+
+def _cluster_events(category, old, new):
+    """Events for one cluster present in both worlds with different content"""
+    count_changed = old.question_count != new.question_count
+    points_changed = (old.total_points != new.total_points
+                      or [q.points for q in old.questions] != [q.points for q in new.questions])
+
+    if count_changed:
+        yield QuestionCountChanged(category, old, new)
+    if points_changed:
+        yield PointsChanged(category, old, new)
+    if not count_changed and not points_changed:
+        yield NamesChanged(category, old, new)
+
+
+def diff_categories(category_name, old_category, new_category):
+    """Yield change events between two versions of one category (either may be None)"""
+    old_clusters = old_category.clusters if old_category else ()
+    new_clusters = new_category.clusters if new_category else ()
+
+    old_by_key = {c.key: c for c in old_clusters}
+    new_keys = set()
+
+    for cluster in new_clusters:
+        new_keys.add(cluster.key)
+        old = old_by_key.get(cluster.key)
+        if old is None:
+            yield ClusterAdded(category_name, cluster)
+        elif old.content_hash != cluster.content_hash:
+            yield from _cluster_events(category_name, old, cluster)
+
+    for cluster in old_clusters:
+        if cluster.key not in new_keys:
+            yield ClusterRemoved(category_name, cluster)
+
+
+def diff_worlds(old_world, new_world):
+    """
+    Yield change events from old_world to new_world.
+    old_world may be None (everything in new_world is then added).
+    """
+    old_categories = old_world['categories'] if old_world else {}
+    new_categories = new_world['categories']
+
+    for name, new_category in new_categories.items():
+        old_category = old_categories.get(name)
+        if old_category is not None and old_category.content_hash == new_category.content_hash:
+            continue
+        yield from diff_categories(name, old_category, new_category)
+
+    for name, old_category in old_categories.items():
+        if name not in new_categories:
+            yield from diff_categories(name, old_category, None)
+
+
+def changed_categories(events):
+    """Names of the categories touched by a list of events, in first-seen order"""
+    return list(dict.fromkeys(event.category for event in events))
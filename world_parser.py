@@ -0,0 +1,102 @@
+"""
+Parse cyberskyline world data into the data model
+
+Pure functions with no Google, network or config dependencies, so the
+parser can be used (and tested) offline: see synthetic_world.py and
+snapshot_log.py.
+"""
+
+from models import Category, cluster_from_dict, cluster_to_dict
+
+# Map cyberskyline category names to sheet tab names
+CATEGORY_MAP = {
+    "Open Source Intelligence": "OSINT",
+    "Cryptography": "Crypto",
+    "Password Cracking": "Cracking",
+    "Log Analysis": "Log",
+    "Network Traffic Analysis": "NTA",
+    "Forensics": "Forensics",
+    "Scanning & Reconnaissance": "Scanning",
+    "Web Application Exploitation": "Web",
+    "Enumeration & Exploitation": "Enum and Exploit"
+}
+
+
+# Before a game goes live, worlds list placeholder challenges under this name
+REDACTED_NAME = "Redacted"
+
+
+def is_redacted(cluster):
+    """True for a placeholder Cluster whose name or question names are still redacted"""
+    names = [cluster.name] + [q.name for q in cluster.questions if q.name]
+    return any(REDACTED_NAME.lower() in name.lower() for name in names)
+
+
+def parse_cluster(cluster):
+    """Parse one cyberskyline cluster into a Cluster"""
+    cluster_name = cluster['name']
+    num_questions = cluster['challenges']
+    cluster_points = cluster['points']
+
+    questions = []
+    if num_questions > 0:
+        avg_points = cluster_points // num_questions
+
+        for i in range(num_questions):
+            if i == num_questions - 1:
+                points = cluster_points - (avg_points * (num_questions - 1))
+            else:
+                points = avg_points
+
+            questions.append({
+                'points': points,
+                'index': i + 1
+            })
+
+    return cluster_from_dict({
+        'id': cluster.get('_id') or cluster.get('id'),
+        'name': cluster_name,
+        'questions': questions,
+        'total_points': cluster_points
+    })
+
+
+def parse_world(preload_data):
+    """
+    Parse every category of a world in a single pass over report.modules.
+
+    Returns a name-indexed model:
+        {
+            'categories': {category name: Category},
+            'sheets': {sheet tab name: category name}
+        }
+    Category.sheet_name comes from CATEGORY_MAP (None for categories it
+    doesn't know).
+    """
+    categories = {}
+    sheets = {}
+
+    for module in preload_data.get('report', {}).get('modules', []):
+        category_name = module['name']
+        sheet_name = CATEGORY_MAP.get(category_name)
+
+        categories[category_name] = Category(
+            category_name,
+            sheet_name,
+            tuple(parse_cluster(cluster) for cluster in module.get('clusters', []))
+        )
+        if sheet_name:
+            sheets[sheet_name] = category_name
+
+    return {'categories': categories, 'sheets': sheets}
+
+
+def world_clusters(world, category_name):
+    """Challenge Clusters of one category in a parsed world ([] if absent)"""
+    category = world['categories'].get(category_name)
+    return list(category.clusters) if category else []
+
+
+def parse_category_challenges(preload_data, category_name):
+    """Parse challenge data for a specific category (as dicts)"""
+    return [cluster_to_dict(c) for c in world_clusters(parse_world(preload_data), category_name)]